@@ -1 +1,10 @@
-from .api import API
\ No newline at end of file
+__all__ = ["API"]
+
+def __getattr__(name: str):
+    """
+    Imports API on first access, so importing the package itself stays cheap.
+    """
+    if name == "API":
+        from .api import API
+        return API
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,321 @@
+import os
+import io
+import json
+import hashlib
+import tempfile
+import threading
+import requests
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from typing import Union, Iterable, Iterator, List, Tuple
+
+from TheNounProjectAPI.models import IconModel
+from TheNounProjectAPI.store import AssetStore
+from TheNounProjectAPI.exceptions import STATUS_CODE_EXCEPTIONS, STATUS_CODE_SUCCESS, IncorrectType, IllegalRendition, UnknownStatusCode
+
+RENDITIONS = ("preview_url", "preview_url_42", "preview_url_84", "icon_url")
+""" Names of the IconModel attributes which hold the URL of a downloadable rendition. """
+
+class Asset:
+    """
+    Asset is a class holding the result of downloading a single rendition of an icon.
+    """
+    def __init__(self, icon_id: str, rendition: str, url: str, sha256: str = None, path: str = None, data: io.BytesIO = None, skipped: bool = False):
+        """
+        Constructs a new 'Asset' object.
+
+        :param icon_id: Id of the icon this asset belongs to.
+        :type icon_id: str
+        :param rendition: Name of the IconModel attribute the url was taken from, eg. "preview_url".
+        :type rendition: str
+        :param url: The URL the asset was (or would have been) downloaded from.
+        :type url: str
+        :param sha256: Hex digest of the content of the asset. (defaults to None)
+        :type sha256: str
+        :param path: Path of the file on disk, if the asset was streamed to disk. (defaults to None)
+        :type path: str
+        :param data: Buffer with the content, if the asset was streamed to memory. (defaults to None)
+        :type data: io.BytesIO
+        :param skipped: Whether the download was skipped as the file was already present. (defaults to False)
+        :type skipped: bool
+        """
+        self.icon_id = icon_id
+        self.rendition = rendition
+        self.url = url
+        self.sha256 = sha256
+        self.path = path
+        self.data = data
+        self.skipped = skipped
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the icon id, the rendition and whether it was skipped.
+            eg: <Asset: Id: 24014, Rendition: preview_url, Skipped: False> """
+        return f"<Asset: Id: {self.icon_id}, Rendition: {self.rendition}, Skipped: {self.skipped}>"
+
+class AssetFetcher:
+    """
+    AssetFetcher is a class for concurrently downloading the PNG and SVG renditions of IconModel objects.
+    Downloads share a single pooled requests.Session, and are streamed either into an AssetStore, 
+    to files in `directory`, or to io.BytesIO buffers if neither is given.
+    """
+
+    _manifest_name = ".manifest.json"
+    _manifest_interval = 100
+    """ Number of downloads to disk after which the pipeline saves the manifest, so an interrupted run keeps most of its progress. """
+
+    def __init__(self, directory: str = None, renditions: Tuple[str, ...] = ("preview_url",), max_workers: int = 4, chunk_size: int = 64 * 1024, timeout: Union[float, Tuple[float, float], None] = 5.0, store: AssetStore = None):
+        """
+        Construct a new object for downloading icon assets.
+
+        :param directory: Directory to stream the assets to. If None, the assets are streamed to memory. (defaults to None)
+        :type directory: str
+        :param renditions: Names of the IconModel attributes to download, see RENDITIONS. (defaults to ("preview_url",))
+        :type renditions: Tuple[str, ...]
+        :param max_workers: Maximum number of concurrent downloads. (defaults to 4)
+        :type max_workers: int
+        :param chunk_size: Number of bytes read from the connection at a time. (defaults to 65536)
+        :type chunk_size: int
+        :param timeout: Float timeout in seconds, 2-tuples for seperate connect and read timeouts, and None for no timeout. (defaults to 5.0)
+        :type timeout: Union[float, Tuple[float, float], None]
+        :param store: AssetStore to stream the assets into. Takes precedence over directory. (defaults to None)
+        :type store: AssetStore
+
+        :raise IllegalRendition: Raises exception when a rendition is not one of RENDITIONS.
+        :raise IncorrectType: Raises exception when max_workers is not an integer.
+        """
+        for rendition in renditions:
+            if rendition not in RENDITIONS:
+                raise IllegalRendition("renditions")
+        if not isinstance(max_workers, int):
+            raise IncorrectType("max_workers", int)
+
+        self.directory = directory
+        self.renditions = tuple(renditions)
+        self.max_workers = max(max_workers, 1)
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.store = store
+
+        # The assets are served from a CDN which does not require authentication,
+        # so we use our own session instead of the OAuth1 session of the API object.
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._manifest = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        """
+        :returns: Mapping of file names in `directory` to the sha256 digest of their content when they were downloaded.
+        :rtype: dict
+        """
+        try:
+            with open(os.path.join(self.directory, self._manifest_name), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self) -> None:
+        """
+        Atomically writes the manifest of downloaded files to `directory`.
+        """
+        with self._lock:
+            manifest = dict(self._manifest)
+            self._unsaved = 0
+        path = os.path.join(self.directory, self._manifest_name)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(path + ".tmp", path)
+
+    def _file_name(self, icon_id: str, rendition: str, url: str) -> str:
+        """
+        :returns: The file name for this rendition of this icon, eg. "24014_preview_url.png".
+        :rtype: str
+        """
+        extension = os.path.splitext(url.split("?")[0])[1] or ".bin"
+        return f"{icon_id}_{rendition}{extension}"
+
+    def _is_present(self, file_name: str) -> bool:
+        """
+        :returns: Whether file_name exists in `directory`, with a content hash equal to the one in the manifest.
+        :rtype: bool
+        """
+        if file_name not in self._manifest:
+            return False
+        try:
+            return self._hash_file(os.path.join(self.directory, file_name)) == self._manifest[file_name]
+        except OSError:
+            return False
+
+    def _hash_file(self, path: str) -> str:
+        """
+        :returns: Hex digest of the sha256 hash of the file at path.
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _jobs(self, pages: Iterable[Iterable[IconModel]]) -> Iterator[Tuple[str, str, str]]:
+        """
+        :returns: Iterator of (icon id, rendition, url) tuples for every requested rendition which the icons in pages have.
+                  Each rendition of an icon is only included once, even if the icon occurs on multiple pages.
+        :rtype: Iterator[Tuple[str, str, str]]
+        """
+        seen = set()
+        for icons in pages:
+            for icon in icons:
+                for rendition in self.renditions:
+                    url = getattr(icon, rendition, None)
+                    if url and (icon.id, rendition) not in seen:
+                        seen.add((icon.id, rendition))
+                        yield icon.id, rendition, url
+
+    def _download(self, icon_id: str, rendition: str, url: str) -> Asset:
+        """
+        Streams a single rendition to the store, to disk or to memory, unless it is already present.
+
+        :raise APIException: Raises exception when the status code of the response indicates an error.
+
+        :returns: Asset object describing the downloaded rendition.
+        :rtype: Asset
+        """
+        if self.store is not None:
+            return self._download_to_store(icon_id, rendition, url)
+
+        if self.directory is not None:
+            file_name = self._file_name(icon_id, rendition, url)
+            path = os.path.join(self.directory, file_name)
+            if self._is_present(file_name):
+                return Asset(icon_id, rendition, url, sha256=self._manifest[file_name], path=path, skipped=True)
+
+        digest = hashlib.sha256()
+        with self._session.get(url, stream=True, timeout=self.timeout) as response:
+            _raise_for_status(response)
+            if self.directory is None:
+                buffer = io.BytesIO()
+                for chunk in response.iter_content(self.chunk_size):
+                    digest.update(chunk)
+                    buffer.write(chunk)
+                buffer.seek(0)
+                return Asset(icon_id, rendition, url, sha256=digest.hexdigest(), data=buffer)
+
+            # Each download gets its own partial file, so concurrent downloads of the same file do not write into each other.
+            fd, part_path = tempfile.mkstemp(prefix=file_name + ".", suffix=".part", dir=self.directory)
+            try:
+                with open(fd, "wb") as f:
+                    for chunk in response.iter_content(self.chunk_size):
+                        digest.update(chunk)
+                        f.write(chunk)
+                os.replace(part_path, path)
+            except BaseException:
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
+                raise
+
+        with self._lock:
+            self._manifest[file_name] = digest.hexdigest()
+            self._unsaved += 1
+        return Asset(icon_id, rendition, url, sha256=digest.hexdigest(), path=path)
+
+    def _download_to_store(self, icon_id: str, rendition: str, url: str) -> Asset:
+        """
+        Streams a single rendition into the store, unless the store already holds this rendition of the icon.
+
+        :raise APIException: Raises exception when the status code of the response indicates an error.
+
+        :returns: Asset object describing the downloaded rendition.
+        :rtype: Asset
+        """
+        if (icon_id, rendition) in self.store:
+            return Asset(icon_id, rendition, url, sha256=self.store.sha256(icon_id, rendition), path=self.store.path(icon_id, rendition), skipped=True)
+
+        with self._session.get(url, stream=True, timeout=self.timeout) as response:
+            _raise_for_status(response)
+            with self.store.temporary_file() as f:
+                for chunk in response.iter_content(self.chunk_size):
+                    f.write(chunk)
+        sha256 = self.store.put_file(icon_id, rendition, f.name)
+        return Asset(icon_id, rendition, url, sha256=sha256, path=self.store.path(icon_id, rendition))
+
+    def pipeline(self, pages: Iterable[Iterable[IconModel]]) -> Iterator[Asset]:
+        """
+        Pipeline stage which downloads the renditions of all icons in pages, eg. an iterator of IconsModel objects.
+        At most `max_workers` downloads are in flight at any time, and pages are only consumed as downloads finish.
+        Assets are yielded in order of completion, and each rendition of an icon is downloaded at most once.
+
+        :param pages: Iterable of lists of IconModel objects, eg. IconsModel objects.
+        :type pages: Iterable[Iterable[IconModel]]
+
+        :raise APIException: Raises exception when the status code of a download indicates an error.
+
+        :returns: Iterator of Asset objects.
+        :rtype: Iterator[Asset]
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = set()
+                for job in self._jobs(pages):
+                    pending.add(executor.submit(self._download, *job))
+                    if len(pending) >= self.max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield self._completed(future)
+                for future in as_completed(pending):
+                    yield self._completed(future)
+        finally:
+            if self.directory is not None:
+                self._save_manifest()
+
+    def _completed(self, future: Future) -> Asset:
+        """
+        :returns: The Asset of a finished download, after saving the manifest if `_manifest_interval` downloads were not saved yet.
+        :rtype: Asset
+        """
+        asset = future.result()
+        if self.directory is not None and self._unsaved >= self._manifest_interval:
+            self._save_manifest()
+        return asset
+
+    def fetch(self, icons: Union[IconModel, Iterable[IconModel]]) -> List[Asset]:
+        """
+        Downloads the renditions of a single IconModel, or of a list of IconModel objects like IconsModel.
+
+        :param icons: IconModel object, or list of IconModel objects.
+        :type icons: Union[IconModel, Iterable[IconModel]]
+
+        :raise APIException: Raises exception when the status code of a download indicates an error.
+
+        :returns: List of Asset objects.
+        :rtype: List[Asset]
+        """
+        if isinstance(icons, IconModel):
+            icons = [icons]
+        return list(self.pipeline([icons]))
+
+    def close(self) -> None:
+        """
+        Closes the requests.Session used for downloading.
+        """
+        self._session.close()
+
+def _raise_for_status(response: requests.Response) -> None:
+    """
+    Raises the exception matching the status code of the response, in the same way the API endpoints do.
+
+    :raise APIException: Raises exception when the status code of the response indicates an error.
+    """
+    if response.status_code in STATUS_CODE_SUCCESS:
+        return
+    if response.status_code in STATUS_CODE_EXCEPTIONS:
+        raise STATUS_CODE_EXCEPTIONS[response.status_code](response)
+    raise UnknownStatusCode(response)
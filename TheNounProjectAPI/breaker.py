@@ -0,0 +1,166 @@
+import time
+import threading
+from collections import deque
+from typing import Callable, List
+
+from TheNounProjectAPI.exceptions import CircuitOpen
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """
+    CircuitBreaker is a class which stops requests from being sent while the API is failing.
+
+    * While "closed", requests are sent. If `failure_threshold` requests fail within `window` seconds, it opens.
+    * While "open", requests immediately raise CircuitOpen, until `recovery_timeout` seconds have passed.
+    * While "half_open", at most `half_open_requests` probe requests are sent at once. 
+      If a probe succeeds the breaker closes, and if it fails the breaker opens again.
+
+    A request fails if it raises a connection error or timeout, or returns a status code indicating ServerException.
+    Every change of state is passed to the functions in `listeners`, eg. to update metrics.
+    """
+    def __init__(self, failure_threshold: int = 5, window: float = 30.0, recovery_timeout: float = 30.0, half_open_requests: int = 1):
+        """
+        Construct a new circuit breaker, which may be shared by multiple API objects.
+
+        :param failure_threshold: Number of failures within window which opens the breaker. (defaults to 5)
+        :type failure_threshold: int
+        :param window: Number of seconds in which failures are counted. (defaults to 30.0)
+        :type window: float
+        :param recovery_timeout: Number of seconds the breaker stays open before sending probes. (defaults to 30.0)
+        :type recovery_timeout: float
+        :param half_open_requests: Maximum number of probe requests in flight while half open. (defaults to 1)
+        :type half_open_requests: int
+        """
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.recovery_timeout = recovery_timeout
+        self.half_open_requests = half_open_requests
+        self.listeners: List[Callable[["CircuitBreaker", str, str], None]] = []
+        """ Functions called with the breaker, the old state and the new state, whenever the state changes. """
+        self._state = CLOSED
+        self._failures = deque()
+        self._opened_at = None
+        self._probes = 0
+        # Changes of state which have not been passed to the listeners yet, as (old state, new state) tuples.
+        self._transitions = []
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        :returns: The current state, either "closed", "open" or "half_open".
+        :rtype: str
+        """
+        with self._lock:
+            self._update()
+            state = self._state
+        self._notify()
+        return state
+
+    @property
+    def failures(self) -> int:
+        """
+        :returns: The number of failures within the last window seconds.
+        :rtype: int
+        """
+        with self._lock:
+            self._expire_failures(time.monotonic())
+            return len(self._failures)
+
+    def _set_state(self, state: str) -> None:
+        """
+        Changes the state, and queues the change for the listeners if it changed. Must be called with the lock held,
+        and followed by a call to _notify once the lock is released.
+        """
+        old_state, self._state = self._state, state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state != OPEN:
+            self._failures.clear()
+        self._probes = 0
+        if old_state != state:
+            self._transitions.append((old_state, state))
+
+    def _notify(self) -> None:
+        """
+        Calls the listeners with the queued changes of state. Must be called without the lock held,
+        so listeners may use the breaker, eg. read its state.
+        """
+        with self._lock:
+            transitions, self._transitions = self._transitions, []
+        for old_state, state in transitions:
+            for listener in self.listeners:
+                listener(self, old_state, state)
+
+    def _update(self) -> None:
+        """
+        Moves from open to half open once recovery_timeout has passed. Must be called with the lock held.
+        """
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._set_state(HALF_OPEN)
+
+    def _expire_failures(self, now: float) -> None:
+        """
+        Forgets failures older than window seconds. Must be called with the lock held.
+        """
+        while self._failures and self._failures[0] <= now - self.window:
+            self._failures.popleft()
+
+    def before_request(self) -> None:
+        """
+        Must be called before sending a request, and followed by exactly one call to
+        record_success, record_failure or cancel.
+
+        :raise CircuitOpen: Raises exception when the breaker is open, or half open with all probes in flight.
+        """
+        try:
+            with self._lock:
+                self._update()
+                if self._state == OPEN:
+                    raise CircuitOpen(self.recovery_timeout - (time.monotonic() - self._opened_at))
+                if self._state == HALF_OPEN:
+                    if self._probes >= self.half_open_requests:
+                        raise CircuitOpen(0.0)
+                    self._probes += 1
+        finally:
+            self._notify()
+
+    def record_success(self) -> None:
+        """
+        Records a request which reached the API, and did not fail.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._set_state(CLOSED)
+        self._notify()
+
+    def record_failure(self) -> None:
+        """
+        Records a failed request.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._set_state(OPEN)
+            elif self._state == CLOSED:
+                now = time.monotonic()
+                self._failures.append(now)
+                self._expire_failures(now)
+                if len(self._failures) >= self.failure_threshold:
+                    self._set_state(OPEN)
+        self._notify()
+
+    def cancel(self) -> None:
+        """
+        Records that a request allowed by before_request was not sent after all.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the state and the number of recent failures.
+            eg: <CircuitBreaker: State: closed, Failures: 2> """
+        return f"<CircuitBreaker: State: {self.state}, Failures: {self.failures}>"
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import hashlib
+from datetime import timedelta
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Union, Type, Tuple, Optional, Callable, Any, TYPE_CHECKING
+
+from TheNounProjectAPI import models, exceptions
+from TheNounProjectAPI.models import Model, ModelList, ResponseMeta
+from TheNounProjectAPI.exceptions import APIException, NotFound
+
+if TYPE_CHECKING:
+    import requests
+
+class CacheState:
+    """
+    CacheState holds the possible states of a cache lookup.
+    """
+    MISS = "miss"
+    """ There is no usable entry. """
+    FRESH = "fresh"
+    """ The entry is younger than ttl. """
+    STALE = "stale"
+    """ The entry is older than ttl, but younger than stale_ttl. It may be served while it is revalidated. """
+    EXPIRED = "expired"
+    """ The entry is older than stale_ttl. It may only be served if the API is failing. """
+
+class CacheEntry:
+    """
+    CacheEntry is a class holding a cached result of a request: either a model, or the exception the request raised.
+    """
+    def __init__(self, model: Union[Model, ModelList] = None, exception: Type[APIException] = None, response: Union[requests.Response, ResponseMeta] = None, expires: float = None, created: float = None):
+        """
+        Constructs a new 'CacheEntry' object.
+
+        :param model: The model returned by the request, if it succeeded. (defaults to None)
+        :type model: Union[Model, ModelList]
+        :param exception: The exception class raised by the request, if it failed. (defaults to None)
+        :type exception: Type[APIException]
+        :param response: The response which caused the exception, used to raise it again. (defaults to None)
+        :type response: Union[requests.Response, ResponseMeta]
+        :param expires: Time (as given by time.time()) after which this entry is no longer valid. (defaults to None)
+        :type expires: float
+        :param created: Time (as given by time.time()) at which this entry was created. (defaults to None, i.e. now)
+        :type created: float
+        """
+        self.model = model
+        self.exception = exception
+        self.response = response
+        self.expires = expires
+        self.created = time.time() if created is None else created
+
+    def result(self) -> Union[Model, ModelList]:
+        """
+        :raise APIException: Raises the cached exception, if this entry is the result of a failed request.
+
+        :returns: The cached model.
+        :rtype: Union[Model, ModelList]
+        """
+        if self.exception is not None:
+            raise self.exception(self.response)
+        return self.model
+
+class Cache:
+    """
+    Cache is a base class for caching the results of GET requests, keyed on the method and URL of the request.
+    Successful results are cached for `ttl` seconds. Failed requests raising one of `negative_exceptions`,
+    eg. NotFound for terms without icons, are cached for `negative_ttl` seconds, after which they raise
+    the same exception again without sending a request.
+
+    If `stale_ttl` is set, successful results older than `ttl` but younger than `stale_ttl` are still served,
+    while a request in the background updates the cache (stale-while-revalidate).
+    If `stale_if_error` is set, successful results older than that are only served if the request 
+    to replace them raises ServerException, RateLimited or CircuitOpen (stale-if-error).
+
+    Subclasses implement the storage through _get, _set, _delete and clear.
+    """
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 60.0, negative_exceptions: Tuple[Type[APIException], ...] = (NotFound,), 
+                 stale_ttl: float = None, stale_if_error: bool = False):
+        """
+        Construct a new cache.
+
+        :param ttl: Number of seconds successful results are cached for. (defaults to 300.0)
+        :type ttl: float
+        :param negative_ttl: Number of seconds failed results are cached for. (defaults to 60.0)
+        :type negative_ttl: float
+        :param negative_exceptions: Exception classes of which the failed results are cached.
+                                    Eg. (NotFound, LegalReasons). (defaults to (NotFound,))
+        :type negative_exceptions: Tuple[Type[APIException], ...]
+        :param stale_ttl: Number of seconds successful results are served for while being revalidated in the background, 
+                          counted from when they were cached. None disables stale-while-revalidate. (defaults to None)
+        :type stale_ttl: float
+        :param stale_if_error: Whether to keep successful results past stale_ttl, to serve them if the API is failing. (defaults to False)
+        :type stale_if_error: bool
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.negative_exceptions = tuple(negative_exceptions)
+        self.stale_ttl = stale_ttl
+        self.stale_if_error = stale_if_error
+        self._revalidating = set()
+        self._revalidating_lock = threading.Lock()
+
+    @staticmethod
+    def key(prepared_request: requests.PreparedRequest) -> str:
+        """
+        :returns: The cache key of the request, eg. "GET http://api.thenounproject.com/icon/12".
+        :rtype: str
+        """
+        return f"{prepared_request.method} {prepared_request.url}"
+
+    def lookup(self, key: str) -> Tuple[Optional[CacheEntry], str]:
+        """
+        Finds the entry stored under key, and determines whether it is fresh, stale or expired.
+        Entries which can no longer be served at all are removed.
+
+        :returns: Tuple of the entry (or None) and its CacheState.
+        :rtype: Tuple[Optional[CacheEntry], str]
+        """
+        entry = self._get(key)
+        if entry is None:
+            return None, CacheState.MISS
+        now = time.time()
+        if entry.expires is None or now < entry.expires:
+            return entry, CacheState.FRESH
+        if entry.exception is None:
+            if self.stale_ttl is not None and now < entry.created + self.stale_ttl:
+                return entry, CacheState.STALE
+            if self.stale_if_error:
+                return entry, CacheState.EXPIRED
+        self._delete(key)
+        return None, CacheState.MISS
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        :returns: The entry stored under key, or None if there is no entry or if it is no longer fresh.
+        :rtype: Optional[CacheEntry]
+        """
+        entry, state = self.lookup(key)
+        return entry if state == CacheState.FRESH else None
+
+    def revalidate(self, key: str, fetch: Callable[[], Any]) -> None:
+        """
+        Calls fetch in a background thread, unless a revalidation for key is already running.
+        fetch is expected to update the entry under key. Any exception it raises is discarded,
+        as the caller has already been served the stale entry.
+
+        :param key: The key of the entry to revalidate.
+        :type key: str
+        :param fetch: Function which sends the request and updates the cache.
+        :type fetch: Callable[[], Any]
+        """
+        with self._revalidating_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def run():
+            try:
+                fetch()
+            except Exception:
+                pass
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=run, name=f"revalidate {key}", daemon=True).start()
+
+    def set(self, key: str, model: Union[Model, ModelList]) -> None:
+        """
+        Stores the model returned by a successful request under key.
+        """
+        self._set(key, CacheEntry(model=model, expires=time.time() + self.ttl))
+
+    def set_exception(self, key: str, exception: Type[APIException], response: Union[requests.Response, ResponseMeta]) -> None:
+        """
+        Stores the exception raised by a failed request under key, if it is one of the negative_exceptions.
+        """
+        if issubclass(exception, self.negative_exceptions):
+            self._set(key, CacheEntry(exception=exception, response=response, expires=time.time() + self.negative_ttl))
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    def _delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """
+        Removes all entries from the cache.
+        """
+        raise NotImplementedError
+
+class MemoryCache(Cache):
+    """
+    MemoryCache is a thread-safe Cache storing up to `max_entries` entries in memory,
+    removing the least recently used entries first.
+    """
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 60.0, negative_exceptions: Tuple[Type[APIException], ...] = (NotFound,), 
+                 stale_ttl: float = None, stale_if_error: bool = False, max_entries: int = 1024):
+        """
+        Construct a new in-memory cache.
+
+        :param ttl: Number of seconds successful results are cached for. (defaults to 300.0)
+        :type ttl: float
+        :param negative_ttl: Number of seconds failed results are cached for. (defaults to 60.0)
+        :type negative_ttl: float
+        :param negative_exceptions: Exception classes of which the failed results are cached. (defaults to (NotFound,))
+        :type negative_exceptions: Tuple[Type[APIException], ...]
+        :param stale_ttl: Number of seconds successful results are served for while being revalidated. (defaults to None)
+        :type stale_ttl: float
+        :param stale_if_error: Whether to keep successful results past stale_ttl, to serve them if the API is failing. (defaults to False)
+        :type stale_if_error: bool
+        :param max_entries: Maximum number of entries held. (defaults to 1024)
+        :type max_entries: int
+        """
+        super().__init__(ttl, negative_ttl, negative_exceptions, stale_ttl, stale_if_error)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """ Returns the number of entries, including expired entries which have not been removed yet. """
+        return len(self._entries)
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+class DiskCache(Cache):
+    """
+    DiskCache is a Cache storing each entry as a file in `directory`, 
+    allowing the cache to be shared between processes, and to be filled in advance using warm_cache.
+
+    Each file holds a json header line with the times, the names of the model and exception classes, 
+    and the response metadata, followed by the model serialised with to_bytes. Unlike pickle, reading an entry
+    can only construct models and exceptions of this package, so processes writing to the directory can not run code in the readers.
+    Files which can not be read, eg. of an older format, are treated as missing.
+    """
+    _format = 1
+    """ Version of the file format, stored in the header. Files of other versions are ignored. """
+
+    _model_classes = {name: value for name, value in vars(models).items()
+                      if isinstance(value, type) and issubclass(value, (Model, ModelList)) and value not in (Model, ModelList)}
+    """ Mapping of the class names of the models which can be read back, to the classes. """
+
+    _exception_classes = {name: value for name, value in vars(exceptions).items()
+                          if isinstance(value, type) and issubclass(value, APIException)}
+    """ Mapping of the class names of the exceptions which can be read back, to the classes. """
+
+    def __init__(self, directory: str, ttl: float = 300.0, negative_ttl: float = 60.0, negative_exceptions: Tuple[Type[APIException], ...] = (NotFound,), 
+                 stale_ttl: float = None, stale_if_error: bool = False):
+        """
+        Construct a new on-disk cache.
+
+        :param directory: Directory to store the entries in. Created if it does not exist.
+        :type directory: str
+        :param ttl: Number of seconds successful results are cached for. (defaults to 300.0)
+        :type ttl: float
+        :param negative_ttl: Number of seconds failed results are cached for. (defaults to 60.0)
+        :type negative_ttl: float
+        :param negative_exceptions: Exception classes of which the failed results are cached. (defaults to (NotFound,))
+        :type negative_exceptions: Tuple[Type[APIException], ...]
+        :param stale_ttl: Number of seconds successful results are served for while being revalidated. (defaults to None)
+        :type stale_ttl: float
+        :param stale_if_error: Whether to keep successful results past stale_ttl, to serve them if the API is failing. (defaults to False)
+        :type stale_if_error: bool
+        """
+        super().__init__(ttl, negative_ttl, negative_exceptions, stale_ttl, stale_if_error)
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        """ Returns the number of entries, including expired entries which have not been removed yet. """
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".cache"))
+
+    def _path(self, key: str) -> str:
+        """
+        :returns: Path of the file holding the entry stored under key.
+        :rtype: str
+        """
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".cache")
+
+    @staticmethod
+    def _dump_response(response: Union[requests.Response, ResponseMeta, None]) -> Optional[dict]:
+        """
+        :returns: The metadata of response as a dictionary which can be serialised as json, or None.
+        :rtype: Optional[dict]
+        """
+        if response is None:
+            return None
+        meta = ResponseMeta.from_response(response)
+        return {"status_code": meta.status_code, "url": meta.url, "reason": meta.reason, "headers": dict(meta.headers),
+                "elapsed": None if meta.elapsed is None else meta.elapsed.total_seconds()}
+
+    @staticmethod
+    def _load_response(data: Optional[dict]) -> Optional[ResponseMeta]:
+        """
+        :returns: The ResponseMeta described by data as returned by _dump_response, or None.
+        :rtype: Optional[ResponseMeta]
+        """
+        if data is None:
+            return None
+        elapsed = None if data["elapsed"] is None else timedelta(seconds=data["elapsed"])
+        return ResponseMeta(data["status_code"], data["url"], elapsed, data["headers"], data["reason"])
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._path(key), "rb") as f:
+                header = json.loads(f.readline())
+                body = f.read()
+            if header.get("format") != self._format:
+                return None
+            response = self._load_response(header["response"])
+            model = exception = None
+            if header["exception"] is not None:
+                exception = self._exception_classes[header["exception"]]
+            else:
+                model = self._model_classes[header["model"]].from_bytes(body)
+                model.response = response
+            return CacheEntry(model=model, exception=exception, response=response, expires=header["expires"], created=header["created"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, ImportError):
+            return None
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        header = {"format": self._format, "expires": entry.expires, "created": entry.created,
+                  "model": None if entry.model is None else type(entry.model).__name__,
+                  "exception": None if entry.exception is None else entry.exception.__name__,
+                  "response": self._dump_response(entry.response if entry.model is None else entry.model.response)}
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            if entry.model is not None:
+                f.write(entry.model.to_bytes())
+        os.replace(f.name, self._path(key))
+
+    def _delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".cache"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
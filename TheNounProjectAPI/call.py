@@ -1,10 +1,24 @@
 
-from functools import singledispatch
-import wrapt
-from typing import Union, Callable, Type, List
+from functools import singledispatch, wraps
+from contextvars import ContextVar
+from typing import Union, Callable, Type, List, Optional
 
-from TheNounProjectAPI.exceptions import STATUS_CODE_EXCEPTIONS, STATUS_CODE_SUCCESS, UnknownStatusCode
-from TheNounProjectAPI.models import CollectionModel, CollectionsModel, IconModel, IconsModel, UsageModel, EnterpriseModel, Model, ModelList
+from TheNounProjectAPI import profiling
+from TheNounProjectAPI.cache import CacheState
+from TheNounProjectAPI.tracing import current_trace
+from TheNounProjectAPI.exceptions import STATUS_CODE_EXCEPTIONS, STATUS_CODE_SUCCESS, ServerException, RateLimited, CircuitOpen, UnknownStatusCode
+from TheNounProjectAPI.models import CollectionModel, CollectionsModel, IconModel, IconsModel, UsageModel, EnterpriseModel, Model, ModelList, ResponseMeta
+
+# Name of the endpoint method whose request is being sent, eg. "get_icon_by_id".
+_current_endpoint: ContextVar[Optional[str]] = ContextVar("endpoint", default=None)
+
+def current_endpoint() -> Optional[str]:
+    """
+    :returns: The name of the endpoint method whose request is being sent in the current context, eg. "get_icon_by_id", 
+              or None outside of an endpoint.
+    :rtype: Optional[str]
+    """
+    return _current_endpoint.get()
 
 class Call:
     """
@@ -25,15 +39,84 @@ class Call:
         :rtype: Callable
         """
         dispatcher = singledispatch(f)
-        @wrapt.decorator
-        def wrapper(wrapped, instance=None, args=(), kwargs={}):
+        @wraps(f)
+        def wrapper(instance, *args, **kwargs):
             return dispatcher.dispatch(args[0].__class__)(instance, *args, **kwargs)
-        out = wrapper(f)
-        out.register = dispatcher.register
-        return out
+        wrapper.register = dispatcher.register
+        return wrapper
+
+    @staticmethod
+    def _fetch(instance, prepared_request, model_class: Union[Type[Model], Type[ModelList]], cache_key: str = None, endpoint: str = None) -> Union[Model, List[Model]]:
+        """
+        Sends the PreparedRequest, checks for exceptions, and returns the json parsed through the correct model.
+        If cache_key is given, the model or exception is also stored in the cache of instance.
+
+        :param instance: The API instance to send the request with.
+        :type instance: Core
+        :param prepared_request: The request to send.
+        :type prepared_request: requests.PreparedRequest
+        :param model_class: The class of the model to use for the output data.
+        :type model_class: Union[Type[Model], Type[ModelList]]
+        :param cache_key: Key to store the result under in the cache, or None to not cache the result. (defaults to None)
+        :type cache_key: str
+        :param endpoint: Name of the endpoint method, available through current_endpoint() while the request is sent. (defaults to None)
+        :type endpoint: str
+
+        :raise APIException: Raises exception when the status code of the response indicates an error.
+
+        :returns: The response parsed through model_class.
+        :rtype: Union[Model, List[Model]]
+        """
+        if instance._tracer is not None and current_trace() is None:
+            # Requests sent outside of an endpoint call, ie. revalidations of stale cache entries, are traced on their own.
+            def fetch() -> Union[Model, List[Model]]:
+                trace = current_trace()
+                trace.request(prepared_request)
+                trace.cache = "revalidate"
+                return Call._fetch(instance, prepared_request, model_class, cache_key, endpoint)
+            return instance._tracer.run(endpoint, fetch)
+
+        # Send the PreparedRequest, and get the response
+        token = _current_endpoint.set(endpoint)
+        try:
+            response = instance._send(prepared_request)
+        finally:
+            _current_endpoint.reset(token)
+        if profiling.active is not None:
+            profiling.mark("send")
+        trace = current_trace() if instance._tracer is not None else None
+        if trace is not None:
+            trace.response(response)
+        # The response kept by models and cache entries, which may be just its metadata.
+        kept_response = response if instance._retain_response else ResponseMeta.from_response(response)
+
+        # If status_code indicates success
+        if response.status_code in STATUS_CODE_SUCCESS:
+            # Parse as JSON, get model, parse json in terms of the model
+            json_data = response.json()
+            if profiling.active is not None:
+                profiling.mark("decode")
+            model = model_class()
+            model = model.parse(json_data, kept_response)
+            if profiling.active is not None:
+                profiling.mark("parse")
+            if trace is not None:
+                trace.mark("parse")
+            if cache_key is not None:
+                instance._cache.set(cache_key, model)
+            return model
+        # If status_code indicates an error we know
+        elif response.status_code in STATUS_CODE_EXCEPTIONS:
+            exception = STATUS_CODE_EXCEPTIONS[response.status_code]
+            if cache_key is not None:
+                instance._cache.set_exception(cache_key, exception, kept_response)
+            raise exception(response)
+        # If status_code is a code we don't have a proper exception/response for.
+        else:
+            raise UnknownStatusCode(response)
 
     @staticmethod
-    def _get_endpoint(model_class: Union[Type[Model], Type[ModelList]], method: str) -> Callable:
+    def _get_endpoint(model_class: Union[Type[Model], Type[ModelList]], method: str, cacheable: bool = True) -> Callable:
         """
         Returns wrapper which receives a requests.PreparedRequests, 
         sends this request, checks for exceptions, and returns the json parsed through the correct model.
@@ -42,39 +125,76 @@ class Call:
         :type model_class: Union[Type[Model], Type[ModelList]]
         :param method: String form of which method to use. Either "GET" or "POST".
         :type method: str
+        :param cacheable: Whether the results may be stored in the cache. Only applies to GET requests. (defaults to True)
+        :type cacheable: bool
 
         :returns: Decorator function.
         :rtype: Callable
         """
-        @wrapt.decorator
-        def wrapper(wrapped, instance=None, args=(), kwargs={}) -> Union[Model, List[Model]]:
-            # Set method for API instance.
-            instance._method = method
-
-            # Call the decorated function with the args and kwargs.
-            # All of the decorated functions return a PreparedRequest which we will use.
-            prepared_request = wrapped(*args, **kwargs)
-            # If testing is true, then we want to simply return this PreparedRequest. This is useful for testing only.
-            if instance._testing:
-                return prepared_request
-
-            # Send the PreparedRequest, and get the response
-            response = instance._send(prepared_request)
+        def decorator(wrapped: Callable) -> Callable:
+            def call(instance, *args, **kwargs) -> Union[Model, List[Model]]:
+                # Set method for API instance.
+                instance._method = method
 
-            # If status_code indicates success
-            if response.status_code in STATUS_CODE_SUCCESS:
-                # Parse as JSON, get model, parse json in terms of the model
-                json_data = response.json()
-                model = model_class()
-                return model.parse(json_data, response)
-            # If status_code indicates an error we know
-            elif response.status_code in STATUS_CODE_EXCEPTIONS:
-                raise STATUS_CODE_EXCEPTIONS[response.status_code](response)
-            # If status_code is a code we don't have a proper exception/response for.
-            else:
-                raise UnknownStatusCode(response)
-        
-        return wrapper
+                # Call the decorated function with the args and kwargs.
+                # All of the decorated functions return a PreparedRequest which we will use.
+                prepared_request = wrapped(instance, *args, **kwargs)
+                if profiling.active is not None:
+                    profiling.mark("prepare")
+                trace = current_trace() if instance._tracer is not None else None
+                if trace is not None:
+                    trace.request(prepared_request)
+                # If testing is true, then we want to simply return this PreparedRequest. This is useful for testing only.
+                if instance._testing:
+                    return prepared_request
+
+                # Without a cache, or for POST requests and uncacheable endpoints, we simply send the request.
+                if instance._cache is None or method != "GET" or not cacheable:
+                    return Call._fetch(instance, prepared_request, model_class, endpoint=endpoint)
+
+                # Otherwise, GET requests are answered from the cache if possible, 
+                # which may also raise a cached exception like NotFound.
+                cache = instance._cache
+                cache_key = cache.key(prepared_request)
+                entry, state = cache.lookup(cache_key)
+                if profiling.active is not None:
+                    profiling.mark("cache")
+                if trace is not None:
+                    trace.mark("cache")
+                    trace.cache = state
+                if state == CacheState.FRESH:
+                    return entry.result()
+                # Stale entries are served immediately, while the cache is updated in the background.
+                if state == CacheState.STALE:
+                    cache.revalidate(cache_key, lambda: Call._fetch(instance, prepared_request, model_class, cache_key, endpoint))
+                    return entry.result()
+                # Expired entries are only served if the API is failing, or if the circuit breaker is open.
+                if state == CacheState.EXPIRED:
+                    try:
+                        return Call._fetch(instance, prepared_request, model_class, cache_key, endpoint)
+                    except (ServerException, RateLimited, CircuitOpen):
+                        if trace is not None:
+                            trace.cache = "expired_served"
+                        return entry.result()
+                return Call._fetch(instance, prepared_request, model_class, cache_key, endpoint)
+
+            def traced(instance, *args, **kwargs) -> Union[Model, List[Model]]:
+                # Calls of API objects with a Tracer are recorded in its ring buffer.
+                if instance._tracer is None:
+                    return call(instance, *args, **kwargs)
+                return instance._tracer.run(endpoint, call, instance, *args, **kwargs)
+
+            @wraps(wrapped)
+            def wrapper(instance, *args, **kwargs) -> Union[Model, List[Model]]:
+                # While profiling is disabled, checking whether it is enabled is all that profiling costs.
+                profiler = profiling.active
+                if profiler is not None and profiler.sample():
+                    return profiler.run(endpoint, traced, instance, *args, **kwargs)
+                return traced(instance, *args, **kwargs)
+
+            endpoint = wrapped.__name__
+            return wrapper
+        return decorator
     
     """
     Some lambda functions, where the method and model_class are already determined.
@@ -85,5 +205,5 @@ class Call:
     collections = lambda f, method="GET", model_class=CollectionsModel: Call._get_endpoint(model_class, method)(f)
     icon        = lambda f, method="GET", model_class=IconModel: Call._get_endpoint(model_class, method)(f)
     icons       = lambda f, method="GET", model_class=IconsModel: Call._get_endpoint(model_class, method)(f)
-    usage       = lambda f, method="GET", model_class=UsageModel: Call._get_endpoint(model_class, method)(f)
+    usage       = lambda f, method="GET", model_class=UsageModel: Call._get_endpoint(model_class, method, cacheable=False)(f)
     enterprise  = lambda f, method="POST", model_class=EnterpriseModel: Call._get_endpoint(model_class, method)(f)
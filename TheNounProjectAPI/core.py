@@ -1,16 +1,41 @@
 
-import requests
-from typing import Union, Any, Type, Tuple
+from __future__ import annotations
+
+import re
+import threading
+from urllib.parse import urlencode
+from typing import Union, Any, Type, Tuple, Iterator, TYPE_CHECKING
 
 from TheNounProjectAPI.keys import Keys
-from TheNounProjectAPI.exceptions import IncorrectType, NonPositive, IllegalSlug, IllegalTerm
+from TheNounProjectAPI.cache import Cache
+from TheNounProjectAPI.scheduler import Scheduler, INTERACTIVE
+from TheNounProjectAPI.deadline import Deadline, deadline, current_deadline
+from TheNounProjectAPI.breaker import CircuitBreaker
+from TheNounProjectAPI.limiter import AdaptiveLimiter
+from TheNounProjectAPI.quota import QuotaTracker
+from TheNounProjectAPI.credentials import CredentialPool
+from TheNounProjectAPI.tracing import Tracer, current_trace
+from TheNounProjectAPI.call import current_endpoint
+from TheNounProjectAPI.exceptions import STATUS_CODE_EXCEPTIONS, IncorrectType, NonPositive, IllegalSlug, IllegalTerm, RequestDropped, ServerException, RateLimited
+
+if TYPE_CHECKING:
+    import requests
+    from requests_oauthlib import OAuth1
+    from TheNounProjectAPI.transport import Transport
+
+# URLs which requests would leave unchanged when preparing them: a lowercase http(s) host, 
+# and a path without characters which are quoted, unquoted, or which start a query or fragment.
+_PLAIN_URL = re.compile(r"https?://[a-z0-9.\-]+(:[0-9]+)?/[A-Za-z0-9\-._~!$&'()*+,;=:@/]*")
 
 class Core(Keys):
     """
     Core is a class providing helper functions useful for accessing the TheNounProject API.
     """
 
-    def __init__(self, key:str = None, secret:str = None, testing:bool = False, timeout:Union[float, Tuple[float, float], None] = 5.0):
+    def __init__(self, key:str = None, secret:str = None, testing:bool = False, timeout:Union[float, Tuple[float, float], None] = 5.0, cache:Cache = None, 
+                 scheduler:Scheduler = None, lane:str = INTERACTIVE, transport:Transport = None, base_url:str = "http://api.thenounproject.com", 
+                 circuit_breaker:CircuitBreaker = None, retain_response:bool = None, limiter:AdaptiveLimiter = None, 
+                 quota_tracker:QuotaTracker = None, credentials:CredentialPool = None, tracer:Tracer = None):
         """
         Construct a new object for making API requests.
 
@@ -23,25 +48,307 @@ class Core(Keys):
         :type testing: bool
         :param timeout: Float timeout in seconds, 2-tuples for seperate connect and read timeouts, and None for no timeout. (defaults to 5.0)
         :type timeout: Union[float, Tuple[float, float], None]
+        :param cache: Cache used to store the results of GET requests, eg. a MemoryCache. None disables caching. (defaults to None)
+        :type cache: Cache
+        :param scheduler: Scheduler limiting the number of concurrent requests, which may be shared by multiple API objects. (defaults to None)
+        :type scheduler: Scheduler
+        :param lane: Name of the Scheduler lane requests of this object are sent in, eg. "batch" for crawls. (defaults to "interactive")
+        :type lane: str
+        :param transport: Transport used to send the prepared requests, eg. HTTPXTransport for HTTP/2. 
+                          (defaults to None, i.e. a RequestsTransport using the session of this object)
+        :type transport: Transport
+        :param base_url: URL of the API, which all endpoint paths are appended to. (defaults to "http://api.thenounproject.com")
+        :type base_url: str
+        :param circuit_breaker: CircuitBreaker which stops sending requests while the API is failing. 
+                                Its state can be read through the circuit_breaker property. (defaults to None)
+        :type circuit_breaker: CircuitBreaker
+        :param retain_response: Whether models keep the full requests.Response in their response attribute. 
+                                If False, they keep a small ResponseMeta with the status code, URL, elapsed time and some headers. 
+                                (defaults to None, i.e. False if a cache is given, and True otherwise)
+        :type retain_response: bool
+        :param limiter: AdaptiveLimiter which limits the number of requests in flight, adapting the limit to the latency 
+                        and rate limiting of the API. Its limit can be read through the limiter property. (defaults to None)
+        :type limiter: AdaptiveLimiter
+        :param quota_tracker: QuotaTracker which counts the requests sent per endpoint, to estimate the quota usage 
+                              between get_usage snapshots. (defaults to None)
+        :type quota_tracker: QuotaTracker
+        :param credentials: CredentialPool whose keys sign the requests instead of key and secret, 
+                            spreading the requests over the keys by their remaining quota. (defaults to None)
+        :type credentials: CredentialPool
+        :param tracer: Tracer which keeps a record of the last endpoint calls, with their URL, status code, size, 
+                       cache decisions and timings, for debugging. (defaults to None)
+        :type tracer: Tracer
         """
         self.api_key = key
         self.secret_key = secret
         self._testing = testing
         self._timeout = timeout
+        self._cache = cache
+        self._scheduler = scheduler
+        self._lane = lane
+        self._circuit_breaker = circuit_breaker
+        self._retain_response = cache is None if retain_response is None else retain_response
+        self._limiter = limiter
+        self._quota_tracker = quota_tracker
+        self._credentials = credentials
+        self._tracer = tracer
+        self._requests_sent = 0
+        self._requests_lock = threading.Lock()
         
         self._method: str
-        self._base_url = "http://api.thenounproject.com"
-        self._session = requests.Session()
+        self._base_url = base_url.rstrip("/")
+        # The session and the default transport are created on first use, 
+        # so that requests is only imported once a request is prepared.
+        self._lazy_session = None
+        self._lazy_transport = transport
+        self._lazy_lock = threading.RLock()
+
+    @property
+    def _session(self) -> requests.Session:
+        """
+        :returns: The requests.Session used to prepare and sign requests, created on first use.
+        :rtype: requests.Session
+        """
+        if self._lazy_session is None:
+            with self._lazy_lock:
+                if self._lazy_session is None:
+                    import requests
+                    self._lazy_session = requests.Session()
+        return self._lazy_session
+
+    @property
+    def _transport(self) -> Transport:
+        """
+        :returns: The Transport used to send requests, by default a RequestsTransport using the session, created on first use.
+        :rtype: Transport
+        """
+        if self._lazy_transport is None:
+            with self._lazy_lock:
+                if self._lazy_transport is None:
+                    from TheNounProjectAPI.transport import RequestsTransport
+                    self._lazy_transport = RequestsTransport(self._session)
+        return self._lazy_transport
 
     def _send(self, url: requests.PreparedRequest) -> requests.Response:
         """
         :param url: The PreparedRequest with the method, URL and parameters for the request.
         :type url: requests.PreparedRequest
 
-        :returns: Returns a requests.Response object generated by performing the URL request with our session.
+        :raise RequestDropped: Raises exception when a Scheduler is set, and no slot became available in time.
+        :raise DeadlineExceeded: Raises exception when the current deadline expired before the response was received.
+        :raise CircuitOpen: Raises exception when a CircuitBreaker is set, and it is open.
+
+        :returns: Returns a requests.Response object generated by performing the URL request with our transport.
         :rtype: requests.Response
         """
-        return self._session.send(url, timeout=self._timeout)
+        import requests
+        active_deadline = current_deadline()
+        if active_deadline is not None:
+            active_deadline.check()
+
+        breaker = self._circuit_breaker
+        if breaker is not None:
+            breaker.before_request()
+        try:
+            response = self._schedule(url, active_deadline)
+        except requests.exceptions.RequestException:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.cancel()
+            raise
+        if breaker is not None:
+            if STATUS_CODE_EXCEPTIONS.get(response.status_code) is ServerException:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        if self._quota_tracker is not None:
+            self._quota_tracker.record(current_endpoint(), response.status_code)
+        if self._credentials is not None:
+            self._credentials.report(url, response.status_code)
+
+        if active_deadline is not None:
+            active_deadline.complete()
+        return response
+
+    def _schedule(self, url: requests.PreparedRequest, active_deadline: Deadline = None) -> requests.Response:
+        """
+        :param url: The PreparedRequest with the method, URL and parameters for the request.
+        :type url: requests.PreparedRequest
+        :param active_deadline: Deadline which limits the time spent waiting for a Scheduler slot. (defaults to None)
+        :type active_deadline: Deadline
+
+        :raise RequestDropped: Raises exception when a Scheduler is set, and no slot became available in time.
+        :raise DeadlineExceeded: Raises exception when active_deadline expired before the response was received.
+
+        :returns: Returns a requests.Response object generated by performing the URL request with our transport, in a Scheduler slot if a Scheduler is set.
+        :rtype: requests.Response
+        """
+        if self._scheduler is None:
+            return self._send_limited(url, active_deadline)
+        try:
+            lane = self._scheduler.acquire(self._lane, None if active_deadline is None else active_deadline.remaining())
+        except RequestDropped as e:
+            if active_deadline is not None and active_deadline.expired:
+                raise active_deadline.exception() from e
+            raise
+        try:
+            return self._send_limited(url, active_deadline)
+        finally:
+            self._scheduler.release(lane)
+
+    def _send_limited(self, url: requests.PreparedRequest, active_deadline: Deadline = None) -> requests.Response:
+        """
+        :param url: The PreparedRequest with the method, URL and parameters for the request.
+        :type url: requests.PreparedRequest
+        :param active_deadline: Deadline which limits the time spent waiting for the limiter. (defaults to None)
+        :type active_deadline: Deadline
+
+        :raise DeadlineExceeded: Raises exception when active_deadline expired before the response was received.
+
+        :returns: Returns a requests.Response object generated by performing the URL request with our transport, 
+                  once the AdaptiveLimiter allows it if one is set. The outcome is passed to the limiter.
+        :rtype: requests.Response
+        """
+        limiter = self._limiter
+        if limiter is None:
+            return self._send_now(url, active_deadline)
+        import requests
+        token = limiter.acquire(None if active_deadline is None else active_deadline.remaining())
+        if token is None:
+            raise active_deadline.exception()
+        try:
+            response = self._send_now(url, active_deadline)
+        except requests.exceptions.Timeout:
+            limiter.release(token, congested=True)
+            raise
+        except BaseException:
+            limiter.cancel(token)
+            raise
+        limiter.release(token, congested=STATUS_CODE_EXCEPTIONS.get(response.status_code) in (RateLimited, ServerException))
+        return response
+
+    def _send_now(self, url: requests.PreparedRequest, active_deadline: Deadline = None) -> requests.Response:
+        """
+        :param url: The PreparedRequest with the method, URL and parameters for the request.
+        :type url: requests.PreparedRequest
+        :param active_deadline: Deadline which lowers the timeout to the remaining time. (defaults to None)
+        :type active_deadline: Deadline
+
+        :raise DeadlineExceeded: Raises exception when active_deadline expired before the response was received.
+
+        :returns: Returns a requests.Response object generated by performing the URL request with our transport, without scheduling.
+        :rtype: requests.Response
+        """
+        if active_deadline is not None:
+            # The deadline may have expired while waiting for a Scheduler or limiter slot, leaving a timeout of 0,
+            # which requests rejects. The timeout is computed first, so it is positive once the check passes.
+            timeout = active_deadline.timeout(self._timeout)
+            active_deadline.check()
+        with self._requests_lock:
+            self._requests_sent += 1
+        trace = current_trace() if self._tracer is not None else None
+        if trace is not None:
+            # The time since the request was prepared, or looked up in the cache, was spent waiting for a slot.
+            trace.mark("wait")
+        try:
+            if active_deadline is None:
+                return self._transport.send(url, self._timeout)
+            import requests
+            try:
+                return self._transport.send(url, timeout)
+            except requests.exceptions.Timeout as e:
+                if active_deadline.expired:
+                    raise active_deadline.exception() from e
+                raise
+        finally:
+            if trace is not None:
+                trace.mark("network")
+
+    def deadline(self, seconds: float) -> Iterator[Deadline]:
+        """
+        Returns a context manager limiting the total time spent on all requests made within it,
+        including waiting for a Scheduler slot, and fetching multiple pages:
+
+        .. code-block :: python
+            :linenos:
+
+            with api.deadline(2.0):
+                icon = api.get_icon(12)
+                collection = api.get_collection(icon.collections[0].id)
+
+        Requests are not sent once the deadline has expired, and requests in flight time out when it expires.
+        Both cases raise DeadlineExceeded, holding the number of requests completed within the deadline.
+
+        :param seconds: Number of seconds until the deadline expires.
+        :type seconds: float
+
+        :returns: Context manager yielding the Deadline.
+        :rtype: Iterator[Deadline]
+        """
+        return deadline(seconds)
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """
+        Getter for circuit_breaker property.
+
+        :returns: The CircuitBreaker of this object, or None. Eg. api.circuit_breaker.state == "open".
+        :rtype: CircuitBreaker
+        """
+        return self._circuit_breaker
+
+    @property
+    def limiter(self) -> AdaptiveLimiter:
+        """
+        Getter for limiter property.
+
+        :returns: The AdaptiveLimiter of this object, or None. Eg. api.limiter.limit == 12.
+        :rtype: AdaptiveLimiter
+        """
+        return self._limiter
+
+    @property
+    def quota_tracker(self) -> QuotaTracker:
+        """
+        Getter for quota_tracker property.
+
+        :returns: The QuotaTracker of this object, or None. Eg. print(api.quota_tracker.summary()).
+        :rtype: QuotaTracker
+        """
+        return self._quota_tracker
+
+    @property
+    def credentials(self) -> CredentialPool:
+        """
+        Getter for credentials property.
+
+        :returns: The CredentialPool of this object, or None. Eg. api.credentials.available().
+        :rtype: CredentialPool
+        """
+        return self._credentials
+
+    @property
+    def tracer(self) -> Tracer:
+        """
+        Getter for tracer property.
+
+        :returns: The Tracer of this object, or None. Eg. api.tracer.dump("traces.jsonl").
+        :rtype: Tracer
+        """
+        return self._tracer
+
+    @property
+    def requests_sent(self) -> int:
+        """
+        Getter for requests_sent property.
+
+        :returns: The number of requests sent to the API by this object, excluding requests answered from the cache.
+        :rtype: int
+        """
+        return self._requests_sent
 
     def _prepare_url(self, url: str, **params: dict) -> requests.PreparedRequest:
         """
@@ -53,14 +360,71 @@ class Core(Keys):
         :param params: The parameters to be added onto the string.
         :type params: dict
 
+        :raise CredentialsExhausted: Raises exception when a CredentialPool is set, and none of its keys are available.
+
+        :returns: A requests.PreparedRequest object.
+        :rtype: requests.PreparedRequest 
+        """
+        if self._credentials is not None:
+            auth = self._credentials.choose().oauth
+        else:
+            if self._session.auth is None:
+                self._session.auth = self._get_oauth()
+            auth = self._session.auth
+        if self._method == "GET" and not self._session.params and _PLAIN_URL.fullmatch(url):
+            return self._prepare_get(url, params, auth)
+        return self._prepare_request(url, params, auth)
+
+    def _prepare_request(self, url: str, params: dict, auth: OAuth1 = None) -> requests.PreparedRequest:
+        """
+        Returns a requests.PreparedRequest object for a request self._method as method, prepared by the session.
+        Handles any URL, and both GET parameters and POST json.
+
+        :param url: The URL of the requested endpoint.
+        :type url: str
+        :param params: The parameters to be added onto the string, or to be sent as json.
+        :type params: dict
+        :param auth: The OAuth1 object to sign the request with. (defaults to None, i.e. the auth of the session)
+        :type auth: OAuth1
+
         :returns: A requests.PreparedRequest object.
         :rtype: requests.PreparedRequest 
         """
-        if self._session.auth is None:
-            self._session.auth = self._get_oauth()
-        req = requests.Request(self._method, url, **{"params" if self._method == "GET" else "json": params})
+        import requests
+        req = requests.Request(self._method, url, auth=auth, **{"params" if self._method == "GET" else "json": params})
         return self._session.prepare_request(req)
 
+    def _prepare_get(self, url: str, params: dict, auth: OAuth1 = None) -> requests.PreparedRequest:
+        """
+        Returns the same requests.PreparedRequest object for a GET request as _prepare_request, 
+        but without merging the settings of the session through requests.Request, and without parsing and requoting the URL.
+        Only valid for URLs matching _PLAIN_URL, which requests would not change.
+
+        :param url: The URL of the requested endpoint.
+        :type url: str
+        :param params: The parameters to be added onto the string. Parameters which are None are left out.
+        :type params: dict
+        :param auth: The OAuth1 object to sign the request with. (defaults to None, i.e. the auth of the session)
+        :type auth: OAuth1
+
+        :returns: A requests.PreparedRequest object.
+        :rtype: requests.PreparedRequest 
+        """
+        from requests import PreparedRequest
+        from requests.structures import CaseInsensitiveDict
+        from requests.cookies import RequestsCookieJar, merge_cookies
+
+        session = self._session
+        prepared = PreparedRequest()
+        prepared.method = "GET"
+        query = urlencode([(key, value) for key, value in params.items() if value is not None], doseq=True)
+        prepared.url = f"{url}?{query}" if query else url
+        prepared.headers = CaseInsensitiveDict(session.headers)
+        prepared.prepare_cookies(merge_cookies(RequestsCookieJar(), session.cookies) if session.cookies else RequestsCookieJar())
+        prepared.prepare_hooks({"response": session.hooks["response"]})
+        prepared.prepare_auth(session.auth if auth is None else auth)
+        return prepared
+
     def _type_assert(self, param: Any, param_name: str, types: Union[Type[Any], Tuple[Type[Any], ...]]) -> None:
         """
         Asserts that param is an instance of any type in types.
@@ -141,6 +505,9 @@ class Core(Keys):
 
     def _close_session(self):
         """
-        Closes the requests.Session used for making requests.
+        Closes the requests.Session and the Transport used for making requests.
         """
-        self._session.close()
\ No newline at end of file
+        if self._lazy_transport is not None:
+            self._lazy_transport.close()
+        if self._lazy_session is not None:
+            self._lazy_session.close()
\ No newline at end of file
@@ -0,0 +1,218 @@
+import re
+import time
+import random
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import unquote
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from TheNounProjectAPI.models import UsageModel
+from TheNounProjectAPI.quota import PERIODS
+from TheNounProjectAPI.exceptions import STATUS_CODE_EXCEPTIONS, APIException, Unauthorized, Forbidden, RateLimited, CredentialsExhausted
+
+# Extracts the key from the Authorization header added by OAuth1, eg. OAuth oauth_nonce="...", oauth_consumer_key="key", ...
+_CONSUMER_KEY = re.compile(r'oauth_consumer_key="([^"]*)"')
+
+class Credential:
+    """
+    Credential is a class holding an API key and secret of a CredentialPool, and the state of the key within the pool.
+    """
+    def __init__(self, key: str, secret: str):
+        """ Constructs a new 'Credential' object for key and secret. """
+        self.key = key
+        self.secret = secret
+        self.remaining: Optional[int] = None
+        """ Estimated number of requests left within the tightest limit of the key, or None if its usage was not fetched yet. """
+        self.resets_at = float("inf")
+        """ time.monotonic() timestamp after which the period of the tightest limit has passed, and remaining is no longer known. """
+        self.disabled_until = 0.0
+        """ time.monotonic() timestamp until which the key is out of rotation. """
+        self.requests_sent = 0
+        """ Number of requests sent with the key which received a response. """
+        self._oauth = None
+
+    @property
+    def oauth(self) -> "OAuth1":
+        """
+        :returns: The OAuth1 object signing requests with this key, created on first use.
+        :rtype: OAuth1
+        """
+        if self._oauth is None:
+            from requests_oauthlib import OAuth1
+            self._oauth = OAuth1(self.key, self.secret)
+        return self._oauth
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the key and the estimated number of requests left.
+            eg: <Credential: Key: 3d8f..., Remaining: 4120> """
+        return f"<Credential: Key: {self.key[:4]}..., Remaining: {self.remaining}>"
+
+class CredentialPool:
+    """
+    CredentialPool is a class spreading requests over several API keys, to increase the total throughput within the limits of each key::
+
+        pool = CredentialPool([(key_1, secret_1), (key_2, secret_2)])
+        api = API(credentials=pool)
+        pool.refresh(api)
+
+    Every request is signed with a key chosen at random, weighted by the number of requests the key has left
+    within its tightest limit, as reported by get_usage in refresh and counted down for every response since.
+    Keys which have not been refreshed are weighted like the average refreshed key, as are keys whose tightest limit
+    applies to a period which has passed since their refresh, eg. an hour for the hourly limit. A key with no requests left
+    thus returns to rotation once its period has passed.
+    A key which receives an Unauthorized, Forbidden or RateLimited response is taken out of rotation for `cooldown` seconds.
+
+    The pool may be shared by multiple API objects, whose own key and secret are then not used.
+    """
+    def __init__(self, credentials: Iterable[Union[Tuple[str, str], Credential]], cooldown: float = 60.0, seed: int = None):
+        """
+        Construct a new pool of credentials.
+
+        :param credentials: (key, secret) tuples, or Credential objects.
+        :type credentials: Iterable[Union[Tuple[str, str], Credential]]
+        :param cooldown: Number of seconds a key is taken out of rotation after it was rejected or rate limited. (defaults to 60.0)
+        :type cooldown: float
+        :param seed: Seed for choosing keys, for reproducible rotations. (defaults to None)
+        :type seed: int
+        """
+        self.credentials: List[Credential] = [credential if isinstance(credential, Credential) else Credential(*credential)
+                                              for credential in credentials]
+        self.cooldown = cooldown
+        self._by_key = {credential.key: credential for credential in self.credentials}
+        self._random = random.Random(seed)
+        self._pinned: ContextVar[Optional[Credential]] = ContextVar("credential", default=None)
+        self._lock = threading.Lock()
+
+    def available(self) -> List[Credential]:
+        """
+        :returns: The credentials which are in rotation, i.e. not cooling down, and not known to have no requests left.
+        :rtype: List[Credential]
+        """
+        now = time.monotonic()
+        with self._lock:
+            for credential in self.credentials:
+                if credential.resets_at <= now:
+                    credential.remaining = None
+                    credential.resets_at = float("inf")
+            return [credential for credential in self.credentials
+                    if credential.disabled_until <= now and (credential.remaining is None or credential.remaining > 0)]
+
+    def choose(self) -> Credential:
+        """
+        Chooses the credential to sign the next request with. Called by Core for every request.
+
+        :raise CredentialsExhausted: Raises exception when no credential is in rotation.
+
+        :returns: The credential pinned with using(), or one of the available credentials, weighted by their remaining requests.
+        :rtype: Credential
+        """
+        pinned = self._pinned.get()
+        if pinned is not None:
+            return pinned
+        credentials = self.available()
+        if not credentials:
+            now = time.monotonic()
+            raise CredentialsExhausted(max(min(credential.disabled_until for credential in self.credentials) - now, 0.0))
+        known = [credential.remaining for credential in credentials if credential.remaining is not None]
+        default = sum(known) / len(known) if known else 1
+        weights = [default if credential.remaining is None else credential.remaining for credential in credentials]
+        with self._lock:
+            return self._random.choices(credentials, weights)[0]
+
+    @contextmanager
+    def using(self, credential: Credential) -> Iterator[Credential]:
+        """
+        Context manager signing all requests in its body with credential, even if it is out of rotation::
+
+            with pool.using(pool.credentials[0]):
+                api.get_usage()
+        """
+        token = self._pinned.set(credential)
+        try:
+            yield credential
+        finally:
+            self._pinned.reset(token)
+
+    def credential_for(self, prepared_request: "requests.PreparedRequest") -> Optional[Credential]:
+        """
+        :returns: The credential prepared_request was signed with, or None if it was not signed by a credential of this pool.
+        :rtype: Optional[Credential]
+        """
+        authorization = prepared_request.headers.get("Authorization")
+        if isinstance(authorization, bytes):
+            authorization = authorization.decode("utf-8", "replace")
+        match = _CONSUMER_KEY.search(authorization or "")
+        return self._by_key.get(unquote(match.group(1))) if match else None
+
+    def report(self, prepared_request: "requests.PreparedRequest", status_code: int) -> None:
+        """
+        Counts down the requests left of the credential prepared_request was signed with,
+        and takes it out of rotation if the status code indicates Unauthorized, Forbidden or RateLimited.
+        Called by Core for every request which received a response.
+
+        :param prepared_request: The request which was sent.
+        :type prepared_request: requests.PreparedRequest
+        :param status_code: Status code of the response.
+        :type status_code: int
+        """
+        credential = self.credential_for(prepared_request)
+        if credential is None:
+            return
+        with self._lock:
+            credential.requests_sent += 1
+            if credential.remaining is not None:
+                credential.remaining = max(credential.remaining - 1, 0)
+            if STATUS_CODE_EXCEPTIONS.get(status_code) in (Unauthorized, Forbidden, RateLimited):
+                credential.disabled_until = time.monotonic() + self.cooldown
+
+    def update(self, credential: Credential, usage: UsageModel) -> None:
+        """
+        Sets the requests left of credential from its usage, as the least left of any period with a limit,
+        until that period has passed.
+
+        :param credential: The credential the usage belongs to.
+        :type credential: Credential
+        :param usage: The result of get_usage, signed with credential.
+        :type usage: UsageModel
+        """
+        limits = usage.json.get("limits") or {}
+        used = usage.json.get("usage") or {}
+        remaining = [(limit - (used.get(period) or 0), period) for period, limit in limits.items() if limit is not None]
+        with self._lock:
+            if remaining:
+                left, period = min(remaining)
+                credential.remaining = max(left, 0)
+                credential.resets_at = time.monotonic() + dict(PERIODS).get(period, float("inf"))
+            else:
+                credential.remaining = None
+                credential.resets_at = float("inf")
+
+    def refresh(self, api) -> None:
+        """
+        Fetches the usage of every credential with api.get_usage, and updates their requests left.
+        Credentials whose usage can not be fetched, due to an error response or a connection error,
+        are taken out of rotation for cooldown seconds.
+
+        :param api: API object using this pool.
+        :type api: API
+        """
+        from requests.exceptions import RequestException
+        for credential in self.credentials:
+            with self.using(credential):
+                try:
+                    usage = api.get_usage()
+                except (APIException, RequestException):
+                    with self._lock:
+                        credential.disabled_until = time.monotonic() + self.cooldown
+                    continue
+            self.update(credential, usage)
+
+    def __len__(self) -> int:
+        """ Returns the number of credentials in the pool. """
+        return len(self.credentials)
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the number of credentials, and how many of them are in rotation.
+            eg: <CredentialPool: Credentials: 3, Available: 2> """
+        return f"<CredentialPool: Credentials: {len(self.credentials)}, Available: {len(self.available())}>"
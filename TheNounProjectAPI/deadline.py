@@ -0,0 +1,110 @@
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Union, Tuple, Iterator, Optional
+
+from TheNounProjectAPI.exceptions import DeadlineExceeded
+
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar("deadline", default=None)
+
+class Deadline:
+    """
+    Deadline is a class holding the moment by which all requests made within ``with api.deadline(seconds):`` must be done,
+    and the number of requests which completed within it.
+    """
+    def __init__(self, seconds: float, parent: "Deadline" = None):
+        """
+        Constructs a new 'Deadline' object, expiring seconds from now, or when parent expires if that is sooner.
+
+        :param seconds: Number of seconds until the deadline expires.
+        :type seconds: float
+        :param parent: The deadline this one is nested in. (defaults to None)
+        :type parent: Deadline
+        """
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+        if parent is not None and parent.expires < self.expires:
+            self.seconds = parent.seconds
+            self.expires = parent.expires
+        self.parent = parent
+        self.completed = 0
+        """ Number of requests completed within this deadline. """
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """
+        :returns: Number of seconds until the deadline expires, 0.0 if it has expired.
+        :rtype: float
+        """
+        return max(self.expires - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """
+        :returns: Whether the deadline has expired.
+        :rtype: bool
+        """
+        return time.monotonic() >= self.expires
+
+    def check(self) -> None:
+        """
+        :raise DeadlineExceeded: Raises exception when the deadline has expired.
+        """
+        if self.expired:
+            raise self.exception()
+
+    def exception(self) -> DeadlineExceeded:
+        """
+        :returns: DeadlineExceeded exception describing how many requests were completed within this deadline.
+        :rtype: DeadlineExceeded
+        """
+        return DeadlineExceeded(self.seconds, self.completed)
+
+    def timeout(self, timeout: Union[float, Tuple[float, float], None]) -> Union[float, Tuple[float, float]]:
+        """
+        :param timeout: Float timeout in seconds, 2-tuples for seperate connect and read timeouts, and None for no timeout.
+        :type timeout: Union[float, Tuple[float, float], None]
+
+        :returns: timeout, lowered so that no part of it exceeds the remaining time.
+        :rtype: Union[float, Tuple[float, float]]
+        """
+        remaining = self.remaining()
+        if isinstance(timeout, tuple):
+            return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def complete(self) -> None:
+        """
+        Records a completed request, for this deadline and the deadlines it is nested in.
+        """
+        with self._lock:
+            self.completed += 1
+        if self.parent is not None:
+            self.parent.complete()
+
+def current_deadline() -> Optional[Deadline]:
+    """
+    :returns: The innermost active Deadline of the current thread or task, or None.
+    :rtype: Optional[Deadline]
+    """
+    return _current_deadline.get()
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """
+    Context manager limiting the total time spent on requests made within it, including waiting for a Scheduler slot,
+    and all pages fetched within it. Nested deadlines can only shorten the outer deadline. 
+    Applies to the current thread or task, and to work submitted with contextvars.copy_context().
+
+    :param seconds: Number of seconds until the deadline expires.
+    :type seconds: float
+
+    :returns: The Deadline, which holds the number of requests completed within it.
+    :rtype: Iterator[Deadline]
+    """
+    token = _current_deadline.set(Deadline(seconds, parent=_current_deadline.get()))
+    try:
+        yield _current_deadline.get()
+    finally:
+        _current_deadline.reset(token)
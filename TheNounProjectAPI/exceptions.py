@@ -1,5 +1,3 @@
-from requests import codes
-
 class APIException(Exception):
     """ Base exception for all exceptions related to status codes within this package. """
     def __init__(self, response, description):
@@ -50,21 +48,22 @@ class UnknownStatusCode(APIException):
     def __init__(self, response):
         super().__init__(response, f"Unknown status code encountered.")
 
-STATUS_CODE_SUCCESS = (codes["ok"], codes["created"])
+# Status codes are written out rather than taken from requests.codes, so importing this module does not import requests.
+STATUS_CODE_SUCCESS = (200, 201) # ok, created
 
 STATUS_CODE_EXCEPTIONS = {
-    codes["bad_gateway"]: ServerException,
-    codes["bad_request"]: BadRequest,
-    codes["found"]: Redirect,
-    codes["forbidden"]: Forbidden,
-    codes["gateway_timeout"]: ServerException,
-    codes["internal_server_error"]: ServerException,
-    codes["not_found"]: NotFound,
-    codes["service_unavailable"]: ServerException,
-    codes["unauthorized"]: Unauthorized,
-    codes["unavailable_for_legal_reasons"]: LegalReasons,
-    codes["too_many"]: RateLimited,
-    codes["timeout"]: RateLimited,
+    502: ServerException, # bad_gateway
+    400: BadRequest, # bad_request
+    302: Redirect, # found
+    403: Forbidden, # forbidden
+    504: ServerException, # gateway_timeout
+    500: ServerException, # internal_server_error
+    404: NotFound, # not_found
+    503: ServerException, # service_unavailable
+    401: Unauthorized, # unauthorized
+    451: LegalReasons, # unavailable_for_legal_reasons
+    429: RateLimited, # too_many
+    408: RateLimited, # timeout
     # Cloudflare status (not named in requests)
     520: ServerException,
     522: ServerException,
@@ -111,3 +110,43 @@ class APIKeyNotSet(ParameterException):
     """ Indicate that the parameter key has not been set properly. """
     def __init__(self, parameter):
         super().__init__(parameter, description=f"must be set before making a request.")
+
+class IllegalRendition(ParameterException):
+    """ 
+    Indicate that the parameter does not follow the rules for a rendition: 
+    
+    * parameter must be the name of an IconModel attribute holding the URL of an image.
+    """
+    def __init__(self, parameter):
+        super().__init__(parameter, description=f"must only contain preview_url, preview_url_42, preview_url_84 or icon_url.")
+
+class ClientException(Exception):
+    """ Base exception for all exceptions raised by this package instead of sending a request, or instead of waiting for its response. """
+    def __init__(self, description):
+        super().__init__(f"Error: {description}")
+
+class RequestDropped(ClientException):
+    """ Indicate that the request waited too long for a free slot in its lane of the Scheduler, and was not sent. """
+    def __init__(self, lane, waited):
+        self.lane = lane
+        self.waited = waited
+        super().__init__(f"Request in lane \'{lane}\' dropped after waiting {waited:.2f}s for a free slot.")
+
+class DeadlineExceeded(ClientException):
+    """ Indicate that the deadline set using ``with api.deadline(seconds):`` expired. """
+    def __init__(self, seconds, completed):
+        self.seconds = seconds
+        self.completed = completed
+        super().__init__(f"Deadline of {seconds:.2f}s exceeded after {completed} completed request{'' if completed == 1 else 's'}.")
+
+class CircuitOpen(ClientException):
+    """ Indicate that the request was not sent, as the CircuitBreaker is open after repeated failures of the API. """
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"Circuit breaker is open, the API will be tried again in {retry_after:.2f}s.")
+
+class CredentialsExhausted(ClientException):
+    """ Indicate that the request was not sent, as every key of the CredentialPool is cooling down or has no requests left. """
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"No credentials available, the first key returns to rotation in {retry_after:.2f}s.")
@@ -0,0 +1,160 @@
+from functools import lru_cache
+from typing import Iterable, Any, Optional
+
+from TheNounProjectAPI.models import IconModel
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+def _int(value: Any) -> Optional[int]:
+    """
+    :returns: value as int, or None if it is missing or not numeric, eg. "".
+    :rtype: Optional[int]
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _str(value: Any) -> Optional[str]:
+    """
+    :returns: value as str, or None if it is missing.
+    :rtype: Optional[str]
+    """
+    return None if value is None else str(value)
+
+# Names of the flat icon fields, and whether they are converted to integers.
+_ICON_FIELDS = (
+    ("id", True),
+    ("term", False),
+    ("term_slug", False),
+    ("term_id", True),
+    ("attribution", False),
+    ("date_uploaded", False),
+    ("is_active", False),
+    ("license_description", False),
+    ("permalink", False),
+    ("preview_url", False),
+    ("preview_url_42", False),
+    ("preview_url_84", False),
+    ("icon_url", False),
+    ("year", True),
+    ("sponsor_id", False),
+    ("uploader_id", True),
+)
+_UPLOADER_FIELDS = ("location", "name", "permalink", "username")
+
+@lru_cache(maxsize=None)
+def icon_schema() -> "pa.Schema":
+    """
+    :raise ImportError: Raises exception when pyarrow is not installed.
+
+    :returns: The schema of icon record batches, with the nested uploader as a struct, and tags as a list of structs.
+    :rtype: pyarrow.Schema
+    """
+    if pa is None:
+        raise ImportError("Exporting icons requires pyarrow. Install it using `pip install pyarrow`.")
+    fields = [pa.field(name, pa.int64() if integer else pa.string()) for name, integer in _ICON_FIELDS]
+    fields.append(pa.field("uploader", pa.struct([pa.field(name, pa.string()) for name in _UPLOADER_FIELDS])))
+    fields.append(pa.field("tags", pa.list_(pa.struct([pa.field("id", pa.int64()), pa.field("slug", pa.string())]))))
+    return pa.schema(fields)
+
+def icons_to_record_batch(icons: Iterable[IconModel]) -> "pa.RecordBatch":
+    """
+    Converts icons, eg. a page returned by get_icons_by_term, to an Arrow record batch with the icon_schema().
+    The values are converted column by column, and fields missing from an icon become nulls.
+
+    :param icons: The icons to convert.
+    :type icons: Iterable[IconModel]
+
+    :raise ImportError: Raises exception when pyarrow is not installed.
+
+    :returns: Record batch with one row per icon.
+    :rtype: pyarrow.RecordBatch
+    """
+    schema = icon_schema()
+    data = [icon.json for icon in icons]
+    columns = []
+    for name, integer in _ICON_FIELDS:
+        convert = _int if integer else _str
+        columns.append([convert(item.get(name)) for item in data])
+    uploaders = []
+    for item in data:
+        uploader = item.get("uploader")
+        uploaders.append({name: _str(uploader.get(name)) for name in _UPLOADER_FIELDS} if isinstance(uploader, dict) else None)
+    columns.append(uploaders)
+    columns.append([[{"id": _int(tag.get("id")), "slug": _str(tag.get("slug"))} for tag in item.get("tags") or ()] for item in data])
+    arrays = [pa.array(column, type=field.type) for column, field in zip(columns, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+class ParquetIconWriter:
+    """
+    ParquetIconWriter writes pages of icons to a Parquet file incrementally,
+    so only one page at a time is held as Python objects::
+
+        with ParquetIconWriter("goats.parquet") as writer:
+            for offset in range(0, 1000, 50):
+                writer.write(api.get_icons_by_term("goat", limit=50, offset=offset))
+    """
+    def __init__(self, path: str, **kwargs):
+        """
+        Construct a new writer for the Parquet file at path.
+
+        :param path: Path of the Parquet file to write. Replaced if it exists.
+        :type path: str
+        :param kwargs: Keyword arguments passed on to pyarrow.parquet.ParquetWriter, eg. compression="zstd".
+
+        :raise ImportError: Raises exception when pyarrow is not installed.
+        """
+        self.rows = 0
+        """ Number of icons written so far. """
+        schema = icon_schema()
+        self._writer = pq.ParquetWriter(path, schema, **kwargs)
+
+    def write(self, icons: Iterable[IconModel]) -> None:
+        """
+        Writes icons to the file, as a record batch.
+
+        :param icons: The icons to write, eg. a page returned by get_icons_by_term.
+        :type icons: Iterable[IconModel]
+        """
+        batch = icons_to_record_batch(icons)
+        if batch.num_rows:
+            self._writer.write_batch(batch)
+            self.rows += batch.num_rows
+
+    def close(self) -> None:
+        """
+        Writes the footer of the file, and closes it.
+        """
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def export_icons(pages: Iterable[Iterable[IconModel]], path: str, **kwargs) -> int:
+    """
+    Writes pages of icons to the Parquet file at path, one page at a time.
+
+    :param pages: Pages of icons, eg. IconsModel objects returned by get_icons_by_term, or a generator of these.
+    :type pages: Iterable[Iterable[IconModel]]
+    :param path: Path of the Parquet file to write. Replaced if it exists.
+    :type path: str
+    :param kwargs: Keyword arguments passed on to pyarrow.parquet.ParquetWriter, eg. compression="zstd".
+
+    :raise ImportError: Raises exception when pyarrow is not installed.
+
+    :returns: Number of icons written.
+    :rtype: int
+    """
+    with ParquetIconWriter(path, **kwargs) as writer:
+        for page in pages:
+            writer.write(page)
+    return writer.rows
@@ -0,0 +1,196 @@
+import json
+import sqlite3
+from typing import Union, Iterable, List
+
+from TheNounProjectAPI.models import IconModel, IconsModel
+from TheNounProjectAPI.exceptions import IncorrectType, IllegalTerm, NotFound
+
+class IconIndex:
+    """
+    IconIndex is a local, on-disk full text index of IconModel objects, backed by an SQLite FTS5 table.
+    It allows term and tag queries to be answered without making API requests::
+
+        index = IconIndex("icons.db")
+        index.add(api.get_icons_by_term("goat", limit=50))
+        index.search("goa", prefix=True)
+        # [<IconModel: Term: Goat, Slug: goat, Id: 24014>, ...]
+    """
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS icons (id INTEGER PRIMARY KEY, json TEXT NOT NULL);
+        CREATE VIRTUAL TABLE IF NOT EXISTS icons_fts USING fts5(term, tags, term_slug, attribution, uploader);
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Construct a new object for indexing icons, stored in the SQLite database at path.
+
+        :param path: Path of the SQLite database. Created if it does not exist. (defaults to ":memory:")
+        :type path: str
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(self._schema)
+
+    def __len__(self) -> int:
+        """ Returns the number of indexed icons. """
+        return self._connection.execute("SELECT COUNT(*) FROM icons").fetchone()[0]
+
+    def __contains__(self, _id: Union[int, str]) -> bool:
+        """ Allows icon_id in index. """
+        return self._connection.execute("SELECT 1 FROM icons WHERE id = ?", (int(_id),)).fetchone() is not None
+
+    @staticmethod
+    def _fields(icon: IconModel) -> tuple:
+        """
+        :returns: Tuple of the term, tags, term_slug, attribution and uploader text of icon, to be indexed.
+        :rtype: tuple
+        """
+        json_data = icon.json
+        tags = " ".join(tag.get("slug", "") for tag in json_data.get("tags", []) if isinstance(tag, dict))
+        uploader = json_data.get("uploader") or {}
+        uploader = " ".join(str(uploader.get(key) or "") for key in ("name", "username"))
+        return (json_data.get("term", ""), tags, json_data.get("term_slug", ""), json_data.get("attribution", ""), uploader)
+
+    def add(self, icons: Iterable[IconModel]) -> int:
+        """
+        Adds icons to the index, replacing previously indexed icons with the same id.
+
+        :param icons: Iterable of IconModel objects, eg. an IconsModel.
+        :type icons: Iterable[IconModel]
+
+        :returns: The number of icons which were not yet in the index.
+        :rtype: int
+        """
+        added = 0
+        with self._connection:
+            for icon in icons:
+                _id = int(icon.id)
+                if _id in self:
+                    self._connection.execute("DELETE FROM icons_fts WHERE rowid = ?", (_id,))
+                else:
+                    added += 1
+                self._connection.execute("INSERT OR REPLACE INTO icons (id, json) VALUES (?, ?)", (_id, json.dumps(icon.json)))
+                self._connection.execute("INSERT INTO icons_fts (rowid, term, tags, term_slug, attribution, uploader) VALUES (?, ?, ?, ?, ?, ?)",
+                                         (_id,) + self._fields(icon))
+        return added
+
+    def get(self, _id: Union[int, str]) -> IconModel:
+        """
+        Fetches a single indexed :ref:`icon-label` by id.
+
+        :param _id: Icon id.
+        :type _id: Union[int, str]
+
+        :raise KeyError: Raises exception when no icon with this id is indexed.
+
+        :returns: IconModel object identified by the _id.
+        :rtype: IconModel
+        """
+        row = self._connection.execute("SELECT json FROM icons WHERE id = ?", (int(_id),)).fetchone()
+        if row is None:
+            raise KeyError(_id)
+        return IconModel.parse(json.loads(row[0]))
+
+    @staticmethod
+    def _match(text: str, column: str = None, prefix: bool = False) -> str:
+        """
+        :returns: FTS5 query matching all words in text, with each word quoted so no FTS5 syntax is interpreted.
+        :rtype: str
+        """
+        words = [word.replace('"', '""') for word in text.split()]
+        query = " ".join(f"\"{word}\"" + ("*" if prefix else "") for word in words)
+        if column is not None:
+            query = f"{column} : ({query})"
+        return query
+
+    def _query(self, match: str, limit: int, offset: int) -> IconsModel:
+        """
+        :returns: IconsModel of the icons matching the FTS5 query, ordered by relevance.
+        :rtype: IconsModel
+        """
+        rows = self._connection.execute("SELECT icons.json FROM icons_fts JOIN icons ON icons.id = icons_fts.rowid "
+                                        "WHERE icons_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+                                        (match, -1 if limit is None else limit, offset or 0)).fetchall()
+        return IconsModel.parse({"icons": [json.loads(row[0]) for row in rows]})
+
+    def search(self, term: str, prefix: bool = False, limit: int = None, offset: int = None) -> List[IconModel]:
+        """
+        Searches the index for :ref:`icons-label` by term, matching the term, tags, slug, attribution and uploader.
+
+        :param term: Search term. All words must match.
+        :type term: str
+        :param prefix: Whether the words may also match as prefix, eg. for autocompletion. (defaults to False)
+        :type prefix: bool
+        :param limit: Maximum number of results. (defaults to None)
+        :type limit: int
+        :param offset: Number of results to displace or skip over. (defaults to None)
+        :type offset: int
+
+        :raise IllegalTerm: Raises exception when term contains no words.
+
+        :returns: List of IconModel objects matching the term, ordered by relevance.
+        :rtype: List[IconModel]
+        """
+        if not isinstance(term, str):
+            raise IncorrectType("term", str)
+        if not term.split():
+            raise IllegalTerm("term")
+        return self._query(self._match(term, prefix=prefix), limit, offset)
+
+    def search_tag(self, tag: str, limit: int = None, offset: int = None) -> List[IconModel]:
+        """
+        Searches the index for :ref:`icons-label` with a tag.
+
+        :param tag: Tag slug.
+        :type tag: str
+        :param limit: Maximum number of results. (defaults to None)
+        :type limit: int
+        :param offset: Number of results to displace or skip over. (defaults to None)
+        :type offset: int
+
+        :raise IllegalTerm: Raises exception when tag contains no words.
+
+        :returns: List of IconModel objects with the tag, ordered by relevance.
+        :rtype: List[IconModel]
+        """
+        if not isinstance(tag, str):
+            raise IncorrectType("tag", str)
+        if not tag.split():
+            raise IllegalTerm("tag")
+        return self._query(self._match(tag, column="tags"), limit, offset)
+
+    def refresh(self, api, limit: int = 50, max_pages: int = None) -> int:
+        """
+        Incrementally adds recently uploaded icons to the index, using api.get_recent_icons.
+        Pages are fetched until a page contains an icon which is already indexed.
+
+        :param api: API object used to fetch the recent icons.
+        :type api: API
+        :param limit: Number of icons per page. (defaults to 50)
+        :type limit: int
+        :param max_pages: Maximum number of pages to fetch, or None for no maximum. (defaults to None)
+        :type max_pages: int
+
+        :returns: The number of icons which were not yet in the index.
+        :rtype: int
+        """
+        added = 0
+        page = 0
+        while max_pages is None or page < max_pages:
+            try:
+                icons = api.get_recent_icons(limit=limit, offset=page * limit)
+            except NotFound:
+                break
+            known = any(icon.id in self for icon in icons)
+            added += self.add(icons)
+            page += 1
+            if known or len(icons) < limit:
+                break
+        return added
+
+    def close(self) -> None:
+        """
+        Closes the connection to the SQLite database.
+        """
+        self._connection.close()
@@ -1,6 +1,4 @@
 
-from requests_oauthlib import OAuth1
-
 from TheNounProjectAPI.exceptions import APIKeyNotSet
 
 class Keys:
@@ -63,7 +61,7 @@ class Keys:
         """
         self._secret_key = secret
 
-    def _get_oauth(self) -> OAuth1:
+    def _get_oauth(self) -> "OAuth1":
         """
         Asserts that both api and secret keys have been set. 
 
@@ -76,4 +74,6 @@ class Keys:
             raise APIKeyNotSet("api_key")
         if not isinstance(self.secret_key, str):
             raise APIKeyNotSet("secret_key")
+        # Imported here, as requests_oauthlib is slow to import, and only needed once requests are made.
+        from requests_oauthlib import OAuth1
         return OAuth1(self.api_key, self.secret_key)
@@ -0,0 +1,220 @@
+import time
+import threading
+from typing import Callable, List, Optional
+
+class AdaptiveLimiter:
+    """
+    AdaptiveLimiter is a class limiting the number of requests in flight, with a limit which adapts to the API
+    using additive increase, multiplicative decrease (AIMD):
+
+    * While requests are fast and at least half of the limit is used, the limit grows by `increase` per `limit` completed requests,
+      i.e. by about `increase` per round trip.
+    * When a request is rate limited (429), fails on the server side (5xx) or times out, or when the smoothed round-trip time
+      grows beyond `latency_tolerance` times the lowest round-trip time seen, the limit is multiplied by `backoff`.
+      Requests which were already in flight at that moment do not lower the limit again.
+
+    The limiter may be shared by multiple API objects, and by threads and asyncio tasks::
+
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=32)
+        api = API(key, secret, limiter=limiter)
+        warm_cache(api, icon_ids=ids, max_workers=32)
+        limiter.limit
+
+    Every change of the limit is passed to the functions in `listeners`, eg. to update metrics.
+    """
+    def __init__(self, initial_limit: int = 4, min_limit: int = 1, max_limit: int = 64, increase: float = 1.0,
+                 backoff: float = 0.5, latency_tolerance: float = 2.0, smoothing: float = 0.2):
+        """
+        Construct a new adaptive limiter.
+
+        :param initial_limit: Number of requests allowed in flight at first. (defaults to 4)
+        :type initial_limit: int
+        :param min_limit: Lowest limit. (defaults to 1)
+        :type min_limit: int
+        :param max_limit: Highest limit. (defaults to 64)
+        :type max_limit: int
+        :param increase: Increase of the limit per round trip without congestion. (defaults to 1.0)
+        :type increase: float
+        :param backoff: Factor the limit is multiplied with on congestion. (defaults to 0.5)
+        :type backoff: float
+        :param latency_tolerance: Ratio of the smoothed round-trip time to the lowest round-trip time
+                                  above which the API is considered congested. (defaults to 2.0)
+        :type latency_tolerance: float
+        :param smoothing: Weight of the newest round-trip time in the smoothed round-trip time. (defaults to 0.2)
+        :type smoothing: float
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.listeners: List[Callable[["AdaptiveLimiter", int, int], None]] = []
+        """ Functions called with the limiter, the old limit and the new limit, whenever the limit changes. """
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._rtt = None
+        self._min_rtt = None
+        self._decreased_at = float("-inf")
+        self._condition = threading.Condition()
+        self._async_waiters = []
+        # Changes of the limit which have not been passed to the listeners yet, as (old limit, new limit) tuples.
+        self._changes = []
+
+    @property
+    def limit(self) -> int:
+        """
+        :returns: The current number of requests allowed in flight.
+        :rtype: int
+        """
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """
+        :returns: The number of requests currently in flight.
+        :rtype: int
+        """
+        return self._in_flight
+
+    @property
+    def rtt(self) -> Optional[float]:
+        """
+        :returns: The smoothed round-trip time in seconds, or None before the first request completed.
+        :rtype: Optional[float]
+        """
+        return self._rtt
+
+    def _set_limit(self, limit: float) -> None:
+        """
+        Changes the limit, and queues the change for the listeners if the integer limit changed.
+        Must be called with the lock held, and followed by a call to _notify once the lock is released.
+        """
+        old_limit = self.limit
+        self._limit = max(self.min_limit, min(limit, self.max_limit))
+        if self.limit != old_limit:
+            self._changes.append((old_limit, self.limit))
+
+    def _notify(self) -> None:
+        """
+        Calls the listeners with the queued changes of the limit. Must be called without the lock held,
+        so listeners may use the limiter, eg. acquire a slot or read its limit.
+        """
+        with self._condition:
+            changes, self._changes = self._changes, []
+            listeners = list(self.listeners)
+        for old_limit, limit in changes:
+            for listener in listeners:
+                listener(self, old_limit, limit)
+
+    def _wake(self) -> None:
+        """
+        Wakes as many waiting threads and tasks as there are free slots. Must be called with the lock held.
+        """
+        free = self.limit - self._in_flight
+        if free <= 0:
+            return
+        self._condition.notify(free)
+        for loop, future in self._async_waiters[:free]:
+            loop.call_soon_threadsafe(_resolve, future)
+        del self._async_waiters[:free]
+
+    def acquire(self, timeout: float = None) -> Optional[float]:
+        """
+        Waits until fewer requests than the limit are in flight, and takes a slot.
+        Must be followed by exactly one call to release or cancel.
+
+        :param timeout: Maximum number of seconds to wait, or None to wait indefinitely. (defaults to None)
+        :type timeout: float
+
+        :returns: Token to pass to release or cancel, or None if no slot became free within timeout.
+        :rtype: Optional[float]
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._in_flight >= self.limit:
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            self._in_flight += 1
+            return time.monotonic()
+
+    async def acquire_async(self) -> float:
+        """
+        Waits until fewer requests than the limit are in flight without blocking the event loop, and takes a slot.
+        Must be followed by exactly one call to release or cancel. Use asyncio.wait_for to limit the waiting time.
+
+        :returns: Token to pass to release or cancel.
+        :rtype: float
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return time.monotonic()
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            try:
+                await future
+            finally:
+                with self._condition:
+                    if (loop, future) in self._async_waiters:
+                        self._async_waiters.remove((loop, future))
+
+    def release(self, token: float, congested: bool = False) -> None:
+        """
+        Frees the slot taken by acquire, and adapts the limit to the outcome and round-trip time of the request.
+
+        :param token: The token returned by acquire.
+        :type token: float
+        :param congested: Whether the request was rate limited, failed on the server side, or timed out. (defaults to False)
+        :type congested: bool
+        """
+        now = time.monotonic()
+        rtt = now - token
+        with self._condition:
+            # Only grow the limit while it is being used, or an idle limiter would grow up to max_limit.
+            in_use = 2 * self._in_flight >= self.limit
+            self._in_flight -= 1
+            if not congested:
+                self._rtt = rtt if self._rtt is None else (1 - self.smoothing) * self._rtt + self.smoothing * rtt
+                # The lowest round-trip time slowly drifts up, so a lasting change of the baseline is eventually accepted.
+                self._min_rtt = rtt if self._min_rtt is None else min(self._min_rtt * 1.001, rtt)
+                congested = self._rtt > self.latency_tolerance * self._min_rtt
+            if congested:
+                # Only requests sent after the last decrease may decrease the limit again.
+                if token >= self._decreased_at:
+                    self._decreased_at = now
+                    self._set_limit(self._limit * self.backoff)
+                    # Start measuring the smoothed round-trip time again at the lower limit.
+                    self._rtt = None
+            elif in_use:
+                self._set_limit(self._limit + self.increase / self._limit)
+            self._wake()
+        self._notify()
+
+    def cancel(self, token: float) -> None:
+        """
+        Frees the slot taken by acquire, for a request which was not sent or did not complete, without adapting the limit.
+
+        :param token: The token returned by acquire.
+        :type token: float
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._wake()
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the limit and the number of requests in flight.
+            eg: <AdaptiveLimiter: Limit: 12, In Flight: 9> """
+        return f"<AdaptiveLimiter: Limit: {self.limit}, In Flight: {self.in_flight}>"
+
+def _resolve(future) -> None:
+    """
+    Wakes the task waiting for future, unless it has been cancelled.
+    """
+    if not future.done():
+        future.set_result(None)
@@ -1,8 +1,60 @@
 
-import requests
+from __future__ import annotations
 
-from typing import Any, Union, Tuple
+import json
+from datetime import timedelta
+
+from typing import Any, Union, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
    
+class ResponseMeta:
+    """
+    ResponseMeta is a small record of a requests.Response, kept by models instead of the full response 
+    when the API object is constructed with retain_response=False, or with a cache. 
+    Unlike the response, it holds no body, connection or request, so it is cheap to keep alive and to pickle.
+    """
+
+    headers_kept: Tuple[str, ...] = ("Content-Type", "Content-Length", "Date", "Cache-Control", "ETag", "Last-Modified", "Retry-After")
+    """ Names of the headers copied from the response. """
+
+    def __init__(self, status_code: int = None, url: str = None, elapsed: timedelta = None, headers: dict = None, reason: str = None):
+        """ Constructs a new 'ResponseMeta' object. """
+        self.status_code = status_code
+        """ Integer status code of the response, eg. 200. """
+        self.url = url
+        """ Final URL of the response. """
+        self.elapsed = elapsed
+        """ Time between sending the request and the arrival of the response headers, as a timedelta. """
+        from requests.structures import CaseInsensitiveDict
+        self.headers = CaseInsensitiveDict(headers or {})
+        """ Case-insensitive dictionary of the headers_kept which were present on the response. """
+        self.reason = reason
+        """ Textual reason of the status code, eg. "OK". """
+
+    @classmethod
+    def from_response(cls, response: requests.Response):
+        """
+        Constructs and returns an instance of (sub)class with the metadata of response.
+        """
+        headers = {name: response.headers[name] for name in cls.headers_kept if name in response.headers}
+        return cls(response.status_code, response.url, response.elapsed, headers, response.reason)
+
+    @property
+    def ok(self) -> bool:
+        """ Whether the status code is below 400, like requests.Response.ok. """
+        return self.status_code is not None and self.status_code < 400
+
+    def __repr__(self):
+        """ Returns the same string as requests.Response, eg. <Response [200]>, so exception messages are unchanged. """
+        return f"<Response [{self.status_code}]>"
+
 class Model:
     """
     Model is a base class to be used as a superclass for conveniently accessing data.
@@ -13,8 +65,8 @@ class Model:
         self._output_keys = ()
         self.json: DotDict = DotDict()
         """ The json data returned by the API, as a :class:`DotDict` instance. """
-        self.response: requests.Response = None
-        """ requests.Response object used to fill this Model. """
+        self.response: Union[requests.Response, ResponseMeta] = None
+        """ requests.Response object used to fill this Model, or its ResponseMeta. """
     
     @classmethod
     def parse(cls, data: dict, response:requests.Response = None):
@@ -27,8 +79,25 @@ class Model:
         instance.response = response
         return instance
 
+    def to_bytes(self) -> bytes:
+        """
+        Returns a compact serialisation of the json data of this model, without the response. 
+        Uses msgpack if it is installed, and json otherwise. See `from_bytes` for the inverse.
+        """
+        return pack(self.json)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """
+        Constructs and returns an instance of (sub)class from bytes returned by `to_bytes`.
+        """
+        return cls.parse(unpack(data))
+
     def __getattr__(self, name: str):
         """ Passes model.data to model.json.data. """
+        # While unpickling, json is not set yet, and would otherwise be looked up through __getattr__ endlessly.
+        if name == "json":
+            raise AttributeError(name)
         return getattr(self.json, name)
 
     def __getitem__(self, name: str):
@@ -45,6 +114,9 @@ class ModelList(list):
     """
     ModelList is a base class to be used as a superclass for conveniently accessing lists of Model objects.
     """
+    _main_key = "items"
+    """ Key under which the list of models is stored by to_bytes, and found by parse. """
+
     @classmethod
     def parse(cls, data: dict, instance_class: Model, main_keys: list, response:requests.Response = None):
         """
@@ -59,6 +131,23 @@ class ModelList(list):
             setattr(instance, key if key not in main_keys else main_keys[0], sequence_to_dot(val))
         return instance
 
+    def to_bytes(self) -> bytes:
+        """
+        Returns a compact serialisation of the json data of the models in this list, and of the list-level attributes
+        like `generated_at`, without the response. Uses msgpack if it is installed, and json otherwise. 
+        See `from_bytes` for the inverse.
+        """
+        data = {key: val for key, val in vars(self).items() if key != "response" and not key.startswith("_")}
+        data[self._main_key] = [model.json for model in self]
+        return pack(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """
+        Constructs and returns an instance of subclass from bytes returned by `to_bytes`.
+        """
+        return cls.parse(unpack(data))
+
 class CollectionModel(Model):
     """
     CollectionModel is a subclass of Model, with different attributes displayed when printed.
@@ -81,6 +170,8 @@ class CollectionsModel(ModelList):
     CollectionsModel is a subclass of ModelList, which focuses on turning CollectionModel objects into a list.
     See :ref:`collections-label` for more information regarding what attributes comes with this object.
     """
+    _main_key = "collections"
+
     @classmethod
     def parse(cls, data: dict, response:requests.Response = None):
         """
@@ -110,6 +201,8 @@ class IconsModel(ModelList):
     IconsModel is a subclass of ModelList, which focuses on turning IconModel objects into a list.
     See :ref:`icons-label` for more information regarding what attributes comes with this object.
     """
+    _main_key = "icons"
+
     @classmethod
     def parse(cls, data: dict, response:requests.Response = None):
         """
@@ -203,4 +296,23 @@ def sequence_to_dot(val: Any) -> Any:
         return DotDict(val)
     if isinstance(val, list):
         return DotList(val)
-    return val
\ No newline at end of file
+    return val
+
+def pack(data: Any) -> bytes:
+    """
+    Returns data serialised with msgpack if it is installed, and as compact json otherwise.
+    """
+    if msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+def unpack(data: bytes) -> Any:
+    """
+    Returns the data serialised by `pack`. Serialised dicts start with b"{" if they are json, 
+    which is never the case for msgpack, so both formats can be read regardless of which one was used.
+    """
+    if data[:1] == b"{":
+        return json.loads(data)
+    if msgpack is None:
+        raise ImportError("Unpacking this data requires msgpack. Install it using `pip install msgpack`.")
+    return msgpack.unpackb(data, raw=False)
@@ -0,0 +1,169 @@
+import math
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+
+from TheNounProjectAPI.models import Model, ModelList
+from TheNounProjectAPI.exceptions import NotFound
+
+class Paginator:
+    """
+    Paginator is a class iterating over all results of a paginated endpoint, eg. get_icons_by_term or get_collections,
+    fetching up to `max_workers` pages concurrently while yielding the results in order::
+
+        paginator = Paginator(api.get_icons_by_term, "goat", limit=50, max_workers=4)
+        for icon in paginator:
+            ...
+
+    The first page is fetched on its own, with the limit, offset and page as given. The following pages are fetched concurrently,
+    always by offset, starting at `offset + page * limit`. This keeps the offset and page parameters consistent,
+    as the page parameter skips over pages of limit results, and the offset parameter skips over single results.
+
+    The end is reached at a page shorter than the limit, at a NotFound error, which the API returns for pages past the end,
+    or once `total` results have been yielded. Without a total, pages up to `max_workers` ahead of the end may be fetched and discarded.
+    Without a limit the page size is unknown, as a short first page may be the only page or a page of the default size,
+    so the pages are fetched one at a time instead, until a page shorter than the first page or an empty page.
+
+    The paginator also acts as a cursor: `offset` is the offset of the first result after the pages yielded so far,
+    so iterating over a partially consumed paginator again continues with the next page,
+    as does Paginator(endpoint, ..., offset=paginator.offset).
+    """
+    def __init__(self, endpoint: Callable[..., ModelList], *args, limit: int = None, offset: int = None, page: int = None,
+                 total: int = None, max_workers: int = 4, **kwargs):
+        """
+        Construct a new paginator over the results of endpoint.
+
+        :param endpoint: Paginated endpoint of an API object, eg. api.get_icons_by_term.
+        :type endpoint: Callable[..., ModelList]
+        :param args: Positional arguments passed on to endpoint, eg. the term.
+        :param limit: Maximum number of results per page. (defaults to None, i.e. the default page size of the API)
+        :type limit: int
+        :param offset: Number of results to skip over. (defaults to None)
+        :type offset: int
+        :param page: Number of pages of limit results to skip over. (defaults to None)
+        :type page: int
+        :param total: Number of results to yield at most, eg. the known number of results. (defaults to None)
+        :type total: int
+        :param max_workers: Maximum number of pages fetched concurrently. (defaults to 4)
+        :type max_workers: int
+        :param kwargs: Keyword arguments passed on to endpoint, eg. public_domain_only=True.
+        """
+        self.endpoint = endpoint
+        self.args = args
+        self.kwargs = kwargs
+        self.limit = limit
+        self.page = page
+        self.total = total
+        self.max_workers = max_workers
+        self.offset = offset or 0
+        """ Offset of the first result after the pages yielded so far. """
+        self.yielded = 0
+        """ Number of results yielded so far. """
+        self.pages_fetched = 0
+        """ Number of pages fetched, including pages fetched past the end. """
+        self.done = False
+        """ Whether the end has been reached. """
+        self._lock = threading.Lock()
+
+    def _fetch(self, **params) -> ModelList:
+        """
+        :returns: The page fetched with params, or an empty list if the API returned NotFound.
+        :rtype: ModelList
+        """
+        try:
+            return self.endpoint(*self.args, limit=self.limit, **params, **self.kwargs)
+        except NotFound:
+            return []
+        finally:
+            with self._lock:
+                self.pages_fetched += 1
+
+    def _last(self, results: ModelList, page_size: int, remaining: Optional[int]) -> bool:
+        """
+        :returns: Whether results is the last page, as it is shorter than page_size, or reaches the total.
+        :rtype: bool
+        """
+        return len(results) < page_size or (remaining is not None and len(results) >= remaining)
+
+    def pages(self) -> Iterator[ModelList]:
+        """
+        Yields the pages in order, each trimmed to total if given. Empty pages are not yielded.
+
+        :raise APIException: Raises exception when a page fails with an error other than NotFound.
+                             The pages before it have been yielded, and offset points to the failed page.
+        """
+        remaining = None if self.total is None else self.total - self.yielded
+        if self.done or remaining == 0:
+            self.done = True
+            return
+
+        # The first page is fetched on its own, as without a limit it is the best guess of the page size.
+        first = self._fetch(offset=self.offset or None, page=self.page)
+        page_size = self.limit or len(first)
+        # Without a limit, a short page of the default size cannot be told apart from the last page, so there is no fan-out.
+        max_workers = self.max_workers if self.limit else 1
+        if self.page:
+            self.offset += self.page * page_size
+            self.page = None
+        if not first:
+            self.done = True
+            return
+        yield from self._advance(first, page_size, remaining)
+        if self.done:
+            return
+        remaining = None if remaining is None else remaining - len(first)
+
+        start = self.offset
+        if remaining is None:
+            page_count = None
+        else:
+            page_count = math.ceil(remaining / page_size)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = deque()
+            next_page = 0
+            try:
+                while True:
+                    # Keep up to max_workers pages in flight, each in a copy of the current context, eg. with an active api.deadline.
+                    while len(futures) < max_workers and (page_count is None or next_page < page_count):
+                        futures.append(executor.submit(contextvars.copy_context().run, self._fetch, offset=start + next_page * page_size))
+                        next_page += 1
+                    if not futures:
+                        self.done = True
+                        return
+                    results = futures.popleft().result()
+                    if not results:
+                        self.done = True
+                        return
+                    yield from self._advance(results, page_size, remaining)
+                    if self.done:
+                        return
+                    remaining = None if remaining is None else remaining - len(results)
+            finally:
+                # Pages which have not started yet are not needed anymore, after the end or an exception.
+                for future in futures:
+                    future.cancel()
+
+    def _advance(self, results: ModelList, page_size: int, remaining: Optional[int]) -> Iterator[ModelList]:
+        """
+        Yields results trimmed to remaining, moves the cursor past them, and marks the end if they are the last page.
+        """
+        last = self._last(results, page_size, remaining)
+        if remaining is not None and len(results) > remaining:
+            results = results[:remaining]
+        self.offset += len(results)
+        self.yielded += len(results)
+        if last:
+            self.done = True
+        yield results
+
+    def __iter__(self) -> Iterator[Model]:
+        """ Yields the results of all pages in order. """
+        for results in self.pages():
+            yield from results
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the endpoint name, the cursor offset and whether the end was reached.
+            eg: <Paginator: get_icons_by_term, Offset: 150, Done: False> """
+        return f"<Paginator: {getattr(self.endpoint, '__name__', self.endpoint)}, Offset: {self.offset}, Done: {self.done}>"
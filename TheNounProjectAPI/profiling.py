@@ -0,0 +1,288 @@
+"""
+Opt-in profiling of the client side of endpoint calls, for finding out why an endpoint is slow without redeploying.
+
+Profiling is enabled with enable(), or by setting the TNP_PROFILE environment variable to N, to profile 1 in N calls::
+
+    TNP_PROFILE=100 TNP_PROFILE_DIR=profiles TNP_PROFILE_FORMAT=speedscope python crawler.py
+
+A sampled call runs under cProfile, and the time spent in its prepare, send, decode and parse stages is measured.
+The profiles are aggregated per endpoint method, and written to one file per endpoint by EndpointProfiler.dump,
+which is called at exit when profiling was enabled through the environment.
+While profiling is disabled, every endpoint call only checks whether `active` is None.
+"""
+
+import os
+import json
+import time
+import atexit
+import warnings
+import itertools
+import threading
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+PSTATS = "pstats"
+SPEEDSCOPE = "speedscope"
+
+# The profiler endpoint calls are sampled by, or None while profiling is disabled.
+active: Optional["EndpointProfiler"] = None
+
+_record: ContextVar[Optional["_StageRecord"]] = ContextVar("profile record", default=None)
+
+class _StageRecord:
+    """
+    Measures the time between the stages of one sampled endpoint call.
+    """
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+        self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+def mark(stage: str) -> None:
+    """
+    Ends the stage of the endpoint call sampled in the current context, if any, eg. mark("send") once the response is received.
+    Only called by Call while profiling is enabled.
+    """
+    record = _record.get()
+    if record is not None:
+        record.mark(stage)
+
+class EndpointProfiler:
+    """
+    EndpointProfiler is a class profiling 1 in `sample_every` endpoint calls with cProfile, aggregating the profiles per endpoint.
+    Only one call is profiled at a time, as cProfile allows only one active profiler,
+    so sampled calls which overlap with a profiled call in another thread are not profiled.
+    """
+    def __init__(self, sample_every: int = 100, directory: str = "tnp_profiles", format: str = PSTATS):
+        """
+        Construct a new profiler.
+
+        :param sample_every: Profile 1 in sample_every endpoint calls. (defaults to 100)
+        :type sample_every: int
+        :param directory: Directory dump writes the profiles to. (defaults to "tnp_profiles")
+        :type directory: str
+        :param format: Format of the files written by dump, either "pstats" or "speedscope". (defaults to "pstats")
+        :type format: str
+        """
+        if format not in (PSTATS, SPEEDSCOPE):
+            raise ValueError(f"format must be {PSTATS!r} or {SPEEDSCOPE!r}, not {format!r}.")
+        self.sample_every = max(int(sample_every), 1)
+        self.directory = directory
+        self.format = format
+        self._counter = itertools.count()
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, "pstats.Stats"] = {}
+        self._stages: Dict[str, Dict[str, List[float]]] = {}
+        self._calls: Dict[str, int] = {}
+
+    def sample(self) -> bool:
+        """
+        :returns: Whether the next endpoint call should be profiled.
+        :rtype: bool
+        """
+        return next(self._counter) % self.sample_every == 0
+
+    def run(self, endpoint: str, function, *args, **kwargs):
+        """
+        Calls function with args and kwargs under cProfile, and adds the profile and stage times to those of endpoint.
+        If another call is being profiled, function is called without profiling.
+
+        :returns: The result of function.
+        """
+        if not self._busy.acquire(blocking=False):
+            return function(*args, **kwargs)
+        try:
+            import cProfile
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler, eg. a debugger or pyinstrument, is active.
+                return function(*args, **kwargs)
+            record = _StageRecord()
+            token = _record.set(record)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profile.disable()
+                _record.reset(token)
+                self._add(endpoint, profile, record)
+        finally:
+            self._busy.release()
+
+    def _add(self, endpoint: str, profile, record: _StageRecord) -> None:
+        """
+        Adds the profile and the stage times of one call to the aggregates of endpoint.
+        """
+        import pstats
+        with self._lock:
+            if endpoint in self._stats:
+                self._stats[endpoint].add(profile)
+            else:
+                self._stats[endpoint] = pstats.Stats(profile)
+            self._calls[endpoint] = self._calls.get(endpoint, 0) + 1
+            stages = self._stages.setdefault(endpoint, {})
+            for stage, seconds in record.stages:
+                stages.setdefault(stage, []).append(seconds)
+
+    @property
+    def endpoints(self) -> List[str]:
+        """
+        :returns: The names of the endpoints with at least one profiled call.
+        :rtype: List[str]
+        """
+        with self._lock:
+            return sorted(self._stats)
+
+    def stats(self, endpoint: str) -> "pstats.Stats":
+        """
+        :raise KeyError: Raises exception when no call of endpoint has been profiled.
+
+        :returns: The aggregated profile of endpoint, eg. for stats("get_icon_by_id").sort_stats("cumulative").print_stats(20).
+        :rtype: pstats.Stats
+        """
+        with self._lock:
+            return self._stats[endpoint]
+
+    def stages(self, endpoint: str) -> Dict[str, float]:
+        """
+        :returns: The mean number of seconds spent in each stage of the profiled calls of endpoint,
+                  eg. {"prepare": 0.0002, "send": 0.31, "decode": 0.004, "parse": 0.002}.
+        :rtype: Dict[str, float]
+        """
+        with self._lock:
+            return {stage: sum(times) / len(times) for stage, times in self._stages.get(endpoint, {}).items()}
+
+    def summary(self) -> str:
+        """
+        :returns: Human readable summary of the mean stage times per endpoint.
+        :rtype: str
+        """
+        lines = []
+        for endpoint in self.endpoints:
+            stages = ", ".join(f"{stage} {seconds * 1000:.2f}ms" for stage, seconds in self.stages(endpoint).items())
+            lines.append(f"{endpoint} ({self._calls[endpoint]} calls): {stages}")
+        return "\n".join(lines)
+
+    def dump(self, directory: str = None) -> List[str]:
+        """
+        Writes the aggregated profile of every endpoint to "<endpoint>.pstats", for use with pstats or snakeviz,
+        or to "<endpoint>.speedscope.json", for https://www.speedscope.app, and the mean stage times to "stages.json".
+
+        :param directory: Directory to write the files to, created if needed. (defaults to None, i.e. the directory of the profiler)
+        :type directory: str
+
+        :returns: The paths of the written files.
+        :rtype: List[str]
+        """
+        directory = directory or self.directory
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for endpoint in self.endpoints:
+            stats = self.stats(endpoint)
+            if self.format == PSTATS:
+                path = os.path.join(directory, f"{endpoint}.pstats")
+                with self._lock:
+                    stats.dump_stats(path)
+            else:
+                path = os.path.join(directory, f"{endpoint}.speedscope.json")
+                with self._lock:
+                    data = _speedscope(endpoint, stats)
+                with open(path, "w") as f:
+                    json.dump(data, f)
+            paths.append(path)
+        path = os.path.join(directory, "stages.json")
+        with open(path, "w") as f:
+            json.dump({endpoint: {"calls": self._calls[endpoint], "stages": self.stages(endpoint)} for endpoint in self.endpoints}, f, indent=2)
+        paths.append(path)
+        return paths
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the sampling rate and the number of profiled calls.
+            eg: <EndpointProfiler: 1 in 100, Profiled: 12> """
+        return f"<EndpointProfiler: 1 in {self.sample_every}, Profiled: {sum(self._calls.values())}>"
+
+def _speedscope(name: str, stats: "pstats.Stats") -> dict:
+    """
+    Converts stats to a sampled speedscope profile. As cProfile only records callers, not full stacks,
+    the stack of each function follows its heaviest caller, and is weighted by the time spent in the function itself.
+
+    :returns: Data in the speedscope file format.
+    :rtype: dict
+    """
+    frames, indices = [], {}
+    def index(function: Tuple[str, int, str]) -> int:
+        if function not in indices:
+            filename, line, function_name = function
+            indices[function] = len(frames)
+            frames.append({"name": function_name, "file": filename, "line": line})
+        return indices[function]
+
+    samples, weights = [], []
+    for function, (_, _, total_time, _, callers) in stats.stats.items():
+        if total_time <= 0:
+            continue
+        stack, seen = [function], {function}
+        while callers:
+            # The caller which spent the most cumulative time calling the function.
+            caller = max(callers, key=lambda caller: callers[caller][3])
+            if caller in seen:
+                break
+            stack.append(caller)
+            seen.add(caller)
+            callers = stats.stats[caller][4] if caller in stats.stats else {}
+        samples.append([index(frame) for frame in reversed(stack)])
+        weights.append(total_time)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "TheNounProjectAPI",
+        "shared": {"frames": frames},
+        "profiles": [{"type": "sampled", "name": name, "unit": "seconds", "startValue": 0, "endValue": sum(weights),
+                      "samples": samples, "weights": weights}],
+    }
+
+def enable(sample_every: int = 100, directory: str = "tnp_profiles", format: str = PSTATS) -> EndpointProfiler:
+    """
+    Starts profiling 1 in sample_every endpoint calls of all API objects.
+
+    :returns: The new active profiler, whose dump method writes the profiles.
+    :rtype: EndpointProfiler
+    """
+    global active
+    active = EndpointProfiler(sample_every, directory, format)
+    return active
+
+def disable() -> Optional[EndpointProfiler]:
+    """
+    Stops profiling endpoint calls.
+
+    :returns: The profiler which was active, or None.
+    :rtype: Optional[EndpointProfiler]
+    """
+    global active
+    profiler, active = active, None
+    return profiler
+
+def _enable_from_environment() -> None:
+    """
+    Enables profiling if the TNP_PROFILE environment variable is set to a positive integer,
+    and dumps the profiles at exit to TNP_PROFILE_DIR in TNP_PROFILE_FORMAT.
+    An invalid TNP_PROFILE_FORMAT only warns, and leaves profiling disabled, as it must not break importing the package.
+    """
+    sample_every = os.environ.get("TNP_PROFILE", "")
+    if not sample_every.isdigit() or int(sample_every) < 1:
+        return
+    try:
+        profiler = enable(int(sample_every), os.environ.get("TNP_PROFILE_DIR", "tnp_profiles"), os.environ.get("TNP_PROFILE_FORMAT", PSTATS))
+    except ValueError as e:
+        warnings.warn(f"Profiling is disabled, as TNP_PROFILE_FORMAT is invalid: {e}", RuntimeWarning)
+        return
+    atexit.register(profiler.dump)
+
+_enable_from_environment()
@@ -0,0 +1,325 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter, deque
+from typing import Dict, Optional, Tuple
+
+from TheNounProjectAPI.models import UsageModel
+
+# The usage periods reported by get_usage, and their length in seconds.
+PERIODS: Tuple[Tuple[str, float], ...] = (("hourly", 3600.0), ("daily", 86400.0), ("monthly", 30 * 86400.0))
+
+class QuotaProjection:
+    """
+    QuotaProjection is a class holding the estimated usage of one period, and when its limit will be hit.
+    """
+    def __init__(self, period: str, used: int, limit: int, rate: float, exhausted_in: Optional[float]):
+        """ Constructs a new 'QuotaProjection' object. """
+        self.period = period
+        """ Name of the period, either "hourly", "daily" or "monthly". """
+        self.used = used
+        """ Usage reported by the last snapshot, plus the requests sent since. """
+        self.limit = limit
+        """ Limit of the period reported by the last snapshot. """
+        self.rate = rate
+        """ Number of requests per second used for the projection. """
+        self.exhausted_in = exhausted_in
+        """ Number of seconds until the limit is hit at the current rate,
+            or None if it is not hit within the length of the period. """
+
+    @property
+    def remaining(self) -> int:
+        """
+        :returns: The number of requests left within the limit.
+        :rtype: int
+        """
+        return max(self.limit - self.used, 0)
+
+    @property
+    def exhausted_at(self) -> Optional[float]:
+        """
+        :returns: The time.time() timestamp at which the limit is hit at the current rate, or None if it is not hit.
+        :rtype: Optional[float]
+        """
+        return None if self.exhausted_in is None else time.time() + self.exhausted_in
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the period, the usage and limit, and the projection.
+            eg: <QuotaProjection: Hourly: 120/5000, Exhausted In: 1840s> """
+        exhausted_in = "never" if self.exhausted_in is None else f"{self.exhausted_in:.0f}s"
+        return f"<QuotaProjection: {self.period.title()}: {self.used}/{self.limit}, Exhausted In: {exhausted_in}>"
+
+class QuotaTracker:
+    """
+    QuotaTracker is a class estimating the quota usage of an API key, and projecting when its limits will be hit.
+
+    The usage reported by get_usage is only a snapshot, so the tracker combines the last snapshot with a local count
+    of the requests sent since, per endpoint. The request rate is the higher of the local rate over the last `window` seconds,
+    and the rate reported by the last two snapshots, which also includes requests sent by other clients using the same key::
+
+        tracker = QuotaTracker()
+        api = API(key, secret, quota_tracker=tracker)
+        tracker.start(api, interval=300)
+        ...
+        print(tracker.summary())
+        tracker.projections()["hourly"].exhausted_in
+
+    The tracker may be shared by multiple API objects using the same key.
+    """
+    def __init__(self, window: float = 300.0):
+        """
+        Construct a new quota tracker.
+
+        :param window: Number of seconds over which the local request rate is measured. (defaults to 300.0)
+        :type window: float
+        """
+        self.window = window
+        self.last_error: Optional[Exception] = None
+        """ Exception raised by the last failed refresh in the background thread, eg. APIException or a connection error, or None. """
+        self._counts = Counter()
+        self._errors = Counter()
+        self._since_snapshot = 0
+        self._times = deque()
+        self._started = time.monotonic()
+        # The last two snapshots, as (time.monotonic(), usage, limits) tuples.
+        self._snapshots = deque(maxlen=2)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def record(self, endpoint: Optional[str], status_code: int = None) -> None:
+        """
+        Counts a request sent to the API. Called by Core for every request which received a response.
+
+        :param endpoint: Name of the endpoint method, or None if unknown.
+        :type endpoint: Optional[str]
+        :param status_code: Status code of the response, used to count errors per endpoint. (defaults to None)
+        :type status_code: int
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._counts[endpoint] += 1
+            if status_code is not None and status_code >= 400:
+                self._errors[endpoint] += 1
+            self._since_snapshot += 1
+            self._times.append(now)
+            self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        """
+        Forgets the times of requests older than window. Must be called with the lock held.
+        """
+        while self._times and self._times[0] < now - self.window:
+            self._times.popleft()
+
+    @property
+    def counts(self) -> Dict[Optional[str], int]:
+        """
+        :returns: The number of requests sent per endpoint since the tracker was created, eg. {"get_icon_by_id": 12}.
+        :rtype: Dict[Optional[str], int]
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    @property
+    def errors(self) -> Dict[Optional[str], int]:
+        """
+        :returns: The number of requests per endpoint which received a status code of 400 or higher.
+        :rtype: Dict[Optional[str], int]
+        """
+        with self._lock:
+            return dict(self._errors)
+
+    def add_snapshot(self, usage: UsageModel) -> None:
+        """
+        Stores the usage and limits reported by get_usage, and restarts counting the requests sent since.
+
+        :param usage: The result of get_usage.
+        :type usage: UsageModel
+        """
+        data = usage.json
+        with self._lock:
+            self._snapshots.append((time.monotonic(), dict(data.get("usage") or {}), dict(data.get("limits") or {})))
+            self._since_snapshot = 0
+
+    def refresh(self, api) -> UsageModel:
+        """
+        Fetches the usage with api.get_usage, and stores it as a snapshot.
+
+        :param api: API object using the key whose usage is tracked.
+        :type api: API
+
+        :raise APIException: Raises exception when get_usage fails.
+
+        :returns: The result of get_usage.
+        :rtype: UsageModel
+        """
+        usage = api.get_usage()
+        self.add_snapshot(usage)
+        return usage
+
+    def start(self, api, interval: float = 300.0) -> None:
+        """
+        Starts a daemon thread calling refresh(api) every interval seconds, starting immediately.
+        Failed refreshes are stored in last_error, and retried at the next interval.
+
+        :param api: API object using the key whose usage is tracked.
+        :type api: API
+        :param interval: Number of seconds between snapshots. (defaults to 300.0)
+        :type interval: float
+        """
+        self.stop()
+        self._stop.clear()
+
+        def run():
+            while True:
+                try:
+                    self.refresh(api)
+                    self.last_error = None
+                except Exception as e:
+                    # Any failure, eg. a connection error, is kept for inspection instead of ending the thread.
+                    self.last_error = e
+                if self._stop.wait(interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="quota tracker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the thread started by start, if any.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def rate(self) -> float:
+        """
+        :returns: The number of requests per second sent by this process over the last window seconds.
+                  Right after the tracker was created, the requests are spread over at least a second,
+                  so a few requests in the first milliseconds are not projected as thousands per second.
+        :rtype: float
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            return len(self._times) / min(self.window, max(now - self._started, 1.0))
+
+    def projections(self) -> Dict[str, QuotaProjection]:
+        """
+        :returns: Mapping of the periods with a limit in the last snapshot, eg. "monthly", to their projection.
+                  Empty if there is no snapshot yet.
+        :rtype: Dict[str, QuotaProjection]
+        """
+        local_rate = self.rate()
+        with self._lock:
+            if not self._snapshots:
+                return {}
+            snapshots = list(self._snapshots)
+            since_snapshot = self._since_snapshot
+        _, usage, limits = snapshots[-1]
+
+        projections = {}
+        for period, length in PERIODS:
+            limit = limits.get(period)
+            if limit is None:
+                continue
+            used = (usage.get(period) or 0) + since_snapshot
+            rate = local_rate
+            if len(snapshots) == 2:
+                (first_time, first_usage, _), (last_time, last_usage, _) = snapshots
+                # Usage decreases when the period was reset between the snapshots, which says nothing about the rate.
+                increase = (last_usage.get(period) or 0) - (first_usage.get(period) or 0)
+                if increase >= 0 and last_time > first_time:
+                    rate = max(rate, increase / (last_time - first_time))
+            if used >= limit:
+                exhausted_in = 0.0
+            elif rate > 0 and (limit - used) / rate <= length:
+                exhausted_in = (limit - used) / rate
+            else:
+                exhausted_in = None
+            projections[period] = QuotaProjection(period, used, limit, rate, exhausted_in)
+        return projections
+
+    def summary(self) -> str:
+        """
+        :returns: Human readable summary of the projections, and of the requests sent per endpoint.
+        :rtype: str
+        """
+        lines = []
+        projections = self.projections()
+        if not projections:
+            lines.append("No usage snapshot with limits yet.")
+        for projection in projections.values():
+            if projection.exhausted_in is None:
+                outlook = "not reached at the current rate"
+            elif projection.exhausted_in == 0:
+                outlook = "reached"
+            else:
+                outlook = f"reached in {_duration(projection.exhausted_in)}, at {time.strftime('%Y-%m-%d %H:%M', time.localtime(projection.exhausted_at))}"
+            lines.append(f"{projection.period.title():<8} {projection.used:>8}/{projection.limit:<8} "
+                         f"{projection.rate * 3600:.0f} requests/hour, limit {outlook}")
+        counts, errors = self.counts, self.errors
+        if counts:
+            lines.append("Requests per endpoint:")
+            for endpoint, count in sorted(counts.items(), key=lambda item: -item[1]):
+                lines.append(f"  {endpoint or 'unknown':<32} {count:>8}" + (f" ({errors[endpoint]} errors)" if errors.get(endpoint) else ""))
+        return "\n".join(lines)
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the number of requests counted, and of snapshots taken.
+            eg: <QuotaTracker: Requests: 120, Snapshots: 2> """
+        with self._lock:
+            return f"<QuotaTracker: Requests: {sum(self._counts.values())}, Snapshots: {len(self._snapshots)}>"
+
+def _duration(seconds: float) -> str:
+    """
+    :returns: seconds formatted as eg. "2d 3h", "3h 20m" or "20m".
+    :rtype: str
+    """
+    minutes = int(seconds // 60)
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+def main(argv = None) -> int:
+    """
+    Command line entry point for printing the quota usage of a key::
+
+        python -m TheNounProjectAPI.quota --sample 60
+
+    With --sample, two snapshots are taken that many seconds apart, to project when the limits are hit at the rate of all
+    clients using the key. The API key and secret are read from --key and --secret, or from the TNP_KEY and TNP_SECRET environment variables.
+
+    :returns: Exit code, 1 if a limit has been reached and 0 otherwise.
+    :rtype: int
+    """
+    import argparse
+    from TheNounProjectAPI.api import API
+
+    parser = argparse.ArgumentParser(prog="python -m TheNounProjectAPI.quota", description="Summarise the quota usage of a TheNounProjectAPI key.")
+    parser.add_argument("--key", default=os.environ.get("TNP_KEY"), help="API key, defaults to the TNP_KEY environment variable.")
+    parser.add_argument("--secret", default=os.environ.get("TNP_SECRET"), help="API secret, defaults to the TNP_SECRET environment variable.")
+    parser.add_argument("--sample", type=float, default=0.0, help="Number of seconds between two snapshots, for measuring the request rate.")
+    args = parser.parse_args(argv)
+
+    api = API(args.key, args.secret)
+    tracker = QuotaTracker()
+    try:
+        tracker.refresh(api)
+        if args.sample > 0:
+            time.sleep(args.sample)
+            tracker.refresh(api)
+    finally:
+        api._close_session()
+    print(tracker.summary())
+    return 1 if any(projection.exhausted_in == 0 for projection in tracker.projections().values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
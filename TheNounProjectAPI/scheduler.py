@@ -0,0 +1,167 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, Optional
+
+from TheNounProjectAPI.exceptions import RequestDropped
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+_current_lane: ContextVar[Optional[str]] = ContextVar("lane", default=None)
+
+class Lane:
+    """
+    Lane is a class holding the limits and the current state of one priority lane of a Scheduler.
+    """
+    def __init__(self, name: str, priority: int, max_concurrency: int, max_wait: float = None):
+        """
+        Constructs a new 'Lane' object.
+
+        :param name: Name of the lane, eg. "interactive".
+        :type name: str
+        :param priority: Priority of the lane. Lanes with a lower priority value are served first.
+        :type priority: int
+        :param max_concurrency: Maximum number of requests of this lane in flight at once.
+        :type max_concurrency: int
+        :param max_wait: Maximum number of seconds a request may wait for a slot before it is dropped,
+                         or None to wait indefinitely. (defaults to None)
+        :type max_wait: float
+        """
+        self.name = name
+        self.priority = priority
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self.in_flight = 0
+        """ Number of requests of this lane currently in flight. """
+        self.dropped = 0
+        """ Number of requests of this lane dropped after waiting longer than max_wait. """
+        self._waiting = deque()
+
+    @property
+    def waiting(self) -> int:
+        """
+        :returns: Number of requests of this lane waiting for a slot.
+        :rtype: int
+        """
+        return len(self._waiting)
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the name, and the number of requests in flight and waiting.
+            eg: <Lane: Name: batch, In Flight: 2, Waiting: 10> """
+        return f"<Lane: Name: {self.name}, In Flight: {self.in_flight}, Waiting: {self.waiting}>"
+
+class Scheduler:
+    """
+    Scheduler is a class limiting the number of requests in flight, shared by one or more API objects.
+    Requests wait in priority lanes: a waiting request of a lane is only sent if no lane with a higher 
+    priority has a request waiting which could be sent. By default there are two lanes:
+
+    * "interactive", which may use all `max_concurrency` slots, and never drops requests.
+    * "batch", which may use at most half of the slots, and drops requests after waiting 60 seconds.
+
+    So a batch workload can never take all slots, and never delays an interactive request which could be sent.
+    The lane of a request is the lane of the API object, unless it is overridden using ``with Scheduler.lane(name):``.
+    """
+    def __init__(self, max_concurrency: int = 8, lanes: Iterable[Lane] = None):
+        """
+        Construct a new scheduler.
+
+        :param max_concurrency: Maximum number of requests in flight at once, over all lanes. (defaults to 8)
+        :type max_concurrency: int
+        :param lanes: Lanes to schedule requests in. (defaults to None, i.e. the "interactive" and "batch" lanes)
+        :type lanes: Iterable[Lane]
+        """
+        if lanes is None:
+            lanes = (Lane(INTERACTIVE, 0, max_concurrency),
+                     Lane(BATCH, 1, max(max_concurrency // 2, 1), max_wait=60.0))
+        self.max_concurrency = max_concurrency
+        self.lanes = {lane.name: lane for lane in lanes}
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @staticmethod
+    @contextmanager
+    def lane(name: str) -> Iterator[None]:
+        """
+        Context manager which schedules all requests made within it in the lane called name,
+        regardless of the default lane of the API object. Only applies to the current thread or task.
+
+        :param name: Name of the lane, eg. "batch".
+        :type name: str
+        """
+        token = _current_lane.set(name)
+        try:
+            yield
+        finally:
+            _current_lane.reset(token)
+
+    def _can_run(self, lane: Lane, token: object) -> bool:
+        """
+        :returns: Whether the request identified by token, waiting in lane, may be sent now.
+        :rtype: bool
+        """
+        if self._in_flight >= self.max_concurrency or lane.in_flight >= lane.max_concurrency:
+            return False
+        if lane._waiting[0] is not token:
+            return False
+        return not any(other._waiting and other.priority < lane.priority and other.in_flight < other.max_concurrency
+                       for other in self.lanes.values())
+
+    def acquire(self, lane_name: str = INTERACTIVE, timeout: float = None) -> Lane:
+        """
+        Waits until a request in lane lane_name may be sent, and takes a slot.
+
+        :param lane_name: Name of the lane, overridden by ``Scheduler.lane``. (defaults to "interactive")
+        :type lane_name: str
+        :param timeout: Maximum number of seconds to wait, in addition to the max_wait of the lane. (defaults to None)
+        :type timeout: float
+
+        :raise KeyError: Raises exception when there is no lane called lane_name.
+        :raise RequestDropped: Raises exception when no slot became available in time.
+
+        :returns: The Lane the slot was taken in, to be passed to release.
+        :rtype: Lane
+        """
+        lane = self.lanes[_current_lane.get() or lane_name]
+        waits = [wait for wait in (lane.max_wait, timeout) if wait is not None]
+        start = time.monotonic()
+        deadline = start + min(waits) if waits else None
+        token = object()
+        with self._condition:
+            lane._waiting.append(token)
+            try:
+                while not self._can_run(lane, token):
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        lane.dropped += 1
+                        raise RequestDropped(lane.name, time.monotonic() - start)
+                    self._condition.wait(remaining)
+            finally:
+                lane._waiting.remove(token)
+                self._condition.notify_all()
+            lane.in_flight += 1
+            self._in_flight += 1
+        return lane
+
+    def release(self, lane: Lane) -> None:
+        """
+        Frees the slot taken in lane by acquire.
+        """
+        with self._condition:
+            lane.in_flight -= 1
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, lane_name: str = INTERACTIVE, timeout: float = None) -> Iterator[Lane]:
+        """
+        Context manager which holds a slot in lane lane_name while it is active. See acquire.
+        """
+        lane = self.acquire(lane_name, timeout)
+        try:
+            yield lane
+        finally:
+            self.release(lane)
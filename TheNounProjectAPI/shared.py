@@ -0,0 +1,230 @@
+import os
+import mmap
+import struct
+import tempfile
+import threading
+from typing import Union, Iterable, Tuple
+
+from TheNounProjectAPI.models import IconModel, CollectionModel, pack, unpack
+
+class SharedModelStore:
+    """
+    SharedModelStore is a read-mostly store of icons and collections in a memory-mapped file,
+    for sharing their serialised data between the worker processes of a prefork server.
+    The file is written by a single process, while every worker maps it read-only,
+    so all workers share the same pages of the operating system's page cache::
+
+        # In the writer process:
+        SharedModelStore.build(api, "models.shm", icon_ids=hot_ids, collection_slugs=hot_slugs)
+
+        # In each worker process:
+        store = SharedModelStore("models.shm")
+        icon = store.get_icon(24014)
+
+    The data file holds a header, the records serialised like Model.to_bytes, and an index of the offset and length
+    of each record by icon id, collection id and collection slug. The bytes of the file are shared through the page cache,
+    but the models are not: each worker decodes the whole index into its own memory when it maps a file,
+    and decodes a record into new objects every time it is requested.
+
+    Mapped files are never replaced, as that fails on Windows while they are mapped. Each write creates a new
+    versioned data file next to path, eg. "models.shm.3", and then points the small file at path to it.
+    Workers keep reading the data file they mapped, and switch to the newest version with refresh().
+    """
+
+    _magic = b"TNPSHM1\x00"
+    # Magic, offset of the index and length of the index.
+    _header = struct.Struct("<8sQQ")
+    # Start of the pointer file at path, which is followed by the name of the current data file.
+    _pointer_magic = b"TNPSHMP\n"
+
+    def __init__(self, path: str):
+        """
+        Construct a new object for reading the models in the file at path.
+
+        :param path: Path of the pointer file written by SharedModelStore.write or SharedModelStore.build.
+        :type path: str
+
+        :raise ValueError: Raises exception when the file is not a SharedModelStore file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._current = None
+        self._index = {}
+        self._map(self._data_path())
+
+    def _data_path(self) -> str:
+        """
+        :raise ValueError: Raises exception when the file at path is not a SharedModelStore pointer file.
+
+        :returns: Path of the data file the pointer file at path points to.
+        :rtype: str
+        """
+        with open(self.path, "rb") as f:
+            pointer = f.read()
+        name = pointer[len(self._pointer_magic):].decode("utf-8", "replace").strip()
+        if not pointer.startswith(self._pointer_magic) or not _is_version(name, os.path.basename(self.path)):
+            raise ValueError(f"{self.path!r} is not a SharedModelStore file.")
+        return os.path.join(os.path.dirname(self.path), name)
+
+    def _map(self, data_path: str) -> None:
+        """
+        Maps the data file at data_path, and loads its index.
+        """
+        with open(data_path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = self._header.unpack_from(mapping, 0)
+        if magic != self._magic:
+            mapping.close()
+            raise ValueError(f"{data_path!r} is not a SharedModelStore file.")
+        index = unpack(mapping[index_offset:index_offset + index_length])
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap, self._current, self._index = mapping, data_path, index
+
+    def refresh(self) -> bool:
+        """
+        Maps the newest data file if a writer has written one since the current one was mapped.
+
+        :returns: Whether a new file was mapped.
+        :rtype: bool
+        """
+        data_path = self._data_path()
+        with self._lock:
+            if data_path == self._current:
+                return False
+            self._map(data_path)
+            return True
+
+    def __len__(self) -> int:
+        """ Returns the number of icons and collections in the store. """
+        return len(self._index["icon"]) + len({tuple(location) for location in self._index["collection"].values()})
+
+    def __contains__(self, key: Tuple[str, Union[int, str]]) -> bool:
+        """ Allows ("icon", 24014) in store and ("collection", "cue") in store. """
+        kind, identifier = key
+        return str(identifier) in self._index.get(kind, {})
+
+    def _read(self, kind: str, identifier: Union[int, str]) -> Union[dict, list]:
+        """
+        :raise KeyError: Raises exception when there is no record for the identifier.
+
+        :returns: The json data of the record of kind stored under identifier.
+        :rtype: Union[dict, list]
+        """
+        with self._lock:
+            offset, length = self._index[kind][str(identifier)]
+            return unpack(self._mmap[offset:offset + length])
+
+    def get_icon(self, _id: Union[int, str]) -> IconModel:
+        """
+        :raise KeyError: Raises exception when the icon is not in the store.
+
+        :returns: The stored icon with the given id.
+        :rtype: IconModel
+        """
+        return IconModel.parse(self._read("icon", _id))
+
+    def get_collection(self, _id: Union[int, str]) -> CollectionModel:
+        """
+        :param _id: Collection ID or slug.
+        :type _id: Union[int, str]
+
+        :raise KeyError: Raises exception when the collection is not in the store.
+
+        :returns: The stored collection with the given id or slug.
+        :rtype: CollectionModel
+        """
+        return CollectionModel.parse(self._read("collection", _id))
+
+    def close(self) -> None:
+        """
+        Unmaps the file.
+        """
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    @classmethod
+    def write(cls, path: str, icons: Iterable[IconModel] = (), collections: Iterable[CollectionModel] = ()) -> None:
+        """
+        Writes a new data file with icons and collections, and atomically points the file at path to it.
+        Readers which have mapped an older data file keep reading it until they call refresh().
+        Data files older than the previous one are removed, unless they are still mapped on Windows.
+
+        :param path: Path of the pointer file to write.
+        :type path: str
+        :param icons: Icons to store, indexed by id. (defaults to ())
+        :type icons: Iterable[IconModel]
+        :param collections: Collections to store, indexed by both id and slug. (defaults to ())
+        :type collections: Iterable[CollectionModel]
+        """
+        index = {"icon": {}, "collection": {}}
+        directory = os.path.dirname(os.path.abspath(path))
+        base = os.path.basename(path)
+        versions = sorted(int(name[len(base) + 1:]) for name in os.listdir(directory) if _is_version(name, base))
+        name = f"{base}.{versions[-1] + 1 if versions else 1}"
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as f:
+            f.write(cls._header.pack(cls._magic, 0, 0))
+            for kind, models in (("icon", icons), ("collection", collections)):
+                for model in models:
+                    data = model.to_bytes()
+                    location = (f.tell(), len(data))
+                    f.write(data)
+                    index[kind][str(model.id)] = location
+                    if kind == "collection" and model.json.get("slug"):
+                        index[kind][model.slug] = location
+            index_data = pack(index)
+            index_offset = f.tell()
+            f.write(index_data)
+            f.seek(0)
+            f.write(cls._header.pack(cls._magic, index_offset, len(index_data)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f.name, os.path.join(directory, name))
+
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as f:
+            f.write(cls._pointer_magic + name.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f.name, path)
+
+        # The previous version is kept, for readers which read the pointer just before it changed.
+        for version in versions[:-1]:
+            try:
+                os.remove(os.path.join(directory, f"{base}.{version}"))
+            except OSError:
+                pass
+
+    @classmethod
+    def build(cls, api, path: str, icon_ids: Iterable[Union[int, str]] = (), collection_slugs: Iterable[Union[int, str]] = ()) -> "SharedModelStore":
+        """
+        Fetches icons and collections through the endpoints of api, which may be answered from its cache,
+        and writes them to a new file at path.
+
+        :param api: API object used to fetch the icons and collections.
+        :type api: API
+        :param path: Path of the file to write.
+        :type path: str
+        :param icon_ids: Ids of icons to fetch with get_icon_by_id. (defaults to ())
+        :type icon_ids: Iterable[Union[int, str]]
+        :param collection_slugs: Slugs (or ids) of collections to fetch with get_collection. (defaults to ())
+        :type collection_slugs: Iterable[Union[int, str]]
+
+        :raise APIException: Raises exception when a request fails.
+
+        :returns: Store reading the new file.
+        :rtype: SharedModelStore
+        """
+        icons = [api.get_icon_by_id(_id) for _id in icon_ids]
+        collections = [api.get_collection(slug) for slug in collection_slugs]
+        cls.write(path, icons, collections)
+        return cls(path)
+
+def _is_version(name: str, base: str) -> bool:
+    """
+    :returns: Whether name is the name of a data file of the pointer file named base, eg. "models.shm.3" for "models.shm".
+    :rtype: bool
+    """
+    return name.startswith(base + ".") and name[len(base) + 1:].isdigit()
@@ -0,0 +1,195 @@
+import sqlite3
+import threading
+from typing import Iterable, Iterator, Union, List, Type
+
+from TheNounProjectAPI.models import Model, ModelList, IconsModel, CollectionsModel
+
+class SpillingModelList(ModelList):
+    """
+    SpillingModelList is a ModelList holding at most `max_in_memory` models in memory.
+    Models appended past that budget are serialised with Model.to_bytes into a temporary SQLite database on disk,
+    and are parsed again when they are accessed by iteration or indexing::
+
+        icons = SpillingIconsModel(max_in_memory=10000)
+        for offset in range(0, 1000000, 50):
+            icons.extend(api.get_icons_by_term("arrow", limit=50, offset=offset))
+        len(icons), icons[-1]
+
+    Spilled models are new objects every time they are accessed, so changes to them are not kept.
+    Only appending and extending are supported, not inserting, removing or reordering.
+    """
+
+    def __init__(self, models: Iterable[Model] = (), max_in_memory: int = 10000):
+        """
+        Construct a new list, holding at most max_in_memory models in memory.
+
+        :param models: Models to add to the list. (defaults to ())
+        :type models: Iterable[Model]
+        :param max_in_memory: Maximum number of models held in memory. (defaults to 10000)
+        :type max_in_memory: int
+        """
+        super().__init__()
+        self._max_in_memory = max_in_memory
+        self._spilled = 0
+        self._instance_class: Type[Model] = None
+        self._db = None
+        self._lock = threading.Lock()
+        self.extend(models)
+
+    @classmethod
+    def parse(cls, data: dict, instance_class: Model, main_keys: list, response = None):
+        """
+        Constructs and returns a spilling list of instances of instance_class, with the same attributes as ModelList.parse,
+        except for the attribute holding the raw data of all models, eg. `icons`, which would defeat the memory budget.
+        """
+        instance = super().parse(data, instance_class, main_keys, response)
+        vars(instance).pop(main_keys[0], None)
+        return instance
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        :returns: The connection to the temporary database, created on the first spill.
+                  SQLite removes the database file when the connection is closed.
+        :rtype: sqlite3.Connection
+        """
+        if self._db is None:
+            self._db = sqlite3.connect("", check_same_thread=False)
+            self._db.execute("CREATE TABLE models (position INTEGER PRIMARY KEY, data BLOB NOT NULL)")
+        return self._db
+
+    @property
+    def spilled(self) -> int:
+        """
+        Getter for spilled property.
+
+        :returns: The number of models stored on disk instead of in memory.
+        :rtype: int
+        """
+        return self._spilled
+
+    def append(self, model: Model) -> None:
+        """ Appends model in memory, or on disk once max_in_memory models are held in memory. """
+        self.extend((model,))
+
+    def extend(self, models: Iterable[Model]) -> None:
+        """ Appends models in memory, and the models past max_in_memory on disk. """
+        models = iter(models)
+        room = self._max_in_memory - super().__len__()
+        if room > 0 and not self._spilled:
+            for model in models:
+                super().append(model)
+                room -= 1
+                if room == 0:
+                    break
+        with self._lock:
+            rows = []
+            for model in models:
+                if self._instance_class is None:
+                    self._instance_class = type(model)
+                rows.append((self._spilled + len(rows), model.to_bytes()))
+            if rows:
+                self._connect().executemany("INSERT INTO models VALUES (?, ?)", rows)
+                self._spilled += len(rows)
+
+    def __iadd__(self, models: Iterable[Model]):
+        self.extend(models)
+        return self
+
+    def __len__(self) -> int:
+        """ Returns the number of models, in memory and on disk. """
+        return super().__len__() + self._spilled
+
+    def _load(self, position: int) -> Model:
+        """
+        :returns: The spilled model at position, counted from the first spilled model.
+        :rtype: Model
+        """
+        with self._lock:
+            (data,), = self._db.execute("SELECT data FROM models WHERE position = ?", (position,)).fetchall()
+        return self._instance_class.from_bytes(data)
+
+    def _iter_spilled(self, start: int = 0, stop: int = None) -> Iterator[Model]:
+        """
+        Yields the spilled models from position start up to stop, reading them from disk in chunks.
+        """
+        stop = self._spilled if stop is None else stop
+        chunk = max(1, min(self._max_in_memory, 1000))
+        while start < stop:
+            with self._lock:
+                rows = self._db.execute("SELECT data FROM models WHERE position >= ? AND position < ? ORDER BY position",
+                                        (start, min(start + chunk, stop))).fetchall()
+            for (data,) in rows:
+                yield self._instance_class.from_bytes(data)
+            start += chunk
+
+    def __iter__(self) -> Iterator[Model]:
+        """ Yields the models in memory, followed by the models on disk. """
+        yield from super().__iter__()
+        if self._spilled:
+            yield from self._iter_spilled()
+
+    def __reversed__(self) -> Iterator[Model]:
+        for index in range(len(self) - 1, -1, -1):
+            yield self[index]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Model, List[Model]]:
+        """ Returns the model at index, or a list of the models in the slice. """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("list index out of range")
+        in_memory = super().__len__()
+        if index < in_memory:
+            return super().__getitem__(index)
+        return self._load(index - in_memory)
+
+    def __contains__(self, model: Model) -> bool:
+        return any(model == item for item in self)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, list) and len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """ Returns string with class name, followed by the number of models in memory and on disk.
+            eg: <SpillingIconsModel: 10000 in memory, 25000 spilled> """
+        return f"<{self.__class__.__name__}: {super().__len__()} in memory, {self._spilled} spilled>"
+
+    def _unsupported(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} only supports appending and extending.")
+
+    insert = pop = remove = sort = reverse = index = count = copy = _unsupported
+    __setitem__ = __delitem__ = __add__ = __mul__ = __rmul__ = __imul__ = _unsupported
+
+    def clear(self) -> None:
+        """ Removes all models, from memory and from disk. """
+        super().clear()
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM models")
+            self._spilled = 0
+
+    def close(self) -> None:
+        """ Removes all models, and the temporary database. """
+        self.clear()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+class SpillingIconsModel(IconsModel, SpillingModelList):
+    """
+    SpillingIconsModel is an IconsModel holding at most `max_in_memory` IconModel objects in memory.
+    """
+
+class SpillingCollectionsModel(CollectionsModel, SpillingModelList):
+    """
+    SpillingCollectionsModel is a CollectionsModel holding at most `max_in_memory` CollectionModel objects in memory.
+    """
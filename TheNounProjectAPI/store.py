@@ -0,0 +1,393 @@
+import os
+import io
+import json
+import mmap
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Union, Tuple, BinaryIO, Iterator, Optional
+
+class AssetStore:
+    """
+    AssetStore is a content-addressed store for downloaded icon assets.
+    Assets are keyed by icon id and rendition, and stored as blobs named by the sha256 of their content::
+
+        directory/index.json
+        directory/index.log
+        directory/blobs/ab/abcdef0123...
+
+    Identical content is stored only once, regardless of how many keys refer to it.
+    If `max_bytes` is set, the least recently used assets are removed whenever the store grows beyond it.
+
+    Every change is appended to index.log, so storing an asset does not rewrite the whole index.
+    The log is compacted into index.json by flush and close, and whenever it grows longer than the index.
+    Access times of reads are kept in memory, and only persisted by the next compaction.
+    """
+
+    _index_name = "index.json"
+    _log_name = "index.log"
+
+    def __init__(self, directory: str, max_bytes: int = None):
+        """
+        Construct a new object for storing icon assets in directory.
+
+        :param directory: Directory holding the blobs and the index file. Created if it does not exist.
+        :type directory: str
+        :param max_bytes: Maximum total size of the blobs in bytes, or None for no maximum. (defaults to None)
+        :type max_bytes: int
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        os.makedirs(os.path.join(self.directory, "blobs"), exist_ok=True)
+        # Mapping of keys to their entries, from least to most recently used.
+        self._index = OrderedDict()
+        # Number of keys referring to each blob, and the total size of the referenced blobs.
+        self._references = {}
+        self._size = 0
+        # Blobs which could not be removed yet, eg. as they are memory mapped on Windows.
+        self._deferred = set()
+        self._log = None
+        self._log_lines = 0
+        for key, entry in sorted(self._load_index().items(), key=lambda item: item[1]["accessed"]):
+            self._add(key, entry)
+
+    def _load_index(self) -> dict:
+        """
+        :returns: Mapping of "icon_id:rendition" keys to dicts with the sha256, size and last access time of the asset,
+                  read from index.json, with the changes in index.log replayed on top.
+        :rtype: dict
+        """
+        try:
+            with open(os.path.join(self.directory, self._index_name), "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        try:
+            with open(os.path.join(self.directory, self._log_name), "r") as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash is the last line of the log.
+                        break
+                    self._log_lines += 1
+                    key = change.pop("key")
+                    if change:
+                        index[key] = change
+                    else:
+                        index.pop(key, None)
+        except OSError:
+            pass
+        return index
+
+    def _append(self, *changes: Tuple[str, Optional[dict]]) -> None:
+        """
+        Appends (key, entry) changes to the log, where an entry of None removes the key. Must be called with the lock held.
+        """
+        if self._log is None:
+            self._log = open(os.path.join(self.directory, self._log_name), "a")
+        self._log.write("".join(json.dumps(dict(entry or {}, key=key)) + "\n" for key, entry in changes))
+        self._log.flush()
+        self._log_lines += len(changes)
+        if self._log_lines > max(len(self._index), 1000):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Atomically writes the index to disk, including the access times of reads since the last write, and empties the log.
+        """
+        with self._lock:
+            path = os.path.join(self.directory, self._index_name)
+            with open(path + ".tmp", "w") as f:
+                json.dump(self._index, f)
+            os.replace(path + ".tmp", path)
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            with open(os.path.join(self.directory, self._log_name), "w"):
+                pass
+            self._log_lines = 0
+            self._remove_deferred()
+
+    def close(self) -> None:
+        """
+        Flushes the index, and closes the log.
+        """
+        self.flush()
+
+    @staticmethod
+    def _key(icon_id: Union[int, str], rendition: str) -> str:
+        """
+        :returns: The index key of the rendition of an icon, eg. "24014:preview_url".
+        :rtype: str
+        """
+        return f"{icon_id}:{rendition}"
+
+    def _blob_path(self, sha256: str) -> str:
+        """
+        :returns: Path of the blob with the given sha256 hex digest.
+        :rtype: str
+        """
+        return os.path.join(self.directory, "blobs", sha256[:2], sha256)
+
+    def __contains__(self, key: Tuple[Union[int, str], str]) -> bool:
+        """ Allows (icon_id, rendition) in store. """
+        return self._key(*key) in self._index
+
+    def __len__(self) -> int:
+        """ Returns the number of (icon_id, rendition) keys in the store. """
+        return len(self._index)
+
+    @property
+    def size(self) -> int:
+        """
+        :returns: Total size in bytes of all blobs in the store. Blobs shared by multiple keys are counted once.
+        :rtype: int
+        """
+        return self._size
+
+    def sha256(self, icon_id: Union[int, str], rendition: str) -> str:
+        """
+        :raise KeyError: Raises exception when this rendition of the icon is not in the store.
+
+        :returns: The sha256 hex digest of the stored rendition of the icon.
+        :rtype: str
+        """
+        return self._index[self._key(icon_id, rendition)]["sha256"]
+
+    def path(self, icon_id: Union[int, str], rendition: str) -> str:
+        """
+        :raise KeyError: Raises exception when this rendition of the icon is not in the store.
+
+        :returns: Path of the blob holding the rendition of the icon.
+        :rtype: str
+        """
+        return self._blob_path(self.sha256(icon_id, rendition))
+
+    @contextmanager
+    def temporary_file(self) -> Iterator[BinaryIO]:
+        """
+        Context manager yielding a named temporary file within the store, which can be streamed to and then passed to put_file::
+
+            with store.temporary_file() as f:
+                f.write(data)
+            store.put_file(icon_id, rendition, f.name)
+
+        The file is closed when the body ends, and removed if the body raises an exception.
+        """
+        f = tempfile.NamedTemporaryFile(dir=self.directory, suffix=".part", delete=False)
+        try:
+            with f:
+                yield f
+        except BaseException:
+            _remove(f.name)
+            raise
+
+    def put(self, icon_id: Union[int, str], rendition: str, data: Union[bytes, BinaryIO]) -> str:
+        """
+        Stores data as the rendition of the icon.
+
+        :param icon_id: Icon id.
+        :type icon_id: Union[int, str]
+        :param rendition: Rendition name, eg. "preview_url".
+        :type rendition: str
+        :param data: Content of the asset, either as bytes or as a binary file object.
+        :type data: Union[bytes, BinaryIO]
+
+        :returns: The sha256 hex digest of the content.
+        :rtype: str
+        """
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = io.BytesIO(data)
+        with self.temporary_file() as f:
+            for chunk in iter(lambda: data.read(64 * 1024), b""):
+                f.write(chunk)
+        return self.put_file(icon_id, rendition, f.name)
+
+    def put_file(self, icon_id: Union[int, str], rendition: str, path: str) -> str:
+        """
+        Moves the file at path into the store as the rendition of the icon. The file is removed if it can not be stored.
+
+        :param icon_id: Icon id.
+        :type icon_id: Union[int, str]
+        :param rendition: Rendition name, eg. "preview_url".
+        :type rendition: str
+        :param path: Path of the file to move into the store. Must be on the same file system as the store.
+        :type path: str
+
+        :returns: The sha256 hex digest of the content.
+        :rtype: str
+        """
+        try:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(64 * 1024), b""):
+                    digest.update(chunk)
+            sha256 = digest.hexdigest()
+            size = os.path.getsize(path)
+
+            key = self._key(icon_id, rendition)
+            with self._lock:
+                blob_path = self._blob_path(sha256)
+                if os.path.exists(blob_path):
+                    os.remove(path)
+                else:
+                    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                    os.replace(path, blob_path)
+                self._deferred.discard(sha256)
+                entry = {"sha256": sha256, "size": size, "accessed": time.time()}
+                previous = self._index.get(key)
+                self._add(key, entry)
+                if previous is not None and previous["sha256"] != sha256:
+                    # The key held other content before, whose blob may not be referenced anymore.
+                    self._remove_unreferenced(previous["sha256"])
+                changes = [(key, entry)]
+                if self.max_bytes is not None:
+                    # The new key is kept, even if it is the least recently used, so it can be read back by the caller.
+                    changes.extend((removed, None) for removed in self._collect(self.max_bytes, keep=key))
+                self._append(*changes)
+        except BaseException:
+            _remove(path)
+            raise
+        return sha256
+
+    def open(self, icon_id: Union[int, str], rendition: str) -> memoryview:
+        """
+        Returns a read-only view of the stored rendition of the icon, backed by a memory map of the blob.
+        The content is not copied into memory, and the map is closed once the view is released.
+
+        :param icon_id: Icon id.
+        :type icon_id: Union[int, str]
+        :param rendition: Rendition name, eg. "preview_url".
+        :type rendition: str
+
+        :raise KeyError: Raises exception when this rendition of the icon is not in the store.
+
+        :returns: Read-only memoryview of the content.
+        :rtype: memoryview
+        """
+        key = self._key(icon_id, rendition)
+        with self._lock:
+            entry = self._index[key]
+            entry["accessed"] = time.time()
+            self._index.move_to_end(key)
+        if entry["size"] == 0:
+            # Empty files cannot be memory mapped.
+            return memoryview(b"")
+        with open(self._blob_path(entry["sha256"]), "rb") as f:
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def delete(self, icon_id: Union[int, str], rendition: str) -> None:
+        """
+        Removes the rendition of the icon from the store. The blob is only removed if no other key refers to it.
+
+        :raise KeyError: Raises exception when this rendition of the icon is not in the store.
+        """
+        key = self._key(icon_id, rendition)
+        with self._lock:
+            entry = self._discard(key)
+            self._remove_unreferenced(entry["sha256"])
+            self._append((key, None))
+
+    def _add(self, key: str, entry: dict) -> None:
+        """
+        Sets the entry of key as the most recently used, and counts the reference to its blob. Must be called with the lock held.
+        """
+        if key in self._index:
+            self._discard(key)
+        self._index[key] = entry
+        if self._references.get(entry["sha256"], 0) == 0:
+            self._size += entry["size"]
+        self._references[entry["sha256"]] = self._references.get(entry["sha256"], 0) + 1
+
+    def _discard(self, key: str) -> dict:
+        """
+        Removes key from the index, without removing its blob. Must be called with the lock held.
+
+        :raise KeyError: Raises exception when key is not in the index.
+
+        :returns: The entry of key.
+        :rtype: dict
+        """
+        entry = self._index.pop(key)
+        self._references[entry["sha256"]] -= 1
+        if self._references[entry["sha256"]] == 0:
+            del self._references[entry["sha256"]]
+            self._size -= entry["size"]
+        return entry
+
+    def _remove_unreferenced(self, sha256: str) -> bool:
+        """
+        Removes the blob with the given sha256 hex digest, if no key in the index refers to it anymore.
+        Blobs which can not be removed yet, eg. as they are still memory mapped on Windows, are removed by a later flush.
+
+        :returns: Whether the blob is no longer referenced.
+        :rtype: bool
+        """
+        if sha256 in self._references:
+            return False
+        try:
+            os.remove(self._blob_path(sha256))
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            self._deferred.add(sha256)
+        return True
+
+    def _remove_deferred(self) -> None:
+        """
+        Retries removing the blobs whose removal was deferred. Must be called with the lock held.
+        """
+        for sha256 in list(self._deferred):
+            self._deferred.discard(sha256)
+            self._remove_unreferenced(sha256)
+
+    def _collect(self, max_bytes: int, keep: str = None) -> list:
+        """
+        Removes the least recently used keys other than keep until the total size of the blobs is at most max_bytes,
+        or until only keep is left. Must be called with the lock held, and the removals must be logged by the caller.
+
+        :returns: The removed keys.
+        :rtype: list
+        """
+        removed = []
+        while self._size > max_bytes:
+            key = next((key for key in self._index if key != keep), None)
+            if key is None:
+                break
+            self._remove_unreferenced(self._discard(key)["sha256"])
+            removed.append(key)
+        return removed
+
+    def gc(self, max_bytes: int = None) -> int:
+        """
+        Removes the least recently used assets until the store is at most max_bytes large.
+
+        :param max_bytes: Maximum total size of the blobs in bytes. Uses the max_bytes of the store if None. (defaults to None)
+        :type max_bytes: int
+
+        :returns: The number of bytes freed.
+        :rtype: int
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        if max_bytes is None:
+            return 0
+        with self._lock:
+            size = self._size
+            self._collect(max_bytes)
+            self.flush()
+            return size - self._size
+
+def _remove(path: str) -> None:
+    """
+    Removes the file at path, if it exists.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,138 @@
+import os
+import json
+import tempfile
+from typing import List
+
+from TheNounProjectAPI.models import IconModel, IconsModel
+from TheNounProjectAPI.exceptions import NotFound
+
+class RecentSync:
+    """
+    RecentSync is a class for incrementally fetching recently uploaded icons.
+    It stores the highest icon id seen so far (the high-water mark) in a small JSON file,
+    and only pages through /icons/recent_uploads until it reaches that mark::
+
+        sync = RecentSync(api, "recent.json")
+        for icon in sync.poll():
+            mirror(icon)
+
+    If `max_pages` stops a poll before it reaches the mark, the mark is kept, and the offset to continue from is stored
+    alongside it, so the next poll resumes paging where this one stopped. Once the mark is reached, it moves to the
+    highest id seen since the catch-up started, and icons uploaded during the catch-up are fetched by the poll after.
+    """
+
+    def __init__(self, api, path: str, limit: int = 50, max_pages: int = None):
+        """
+        Construct a new object for incrementally fetching recent icons.
+
+        :param api: API object used to fetch the recent icons.
+        :type api: API
+        :param path: Path of the JSON file holding the high-water mark. Created on the first commit.
+        :type path: str
+        :param limit: Number of icons per page. (defaults to 50)
+        :type limit: int
+        :param max_pages: Maximum number of pages fetched per poll, or None for no maximum. (defaults to None)
+        :type max_pages: int
+        """
+        self.api = api
+        self.path = path
+        self.limit = limit
+        self.max_pages = max_pages
+        self._state = self._load()
+        self._pending = None
+
+    def _load(self) -> dict:
+        """
+        :returns: The persisted state, with the highest icon "id" and its "date_uploaded", or an empty dict.
+                  While catching up, "resume" holds the "id" and "date_uploaded" of the mark to move to,
+                  the "offset" to continue from, and the lowest id returned so far as "before".
+        :rtype: dict
+        """
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @property
+    def mark(self) -> int:
+        """
+        :returns: The highest icon id up to which all icons were returned by committed polls,
+                  or None if no poll has been committed yet.
+        :rtype: int
+        """
+        return self._state.get("id")
+
+    def poll(self, commit: bool = True) -> List[IconModel]:
+        """
+        Fetches the icons uploaded after the high-water mark, newest first.
+        If no mark has been stored yet, only the first page is fetched, and its icons become the starting point.
+
+        :param commit: Whether to persist the new mark immediately.
+                       If False, call commit() once the returned icons have been processed. (defaults to True)
+        :type commit: bool
+
+        :returns: List of the IconModel objects uploaded after the mark.
+        :rtype: List[IconModel]
+        """
+        mark = self.mark
+        resume = self._state.get("resume")
+        offset = resume["offset"] if resume else 0
+        # Icons with an id of at least before were returned by an earlier poll of this catch-up,
+        # and may be paged over again as newer uploads shift the offsets.
+        before = resume["before"] if resume else None
+        new = IconsModel()
+        page = 0
+        ended = False
+        while self.max_pages is None or page < self.max_pages:
+            try:
+                icons = self.api.get_recent_icons(limit=self.limit, offset=offset)
+            except NotFound:
+                ended = True
+                break
+            page += 1
+            offset += len(icons)
+
+            reached = False
+            for icon in icons:
+                if mark is not None and int(icon.id) <= mark:
+                    reached = True
+                    break
+                if before is None or int(icon.id) < before:
+                    new.append(icon)
+            if reached or mark is None or len(icons) < self.limit:
+                ended = True
+                break
+
+        if resume:
+            top = {"id": resume["id"], "date_uploaded": resume["date_uploaded"]}
+        elif new:
+            newest = max(new, key=lambda icon: int(icon.id))
+            top = {"id": int(newest.id), "date_uploaded": newest.json.get("date_uploaded")}
+        else:
+            top = None
+
+        if top is not None:
+            if ended:
+                self._pending = top
+            else:
+                lowest = min([int(icon.id) for icon in new] + ([before] if before is not None else []))
+                self._pending = {"id": mark, "date_uploaded": self._state.get("date_uploaded"),
+                                 "resume": dict(top, offset=offset, before=lowest)}
+            if commit:
+                self.commit()
+        return new
+
+    def commit(self) -> None:
+        """
+        Atomically persists the mark found by the last poll, so the next poll starts from there.
+        """
+        if self._pending is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False) as f:
+            json.dump(self._pending, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f.name, self.path)
+        self._state, self._pending = self._pending, None
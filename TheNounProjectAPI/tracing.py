@@ -0,0 +1,189 @@
+import sys
+import json
+import time
+import threading
+from collections import deque
+from contextvars import ContextVar
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import Dict, List, Optional, TextIO, Union
+
+_current_trace: ContextVar[Optional["TraceRecord"]] = ContextVar("trace", default=None)
+
+def current_trace() -> Optional["TraceRecord"]:
+    """
+    :returns: The record of the endpoint call being traced in the current context, or None.
+    :rtype: Optional[TraceRecord]
+    """
+    return _current_trace.get()
+
+def canonical_url(url: str) -> str:
+    """
+    :returns: url without OAuth parameters, eg. oauth_signature, so it can be logged and compared between requests.
+              OAuth1 signs requests in the Authorization header, which is never traced, but it may also sign the query.
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    if "oauth_" not in parts.query:
+        return url
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if not key.startswith("oauth_")])
+    return urlunsplit(parts._replace(query=query))
+
+class TraceRecord:
+    """
+    TraceRecord is a class holding the trace of one endpoint call: what was requested, how the cache answered it,
+    and how long each stage took. It holds no credentials.
+    """
+    __slots__ = ("endpoint", "method", "url", "started", "cache", "sent", "status_code", "size", "error", "timings", "_start", "_last")
+
+    def __init__(self, endpoint: str):
+        """ Constructs a new 'TraceRecord' object, starting the clock of its first stage. """
+        self.endpoint = endpoint
+        """ Name of the endpoint method, eg. "get_icon_by_id". """
+        self.method: Optional[str] = None
+        """ HTTP method, eg. "GET", once the request is prepared. """
+        self.url: Optional[str] = None
+        """ URL of the request without OAuth parameters, once the request is prepared. """
+        self.started = time.time()
+        """ time.time() timestamp at which the call started. """
+        self.cache: Optional[str] = None
+        """ How the cache answered the call: "miss", "fresh", "stale" (served while revalidating in the background),
+            "revalidate" (the background request), "expired" (fetched again), "expired_served" (served as the API failed),
+            or None without a cache. """
+        self.sent = False
+        """ Whether a request was sent to the API. """
+        self.status_code: Optional[int] = None
+        """ Status code of the response, or None if no response was received. """
+        self.size: Optional[int] = None
+        """ Number of bytes of the response body. """
+        self.error: Optional[str] = None
+        """ Class name of the exception raised by the call, eg. "NotFound", or None. """
+        self.timings: Dict[str, float] = {}
+        """ Seconds spent per stage: "prepare", "cache", "wait" (for the Scheduler, AdaptiveLimiter and CircuitBreaker),
+            "network", "parse", and "total". """
+        # Durations are measured with perf_counter, as time.time() may jump, eg. when the clock is synchronised.
+        self._start = self._last = time.perf_counter()
+
+    def request(self, prepared_request: "requests.PreparedRequest") -> None:
+        """
+        Records the method and canonical URL of prepared_request, and ends the "prepare" stage.
+        """
+        self.method = prepared_request.method
+        self.url = canonical_url(prepared_request.url)
+        self.mark("prepare")
+
+    def response(self, response: "requests.Response") -> None:
+        """
+        Records the status code and body size of response.
+        """
+        self.sent = True
+        self.status_code = response.status_code
+        content = getattr(response, "_content", None)
+        self.size = len(content) if isinstance(content, (bytes, bytearray)) else None
+
+    def mark(self, stage: str) -> None:
+        """
+        Ends stage, adding the time since the previous stage ended to it.
+        """
+        now = time.perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def to_dict(self) -> dict:
+        """
+        :returns: The record as a dictionary, which can be serialised as json.
+        :rtype: dict
+        """
+        return {name: getattr(self, name) for name in self.__slots__ if not name.startswith("_")}
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the endpoint, the status code and the total time.
+            eg: <TraceRecord: get_icon_by_id, Status: 200, Total: 312.4ms> """
+        return f"<TraceRecord: {self.endpoint}, Status: {self.status_code}, Total: {self.timings.get('total', 0.0) * 1000:.1f}ms>"
+
+class Tracer:
+    """
+    Tracer is a class keeping a structured TraceRecord of each of the last `capacity` endpoint calls in a ring buffer,
+    for debugging latency spikes after the fact::
+
+        tracer = Tracer(capacity=1000)
+        api = API(key, secret, tracer=tracer)
+        ...
+        tracer.dump("traces.jsonl")
+        slowest = max(tracer.records(), key=lambda record: record.timings["total"])
+
+    Recording costs a few dictionary updates per call, and older records are dropped as new ones are added.
+    The tracer may be shared by multiple API objects.
+    """
+    def __init__(self, capacity: int = 1000):
+        """
+        Construct a new tracer.
+
+        :param capacity: Number of records kept. (defaults to 1000)
+        :type capacity: int
+        """
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def run(self, endpoint: str, function, *args, **kwargs):
+        """
+        Calls function with args and kwargs while tracing it as a call of endpoint, 
+        and adds the record to the ring buffer once it returns or raises.
+
+        :returns: The result of function.
+        """
+        record = TraceRecord(endpoint)
+        token = _current_trace.set(record)
+        try:
+            return function(*args, **kwargs)
+        except BaseException as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            _current_trace.reset(token)
+            record.timings["total"] = time.perf_counter() - record._start
+            with self._lock:
+                self._records.append(record)
+
+    def records(self) -> List[TraceRecord]:
+        """
+        :returns: The kept records, oldest first.
+        :rtype: List[TraceRecord]
+        """
+        with self._lock:
+            return list(self._records)
+
+    def dump(self, file: Union[str, TextIO] = None) -> int:
+        """
+        Writes the kept records as json lines, oldest first.
+
+        :param file: Path or file object to write to. (defaults to None, i.e. sys.stderr)
+        :type file: Union[str, TextIO]
+
+        :returns: Number of records written.
+        :rtype: int
+        """
+        records = self.records()
+        if isinstance(file, str):
+            with open(file, "w") as f:
+                return self.dump(f)
+        file = sys.stderr if file is None else file
+        for record in records:
+            file.write(json.dumps(record.to_dict()) + "\n")
+        return len(records)
+
+    def clear(self) -> None:
+        """
+        Removes all kept records.
+        """
+        with self._lock:
+            self._records.clear()
+
+    def __len__(self) -> int:
+        """ Returns the number of kept records. """
+        return len(self._records)
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the number of kept records and the capacity.
+            eg: <Tracer: 120/1000 Records> """
+        return f"<Tracer: {len(self)}/{self.capacity} Records>"
@@ -0,0 +1,129 @@
+import requests
+from requests.structures import CaseInsensitiveDict
+from typing import Union, Tuple
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+Timeout = Union[float, Tuple[float, float], None]
+
+class Transport:
+    """
+    Transport is a base class for sending the requests.PreparedRequest objects created by the API,
+    and returning requests.Response objects. Requests are always prepared and signed by the requests.Session of the API,
+    so the testing mode and OAuth1 signing work the same for every transport.
+    """
+    def send(self, prepared_request: requests.PreparedRequest, timeout: Timeout) -> requests.Response:
+        """
+        :param prepared_request: The PreparedRequest with the method, URL, headers and body for the request.
+        :type prepared_request: requests.PreparedRequest
+        :param timeout: Float timeout in seconds, 2-tuples for seperate connect and read timeouts, and None for no timeout.
+        :type timeout: Union[float, Tuple[float, float], None]
+
+        :raise requests.exceptions.Timeout: Raises exception when the request timed out.
+        :raise requests.exceptions.ConnectionError: Raises exception when no connection could be made.
+
+        :returns: The response.
+        :rtype: requests.Response
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Closes all connections of this transport.
+        """
+        raise NotImplementedError
+
+class RequestsTransport(Transport):
+    """
+    RequestsTransport is the default Transport, sending requests with a requests.Session using HTTP/1.1 connection pooling.
+    """
+    def __init__(self, session: requests.Session):
+        """
+        Construct a new transport sending requests with session.
+
+        :param session: The session to send requests with.
+        :type session: requests.Session
+        """
+        self.session = session
+
+    def send(self, prepared_request: requests.PreparedRequest, timeout: Timeout) -> requests.Response:
+        return self.session.send(prepared_request, timeout=timeout)
+
+    def close(self) -> None:
+        self.session.close()
+
+class HTTPXTransport(Transport):
+    """
+    HTTPXTransport is a Transport sending requests with an httpx.Client, which multiplexes concurrent requests
+    over a single HTTP/2 connection per host. Requires the optional httpx dependency with HTTP/2 support::
+
+        pip install httpx[http2]
+
+    HTTP/2 is negotiated during the TLS handshake, so the API object should use an https base_url.
+    Over plain http the client falls back to HTTP/1.1.
+    """
+
+    # Headers which are set by requests, but which httpx sets itself, or which are not allowed in HTTP/2.
+    _dropped_headers = ("Accept-Encoding", "Connection", "Content-Length", "Transfer-Encoding")
+
+    def __init__(self, http2: bool = True, max_connections: int = 10, client: "httpx.Client" = None):
+        """
+        Construct a new transport sending requests with an httpx.Client.
+
+        :param http2: Whether to enable HTTP/2. (defaults to True)
+        :type http2: bool
+        :param max_connections: Maximum number of connections held open. (defaults to 10)
+        :type max_connections: int
+        :param client: The httpx.Client to send requests with. Overrides http2 and max_connections if given. (defaults to None)
+        :type client: httpx.Client
+
+        :raise ImportError: Raises exception when httpx is not installed.
+        """
+        if httpx is None:
+            raise ImportError("HTTPXTransport requires httpx. Install it using `pip install httpx[http2]`.")
+        if client is None:
+            client = httpx.Client(http2=http2, limits=httpx.Limits(max_connections=max_connections))
+        self.client = client
+
+    @staticmethod
+    def _timeout(timeout: Timeout) -> "httpx.Timeout":
+        """
+        :returns: httpx.Timeout equivalent to the requests style timeout.
+        :rtype: httpx.Timeout
+        """
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def send(self, prepared_request: requests.PreparedRequest, timeout: Timeout) -> requests.Response:
+        headers = {key: value for key, value in prepared_request.headers.items() if key not in self._dropped_headers}
+        request = self.client.build_request(prepared_request.method, prepared_request.url, headers=headers,
+                                            content=prepared_request.body, timeout=self._timeout(timeout))
+        try:
+            httpx_response = self.client.send(request)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e), request=prepared_request) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e), request=prepared_request) from e
+
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.reason = httpx_response.reason_phrase
+        response.headers = CaseInsensitiveDict(httpx_response.headers)
+        response.url = str(httpx_response.url)
+        response.encoding = httpx_response.encoding
+        try:
+            response.elapsed = httpx_response.elapsed
+        except RuntimeError:
+            # httpx only knows the elapsed time of responses it received over the network.
+            pass
+        response.request = prepared_request
+        response._content = httpx_response.content
+        return response
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,152 @@
+"""
+Batch versions of the parameter checks of Core, for validating many ids, slugs or terms in one pass before sending requests.
+Each check_* function returns the (index, exception) pairs of the invalid values,
+with the same ParameterException the corresponding endpoint would raise, and each *_mask function returns which values are valid.
+NumPy arrays are supported without requiring NumPy: integer arrays are checked with a single vectorised comparison.
+"""
+
+import sys
+from typing import Any, Iterable, List, Tuple, Union
+
+from TheNounProjectAPI.exceptions import ParameterException, IncorrectType, NonPositive, IllegalSlug, IllegalTerm
+
+Mask = Union[List[bool], "numpy.ndarray"]
+
+def _numpy_kind(values: Any) -> str:
+    """
+    :returns: The dtype kind of values if it is a NumPy array, eg. "i" for integers, and "" otherwise.
+    :rtype: str
+    """
+    # If values is a NumPy array, NumPy has already been imported by whoever created it.
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values.dtype.kind
+    return ""
+
+def to_list(values: Iterable[Any]) -> List[Any]:
+    """
+    :returns: values as a list, converting NumPy arrays to lists of Python ints and strs, which the endpoints accept.
+    :rtype: List[Any]
+    """
+    if _numpy_kind(values):
+        return values.tolist()
+    return list(values)
+
+def check_ids(ids: Iterable[Any], param_name: str = "id") -> List[Tuple[int, ParameterException]]:
+    """
+    Checks that all ids are positive integers, like the id checks of get_icon_by_id and get_collection_by_id.
+
+    :param ids: Sequence or NumPy array of ids.
+    :type ids: Iterable[Any]
+    :param param_name: Name of the parameter, for use in the error messages. (defaults to "id")
+    :type param_name: str
+
+    :returns: List of (index, exception) pairs for the invalid ids, with IncorrectType or NonPositive exceptions.
+    :rtype: List[Tuple[int, ParameterException]]
+    """
+    if _numpy_kind(ids) in ("i", "u"):
+        numpy = sys.modules["numpy"]
+        return [(int(index), NonPositive(param_name)) for index in numpy.flatnonzero(ids <= 0)]
+    ids = to_list(ids)
+    # Usually all ids are valid, which is checked with a single pass over their types, and min.
+    if not ids or (set(map(type, ids)) == {int} and min(ids) > 0):
+        return []
+    return [(index, NonPositive(param_name) if isinstance(_id, int) else IncorrectType(param_name, int))
+            for index, _id in enumerate(ids) if not (isinstance(_id, int) and _id > 0)]
+
+def check_slugs(slugs: Iterable[Any], param_name: str = "slug") -> List[Tuple[int, ParameterException]]:
+    """
+    Checks that all slugs are nonempty ascii strings without spaces, like the slug checks of get_collection_by_slug.
+
+    :param slugs: Sequence or NumPy array of slugs.
+    :type slugs: Iterable[Any]
+    :param param_name: Name of the parameter, for use in the error messages. (defaults to "slug")
+    :type param_name: str
+
+    :returns: List of (index, exception) pairs for the invalid slugs, with IncorrectType or IllegalSlug exceptions.
+    :rtype: List[Tuple[int, ParameterException]]
+    """
+    slugs = to_list(slugs)
+    # Usually all slugs are valid, which is checked on all of them joined together at once.
+    # The separator may itself occur in slugs, so joining can not hide or introduce spaces or non-ascii characters.
+    if all(isinstance(slug, str) for slug in slugs) and "" not in slugs:
+        joined = "\n".join(slugs)
+        if joined.isascii() and " " not in joined:
+            return []
+    return [(index, IllegalSlug(param_name) if isinstance(slug, str) else IncorrectType(param_name, str))
+            for index, slug in enumerate(slugs) if not (isinstance(slug, str) and slug and slug.isascii() and " " not in slug)]
+
+def check_terms(terms: Iterable[Any], param_name: str = "term") -> List[Tuple[int, ParameterException]]:
+    """
+    Checks that all terms are nonempty strings, like the term checks of get_icons_by_term.
+
+    :param terms: Sequence or NumPy array of terms.
+    :type terms: Iterable[Any]
+    :param param_name: Name of the parameter, for use in the error messages. (defaults to "term")
+    :type param_name: str
+
+    :returns: List of (index, exception) pairs for the invalid terms, with IncorrectType or IllegalTerm exceptions.
+    :rtype: List[Tuple[int, ParameterException]]
+    """
+    terms = to_list(terms)
+    return [(index, IllegalTerm(param_name) if isinstance(term, str) else IncorrectType(param_name, str))
+            for index, term in enumerate(terms) if not (isinstance(term, str) and term)]
+
+def check_identifiers(identifiers: Iterable[Any]) -> List[Tuple[int, ParameterException]]:
+    """
+    Checks identifiers which may be either ids or slugs, like the checks of get_collection and get_collection_icons.
+
+    :param identifiers: Sequence of integer ids and string slugs.
+    :type identifiers: Iterable[Any]
+
+    :returns: List of (index, exception) pairs for the invalid identifiers, with IncorrectType, NonPositive or IllegalSlug exceptions.
+    :rtype: List[Tuple[int, ParameterException]]
+    """
+    identifiers = to_list(identifiers)
+    ids = [index for index, identifier in enumerate(identifiers) if isinstance(identifier, int)]
+    slugs = [index for index, identifier in enumerate(identifiers) if isinstance(identifier, str)]
+    failures = [(index, IncorrectType("identifier", (int, str))) for index, identifier in enumerate(identifiers) if not isinstance(identifier, (int, str))]
+    failures += [(ids[index], exception) for index, exception in check_ids([identifiers[i] for i in ids], "id")]
+    failures += [(slugs[index], exception) for index, exception in check_slugs([identifiers[i] for i in slugs], "slug")]
+    return sorted(failures, key=lambda failure: failure[0])
+
+def _mask(values: Iterable[Any], failures: List[Tuple[int, ParameterException]], length: int) -> Mask:
+    """
+    :returns: Mask which is False at the indices of failures, as a NumPy array if values is one.
+    :rtype: Mask
+    """
+    if _numpy_kind(values):
+        mask = sys.modules["numpy"].ones(length, dtype=bool)
+        mask[[index for index, _ in failures]] = False
+        return mask
+    mask = [True] * length
+    for index, _ in failures:
+        mask[index] = False
+    return mask
+
+def id_mask(ids: Iterable[Any]) -> Mask:
+    """
+    :returns: Mask which is True for the ids which are positive integers. A NumPy array if ids is one, and a list otherwise.
+    :rtype: Union[List[bool], numpy.ndarray]
+    """
+    if _numpy_kind(ids) in ("i", "u"):
+        return ids > 0
+    ids = ids if _numpy_kind(ids) else list(ids)
+    return _mask(ids, check_ids(ids, "id"), len(ids))
+
+def slug_mask(slugs: Iterable[Any]) -> Mask:
+    """
+    :returns: Mask which is True for the slugs which are nonempty ascii strings without spaces.
+              A NumPy array if slugs is one, and a list otherwise.
+    :rtype: Union[List[bool], numpy.ndarray]
+    """
+    slugs = slugs if _numpy_kind(slugs) else list(slugs)
+    return _mask(slugs, check_slugs(slugs, "slug"), len(slugs))
+
+def term_mask(terms: Iterable[Any]) -> Mask:
+    """
+    :returns: Mask which is True for the terms which are nonempty strings. A NumPy array if terms is one, and a list otherwise.
+    :rtype: Union[List[bool], numpy.ndarray]
+    """
+    terms = terms if _numpy_kind(terms) else list(terms)
+    return _mask(terms, check_terms(terms, "term"), len(terms))
@@ -0,0 +1,176 @@
+import os
+import sys
+import time
+import argparse
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Callable, List, Tuple, Any
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.cache import DiskCache
+from TheNounProjectAPI.exceptions import APIException, ParameterException, ClientException
+from TheNounProjectAPI.validation import check_ids, check_identifiers, check_terms, to_list
+
+class WarmupReport:
+    """
+    WarmupReport is a class holding the outcome of a warm_cache call.
+    """
+    def __init__(self):
+        """ Constructs a new, empty 'WarmupReport' object. """
+        self.total = 0
+        """ Number of icons, collections and terms to warm the cache with. """
+        self.done = 0
+        """ Number of icons, collections and terms which have been fetched, successfully or not. """
+        self.failed = {}
+        """ Mapping of ("icon" | "collection" | "term", identifier) tuples to the exception raised while fetching them,
+            eg. NotFound, or requests.exceptions.ConnectionError when the API could not be reached. """
+        self.requests_sent = 0
+        """ Number of requests sent to the API. Fresh cache entries do not require a request. """
+        self.quota_used = None
+        """ Monthly usage reported by the API after warming up minus the usage before, if measure_usage was set. """
+        self.elapsed = 0.0
+        """ Number of seconds warming up took. """
+
+    def __repr__(self):
+        """ Returns string with class name, followed by the number of fetched and failed items, and the requests sent.
+            eg: <WarmupReport: Done: 20/20, Failed: 1, Requests Sent: 19> """
+        return f"<WarmupReport: Done: {self.done}/{self.total}, Failed: {len(self.failed)}, Requests Sent: {self.requests_sent}>"
+
+class _Pacer:
+    """
+    Spaces out calls to wait() so that at most `rate` calls per second pass, across all threads.
+    """
+    def __init__(self, rate: float = None):
+        self._interval = 1 / rate if rate else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+def warm_cache(api: API, icon_ids: Iterable[int] = (), collection_slugs: Iterable[str] = (), terms: Iterable[str] = (),
+               term_limit: int = None, max_workers: int = 4, rate: float = None,
+               progress: Callable[[WarmupReport], Any] = None, measure_usage: bool = False) -> WarmupReport:
+    """
+    Fills the cache of api by fetching icons, collections and icons by term concurrently, through the normal endpoints.
+
+    :param api: API object with a cache, eg. API(key, secret, cache=DiskCache("cache")).
+    :type api: API
+    :param icon_ids: Ids of icons to fetch with get_icon_by_id, eg. a list or a NumPy array. (defaults to ())
+    :type icon_ids: Iterable[int]
+    :param collection_slugs: Slugs (or ids) of collections to fetch with get_collection. (defaults to ())
+    :type collection_slugs: Iterable[str]
+    :param terms: Terms to fetch with get_icons_by_term. (defaults to ())
+    :type terms: Iterable[str]
+    :param term_limit: The limit parameter used with get_icons_by_term. (defaults to None)
+    :type term_limit: int
+    :param max_workers: Maximum number of concurrent requests. (defaults to 4)
+    :type max_workers: int
+    :param rate: Maximum number of requests per second, or None for no maximum. (defaults to None)
+    :type rate: float
+    :param progress: Function called with the WarmupReport after every fetched item. (defaults to None)
+    :type progress: Callable[[WarmupReport], Any]
+    :param measure_usage: Whether to call get_usage before and after warming up, to report the quota used. (defaults to False)
+    :type measure_usage: bool
+
+    :returns: WarmupReport with the number of fetched items, failures and the quota used.
+    :rtype: WarmupReport
+    """
+    report = WarmupReport()
+    # Invalid ids, slugs and terms are checked in one pass per kind, and are reported as failed without submitting a job.
+    jobs: List[Tuple[str, Any, Callable[[], Any]]] = []
+    for kind, identifiers, check, fetch in (("icon", icon_ids, check_ids, api.get_icon_by_id),
+                                            ("collection", collection_slugs, check_identifiers, api.get_collection),
+                                            ("term", terms, check_terms, lambda term: api.get_icons_by_term(term, limit=term_limit))):
+        identifiers = to_list(identifiers)
+        invalid = dict(check(identifiers))
+        for index, identifier in enumerate(identifiers):
+            if index in invalid:
+                report.failed[(kind, identifier)] = invalid[index]
+            else:
+                jobs.append((kind, identifier, lambda fetch=fetch, identifier=identifier: fetch(identifier)))
+    report.total = len(jobs) + len(report.failed)
+    report.done = len(report.failed)
+    start = time.monotonic()
+    requests_before = api.requests_sent
+    if measure_usage:
+        usage_before = api.get_usage().usage.monthly
+
+    import requests
+    pacer = _Pacer(rate)
+    def run(fetch: Callable[[], Any]) -> None:
+        pacer.wait()
+        fetch()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Each job runs in a copy of the current context, so an active api.deadline also applies to it.
+        futures = {executor.submit(contextvars.copy_context().run, run, fetch): (kind, identifier) for kind, identifier, fetch in jobs}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except (APIException, ParameterException, ClientException, requests.exceptions.RequestException) as e:
+                report.failed[futures[future]] = e
+            report.done += 1
+            report.requests_sent = api.requests_sent - requests_before
+            if progress is not None:
+                progress(report)
+
+    if measure_usage:
+        report.quota_used = api.get_usage().usage.monthly - usage_before
+    report.requests_sent = api.requests_sent - requests_before
+    report.elapsed = time.monotonic() - start
+    return report
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point for warming an on-disk cache::
+
+        python -m TheNounProjectAPI.warmup --cache-dir cache --ids 12 24014 --slugs cue --terms goat
+
+    The API key and secret are read from --key and --secret, or from the TNP_KEY and TNP_SECRET environment variables.
+    Arguments may also be read from a file, eg. "@ids.txt", with one argument per line.
+
+    :returns: Exit code, 1 if any item failed and 0 otherwise.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(prog="python -m TheNounProjectAPI.warmup", description="Warm a TheNounProjectAPI on-disk cache.", fromfile_prefix_chars="@")
+    parser.add_argument("--key", default=os.environ.get("TNP_KEY"), help="API key, defaults to the TNP_KEY environment variable.")
+    parser.add_argument("--secret", default=os.environ.get("TNP_SECRET"), help="API secret, defaults to the TNP_SECRET environment variable.")
+    parser.add_argument("--cache-dir", required=True, help="Directory of the DiskCache to fill.")
+    parser.add_argument("--ttl", type=float, default=300.0, help="Number of seconds the entries are fresh for.")
+    parser.add_argument("--ids", nargs="*", type=int, default=[], help="Icon ids.")
+    parser.add_argument("--slugs", nargs="*", default=[], help="Collection slugs.")
+    parser.add_argument("--terms", nargs="*", default=[], help="Icon terms.")
+    parser.add_argument("--term-limit", type=int, default=None, help="Maximum number of icons per term.")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum number of concurrent requests.")
+    parser.add_argument("--rate", type=float, default=None, help="Maximum number of requests per second.")
+    parser.add_argument("--measure-usage", action="store_true", help="Report the quota used, at the cost of two requests.")
+    args = parser.parse_args(argv)
+
+    def print_progress(report: WarmupReport) -> None:
+        print(f"\r{report.done}/{report.total} done, {len(report.failed)} failed, {report.requests_sent} requests sent", end="", file=sys.stderr)
+
+    api = API(args.key, args.secret, cache=DiskCache(args.cache_dir, ttl=args.ttl))
+    try:
+        report = warm_cache(api, icon_ids=args.ids, collection_slugs=args.slugs, terms=args.terms, term_limit=args.term_limit,
+                            max_workers=args.workers, rate=args.rate, progress=print_progress, measure_usage=args.measure_usage)
+    finally:
+        api._close_session()
+    print(file=sys.stderr)
+
+    for (kind, identifier), exception in report.failed.items():
+        print(f"Failed {kind} {identifier!r}: {exception}", file=sys.stderr)
+    print(f"Warmed {report.done - len(report.failed)}/{report.total} items in {report.elapsed:.1f}s using {report.requests_sent} requests"
+          + (f", monthly usage increased by {report.quota_used}" if report.quota_used is not None else "") + ".")
+    return 1 if report.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+import os, sys, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from TheNounProjectAPI.api import API
+
+""" 
+Compares preparing /icon/{id} and /icons/{term} requests through the session (_prepare_request)
+with the fast path for plain GET URLs (_prepare_get), with and without OAuth1 signing, 
+which costs the same on both paths.
+
+    python benchmarks/bench_prepare.py [requests]
+"""
+
+def measure(prepare, url: str, params: dict, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        prepare(url, params)
+    return (time.perf_counter() - start) / requests * 1e6
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    api = API("key", "secret", testing=True)
+    api._method = "GET"
+    endpoints = (("/icon/{id}", "http://api.thenounproject.com/icon/24014", {}),
+                 ("/icons/{term}", "http://api.thenounproject.com/icons/goat", {"limit_to_public_domain": 0, "limit": 50, "offset": 100, "page": None}))
+    for signing, auth in (("signed", api._get_oauth()), ("unsigned", lambda prepared_request: prepared_request)):
+        api._session.auth = auth
+        for name, url, params in endpoints:
+            slow = measure(api._prepare_request, url, params, requests)
+            fast = measure(api._prepare_get, url, params, requests)
+            print(f"{name:>13} {signing:>8}: session {slow:>6.1f}us, fast path {fast:>6.1f}us ({1 - fast / slow:.0%} less)")
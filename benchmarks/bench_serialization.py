@@ -0,0 +1,57 @@
+import os, sys, json, time, pickle
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+
+from TheNounProjectAPI.models import IconsModel
+
+""" 
+Compares pickle with to_bytes and from_bytes for an IconsModel of recent icons, as returned by the API,
+including the requests.Response which pickle has to serialise as well.
+
+    python benchmarks/bench_serialization.py [icons] [rounds]
+"""
+
+def icon(_id: int) -> dict:
+    return {
+        "attribution": f"Icon {_id} by Jane Doe from the Noun Project",
+        "date_uploaded": "2019-09-23",
+        "id": str(_id),
+        "is_active": "1",
+        "license_description": "creative-commons-attribution",
+        "permalink": f"/term/goat/{_id}",
+        "preview_url": f"https://static.thenounproject.com/png/{_id}-200.png",
+        "preview_url_42": f"https://static.thenounproject.com/png/{_id}-42.png",
+        "preview_url_84": f"https://static.thenounproject.com/png/{_id}-84.png",
+        "tags": [{"id": tag, "slug": f"tag-{tag}"} for tag in range(8)],
+        "term": "Goat",
+        "term_id": 1234,
+        "term_slug": "goat",
+        "uploader": {"location": "Amsterdam, NL", "name": "Jane Doe", "permalink": "/janedoe", "username": "janedoe"},
+        "uploader_id": "5678",
+        "year": 2019,
+    }
+
+def measure(name: str, dumps, loads, rounds: int) -> None:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        data = dumps()
+    middle = time.perf_counter()
+    for _ in range(rounds):
+        loads(data)
+    end = time.perf_counter()
+    print(f"{name:>8}: {len(data):>7} bytes, dump {(middle - start) / rounds * 1e6:>7.0f}us, load {(end - middle) / rounds * 1e6:>7.0f}us")
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    data = {"generated_at": "Mon, 23 Sep 2019 12:00:00 GMT", "recent_uploads": [icon(_id) for _id in range(count)]}
+    response = requests.Response()
+    response.status_code = 200
+    response.url = f"http://api.thenounproject.com/icons/recent_uploads?limit={count}"
+    response._content = json.dumps(data).encode()
+    icons = IconsModel.parse(data, response)
+
+    measure("pickle", lambda: pickle.dumps(icons, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads, rounds)
+    measure("to_bytes", icons.to_bytes, IconsModel.from_bytes, rounds)
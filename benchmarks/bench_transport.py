@@ -0,0 +1,50 @@
+import os, sys, time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.transport import HTTPXTransport
+import stub_server
+
+""" 
+Compares the requests and httpx transports by fetching icons concurrently from the local stub servers:
+requests and httpx over HTTP/1.1 connection pools, and httpx multiplexing all requests over one cleartext HTTP/2 connection,
+using prior knowledge as there is no TLS to negotiate HTTP/2 with. The HTTP/2 run is skipped if h2 is not installed.
+Against the local stubs connections are cheap, so this mostly measures the per-request overhead of each client;
+the connection savings of multiplexing grow with the latency of an https endpoint.
+
+    python benchmarks/bench_transport.py [requests] [workers]
+"""
+
+def run(api: API, requests: int, workers: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(api.get_icon_by_id, range(1, requests + 1)))
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    server, base_url = stub_server.start()
+    servers = [server]
+    transports = [("requests", None, base_url), ("httpx", HTTPXTransport(http2=False, max_connections=workers), base_url)]
+    try:
+        import h2, httpx
+    except ImportError:
+        print("Skipping httpx over HTTP/2, as h2 is not installed.")
+    else:
+        h2_server, h2_base_url = stub_server.start_h2()
+        servers.append(h2_server)
+        client = httpx.Client(http1=False, http2=True, limits=httpx.Limits(max_connections=1))
+        transports.append(("httpx h2", HTTPXTransport(client=client), h2_base_url))
+    try:
+        for name, transport, url in transports:
+            api = API("key", "secret", transport=transport, base_url=url)
+            run(api, workers, workers)
+            elapsed = run(api, requests, workers)
+            print(f"{name:>8}: {requests} requests with {workers} workers in {elapsed:.2f}s ({requests / elapsed:.0f} requests/s)")
+            api._close_session()
+    finally:
+        for server in servers:
+            server.shutdown()
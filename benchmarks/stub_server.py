@@ -0,0 +1,98 @@
+import json
+import re
+import socket
+import threading
+import socketserver
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Tuple
+
+"""
+Local stub of the TheNounProject API, answering /icon/{id} and /collection/{id} with small json documents.
+Used by the benchmarks, so they measure the client instead of the network.
+"""
+
+def respond(path: str) -> Tuple[int, bytes]:
+    """
+    :returns: Tuple of the status code and the json body answering a GET request for path.
+    :rtype: Tuple[int, bytes]
+    """
+    match = re.match(r"^/(icon|collection)/([^/?]+)", path)
+    if match is None:
+        return 404, b""
+    kind, identifier = match.groups()
+    body = json.dumps({kind: {"id": identifier, "term": "goat", "term_slug": "goat",
+                              "preview_url": f"https://static.thenounproject.com/png/{identifier}-200.png",
+                              "tags": [{"id": 1, "slug": "goat"}, {"id": 2, "slug": "animal"}]}}).encode()
+    return 200, body
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        status, body = respond(self.path)
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class H2StubHandler(socketserver.BaseRequestHandler):
+    """
+    Serves one cleartext HTTP/2 connection, answering the requests multiplexed over it as they arrive.
+    Clients must use prior knowledge, eg. httpx.Client(http1=False, http2=True), as there is no upgrade from HTTP/1.1.
+    """
+    def handle(self):
+        import h2.config, h2.connection, h2.events
+        connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        connection.initiate_connection()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.request.sendall(connection.data_to_send())
+        while True:
+            try:
+                data = self.request.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    status, body = respond(dict(event.headers)[":path"])
+                    headers = [(":status", str(status)), ("content-length", str(len(body)))]
+                    if body:
+                        headers.append(("content-type", "application/json"))
+                    connection.send_headers(event.stream_id, headers, end_stream=not body)
+                    if body:
+                        connection.send_data(event.stream_id, body, end_stream=True)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    self.request.sendall(connection.data_to_send())
+                    return
+            self.request.sendall(connection.data_to_send())
+
+def start() -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Starts the stub server on a free local port in a daemon thread.
+
+    :returns: Tuple of the server, to call shutdown() on, and its base URL.
+    :rtype: Tuple[ThreadingHTTPServer, str]
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def start_h2() -> Tuple[socketserver.ThreadingTCPServer, str]:
+    """
+    Starts a cleartext HTTP/2 stub server on a free local port in a daemon thread. Requires the h2 package.
+
+    :returns: Tuple of the server, to call shutdown() on, and its base URL.
+    :rtype: Tuple[socketserver.ThreadingTCPServer, str]
+    """
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), H2StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -24,11 +24,14 @@ VERSION = None
 
 # What packages are required for this module to be executed?
 REQUIRED = [
-    "requests", "requests_oauthlib", "wrapt"
+    "requests", "requests_oauthlib"
 ]
 
 # What packages are optional?
 EXTRAS = {
+    "http2": ["httpx[http2]"],
+    "msgpack": ["msgpack"],
+    "arrow": ["pyarrow"],
 }
 
 here = os.path.abspath(os.path.dirname(__file__))
@@ -102,9 +105,9 @@ setup(
     # If your package is a single module, use this instead of 'packages':
     # py_modules=['mypackage'],
 
-    # entry_points={
-    #     'console_scripts': ['mycli=mymodule:cli'],
-    # },
+    entry_points={
+        'console_scripts': ['tnp-warm-cache=TheNounProjectAPI.warmup:main'],
+    },
     install_requires=REQUIRED,
     extras_require=EXTRAS,
     include_package_data=True,
@@ -1,3 +1,31 @@
-import os, sys
+import os, sys, json
 """ Expand the context so we can easily access TheNounProjectAPI """
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
\ No newline at end of file
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def fake_response(prepared_request=None, status_code=200, data=None, content=None, **attributes):
+    """
+    Helper function to create a requests.Response as if it was returned by the API for prepared_request.
+    The body is content, or data dumped as json. Other keyword arguments are set on the response, eg. raw or elapsed.
+    """
+    # Imported here, as tests check that importing TheNounProjectAPI does not import requests.
+    import requests
+    response = requests.Response()
+    response.status_code = status_code
+    response.request = prepared_request
+    response.url = getattr(prepared_request, "url", None)
+    if "raw" not in attributes:
+        response._content = content if content is not None else json.dumps(data or {}).encode()
+    for name, value in attributes.items():
+        setattr(response, name, value)
+    return response
+
+def fake_send(data=None, missing="missing"):
+    """
+    Helper function to create a replacement for Session.send, answering each request with data,
+    or data(prepared_request) if data is callable. Requests with missing in their url get an empty 404 response.
+    """
+    def send(prepared_request, **kwargs):
+        if missing and missing in prepared_request.url:
+            return fake_response(prepared_request, 404, content=b"")
+        return fake_response(prepared_request, data=data(prepared_request) if callable(data) else data)
+    return send
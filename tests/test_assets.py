@@ -0,0 +1,149 @@
+import unittest, os, io, json, tempfile, hashlib
+from unittest import mock
+
+import context
+from context import fake_response
+
+from TheNounProjectAPI.assets import AssetFetcher
+from TheNounProjectAPI.store import AssetStore
+from TheNounProjectAPI.models import IconModel, IconsModel
+from TheNounProjectAPI.exceptions import IllegalRendition, NotFound
+
+class Assets(unittest.TestCase):
+
+    def setUp(self):
+        self.icons = IconsModel.parse({"icons": [
+            {"id": "1", "preview_url": "https://static.thenounproject.com/png/1-200.png", "icon_url": "https://static.thenounproject.com/svg/1.svg"},
+            {"id": "2", "preview_url": "https://static.thenounproject.com/png/2-200.png"},
+        ]})
+        self.contents = {
+            "https://static.thenounproject.com/png/1-200.png": b"png 1",
+            "https://static.thenounproject.com/svg/1.svg": b"<svg/>",
+            "https://static.thenounproject.com/png/2-200.png": b"png 2",
+        }
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _fetcher(self, **kwargs):
+        """
+        Helper function to create an AssetFetcher whose session returns self.contents instead of making requests.
+        """
+        fetcher = AssetFetcher(**kwargs)
+        fetcher._session.get = mock.Mock(side_effect=lambda url, **_: fake_response(status_code=200, url=url, raw=io.BytesIO(self.contents[url])))
+        return fetcher
+
+    def test_fetch_to_memory(self):
+        """
+        Check that all requested renditions which the icons have are downloaded into buffers.
+        """
+        fetcher = self._fetcher(renditions=("preview_url", "icon_url"))
+        assets = fetcher.fetch(self.icons)
+        self.assertEqual(len(assets), 3)
+        for asset in assets:
+            self.assertEqual(asset.data.read(), self.contents[asset.url])
+            self.assertEqual(asset.sha256, hashlib.sha256(self.contents[asset.url]).hexdigest())
+
+    def test_fetch_single_icon(self):
+        """
+        Check that a single IconModel is accepted.
+        """
+        fetcher = self._fetcher()
+        assets = fetcher.fetch(IconModel.parse(self.icons[0].json))
+        self.assertEqual([asset.icon_id for asset in assets], ["1"])
+
+    def test_fetch_to_disk_skips_present(self):
+        """
+        Check that files already on disk with the recorded content hash are not downloaded again.
+        """
+        fetcher = self._fetcher(directory=self.directory.name)
+        assets = fetcher.fetch(self.icons)
+        self.assertFalse(any(asset.skipped for asset in assets))
+        for asset in assets:
+            with open(asset.path, "rb") as f:
+                self.assertEqual(f.read(), self.contents[asset.url])
+
+        fetcher = self._fetcher(directory=self.directory.name)
+        assets = fetcher.fetch(self.icons)
+        self.assertTrue(all(asset.skipped for asset in assets))
+        fetcher._session.get.assert_not_called()
+
+    def test_fetch_to_disk_redownloads_modified(self):
+        """
+        Check that a file whose content no longer matches the recorded hash is downloaded again.
+        """
+        fetcher = self._fetcher(directory=self.directory.name)
+        asset = fetcher.fetch(self.icons[1])[0]
+        with open(asset.path, "wb") as f:
+            f.write(b"corrupted")
+        asset = fetcher.fetch(self.icons[1])[0]
+        self.assertFalse(asset.skipped)
+
+    def test_fetch_to_store(self):
+        """
+        Check that assets are streamed into an AssetStore, and not downloaded again once stored.
+        """
+        store = AssetStore(self.directory.name)
+        fetcher = self._fetcher(store=store, renditions=("preview_url", "icon_url"))
+        assets = fetcher.fetch(self.icons)
+        self.assertFalse(any(asset.skipped for asset in assets))
+        self.assertEqual(bytes(store.open("1", "icon_url")), b"<svg/>")
+
+        fetcher = self._fetcher(store=store, renditions=("preview_url", "icon_url"))
+        assets = fetcher.fetch(self.icons)
+        self.assertTrue(all(asset.skipped for asset in assets))
+        fetcher._session.get.assert_not_called()
+
+    def test_fetch_to_full_store(self):
+        """
+        Check that an asset is returned even if the store is too small to keep any other asset next to it.
+        """
+        store = AssetStore(self.directory.name, max_bytes=1)
+        fetcher = self._fetcher(store=store, renditions=("preview_url", "icon_url"), max_workers=1)
+        assets = fetcher.fetch(self.icons)
+        self.assertEqual(len(assets), 3)
+        self.assertEqual(len(store), 1)
+        with open(assets[-1].path, "rb") as f:
+            self.assertEqual(f.read(), self.contents[assets[-1].url])
+
+    def test_pipeline(self):
+        """
+        Check that the pipeline consumes an iterator of IconsModel pages, downloading icons on multiple pages only once.
+        """
+        fetcher = self._fetcher(max_workers=2, directory=self.directory.name)
+        assets = list(fetcher.pipeline(iter([self.icons, self.icons])))
+        self.assertEqual(sorted(asset.icon_id for asset in assets), ["1", "2"])
+        self.assertEqual(fetcher._session.get.call_count, 2)
+        self.assertFalse([name for name in os.listdir(self.directory.name) if name.endswith(".part")])
+
+    def test_pipeline_saves_manifest(self):
+        """
+        Check that the pipeline saves the manifest while downloading, so an interrupted pipeline does not lose its progress.
+        """
+        fetcher = self._fetcher(directory=self.directory.name, max_workers=1)
+        fetcher._manifest_interval = 1
+        pipeline = fetcher.pipeline([self.icons])
+        asset = next(pipeline)
+        with open(os.path.join(self.directory.name, fetcher._manifest_name)) as f:
+            self.assertIn(os.path.basename(asset.path), json.load(f))
+        pipeline.close()
+
+    def test_fetch_error(self):
+        """
+        Check that error status codes raise the same exceptions as the endpoints.
+        """
+        fetcher = AssetFetcher()
+        fetcher._session.get = mock.Mock(side_effect=lambda url, **_: fake_response(status_code=404, url=url, raw=io.BytesIO(b"")))
+        with self.assertRaises(NotFound):
+            fetcher.fetch(self.icons)
+
+    def test_illegal_rendition(self):
+        """
+        Check that unknown renditions are rejected.
+        """
+        with self.assertRaises(IllegalRendition):
+            AssetFetcher(renditions=("thumbnail",))
+
+if __name__ == "__main__":
+    unittest.main()
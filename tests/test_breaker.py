@@ -0,0 +1,131 @@
+import unittest, time
+from unittest import mock
+
+import context
+
+import requests
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.cache import MemoryCache
+from TheNounProjectAPI.breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from TheNounProjectAPI.exceptions import CircuitOpen, ServerException, NotFound
+
+class Breaker(unittest.TestCase):
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=3, window=10.0, recovery_timeout=0.05)
+        self.transitions = []
+        self.breaker.listeners.append(lambda breaker, old, new: self.transitions.append((old, new)))
+        self.api = API("key", "secret", circuit_breaker=self.breaker)
+        self.status_code = 503
+        def send(prepared_request, **kwargs):
+            response = mock.Mock(status_code=self.status_code)
+            response.json.return_value = {"icon": {"id": "1"}}
+            return response
+        self.api._session.send = mock.Mock(side_effect=send)
+
+    def _fail(self, times):
+        """
+        Helper function to make times requests which raise ServerException.
+        """
+        for _ in range(times):
+            with self.assertRaises(ServerException):
+                self.api.get_icon(1)
+
+    def test_opens(self):
+        """
+        Check that the breaker opens after failure_threshold failures, and then fails fast.
+        """
+        self._fail(2)
+        self.assertEqual(self.api.circuit_breaker.state, CLOSED)
+        self._fail(1)
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpen):
+            self.api.get_icon(1)
+        self.assertEqual(self.api._session.send.call_count, 3)
+        self.assertEqual(self.transitions, [(CLOSED, OPEN)])
+
+    def test_other_status_codes(self):
+        """
+        Check that status codes other than server errors do not count as failures.
+        """
+        self.status_code = 404
+        for _ in range(5):
+            with self.assertRaises(NotFound):
+                self.api.get_icon(1)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_connection_errors(self):
+        """
+        Check that connection errors and timeouts count as failures.
+        """
+        self.api._session.send = mock.Mock(side_effect=requests.exceptions.ConnectTimeout())
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.Timeout):
+                self.api.get_icon(1)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_half_open_success(self):
+        """
+        Check that a successful probe after recovery_timeout closes the breaker.
+        """
+        self._fail(3)
+        time.sleep(0.06)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.status_code = 200
+        self.api.get_icon(1)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.transitions, [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)])
+
+    def test_half_open_failure(self):
+        """
+        Check that a failed probe opens the breaker again, and only one probe is allowed at once.
+        """
+        self._fail(3)
+        time.sleep(0.06)
+        self.breaker.before_request()
+        with self.assertRaises(CircuitOpen):
+            self.breaker.before_request()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_window(self):
+        """
+        Check that failures older than window are forgotten.
+        """
+        self.breaker.window = 0.05
+        self._fail(2)
+        time.sleep(0.06)
+        self._fail(1)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.failures, 1)
+
+    def test_listener_reads_breaker(self):
+        """
+        Check that listeners are called without the lock held, so they can read the state of the breaker.
+        """
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        seen = []
+        breaker.listeners.append(lambda breaker, old, new: seen.append((breaker.state, breaker.failures, repr(breaker))))
+        breaker.record_failure()
+        self.assertEqual(seen, [(OPEN, 1, "<CircuitBreaker: State: open, Failures: 1>")])
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertEqual(seen[1][0], HALF_OPEN)
+
+    def test_stale_cache_fallback(self):
+        """
+        Check that expired cache entries are served while the breaker is open, when stale_if_error is set.
+        """
+        self.api._cache = MemoryCache(ttl=0, stale_if_error=True)
+        self.status_code = 200
+        icon = self.api.get_icon(1)
+        self.status_code = 503
+        for _ in range(3):
+            self.assertIs(self.api.get_icon(1), icon)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertIs(self.api.get_icon(1), icon)
+        self.assertEqual(self.api._session.send.call_count, 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+import unittest, os, json, time, pickle, tempfile
+from unittest import mock
+
+import context
+from context import fake_response
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.cache import MemoryCache, DiskCache
+from TheNounProjectAPI.models import IconModel, IconsModel, ResponseMeta
+from TheNounProjectAPI.exceptions import NotFound, LegalReasons, ServerException
+
+class Cache(unittest.TestCase):
+
+    def setUp(self):
+        key = "mock api key to satisfy type check in api._get_oauth()"
+        secret = "mock secret key to satisfy type check in api._get_oauth()"
+        self.cache = MemoryCache(ttl=60, negative_ttl=60)
+        self.api = API(key, secret, cache=self.cache)
+        self.status_code = 200
+        self.api._send = mock.Mock(side_effect=lambda prepared_request: fake_response(prepared_request, self.status_code, {"icon": {"id": "12", "term": "Goat"}, "recent_uploads": []}))
+
+    def test_hit(self):
+        """
+        Check that a repeated request is answered from the cache.
+        """
+        first = self.api.get_icon(12)
+        second = self.api.get_icon_by_id(12)
+        self.assertIsInstance(second, IconModel)
+        self.assertIs(first, second)
+        self.assertEqual(self.api._send.call_count, 1)
+
+    def test_different_urls(self):
+        """
+        Check that requests with different URLs or parameters are cached separately.
+        """
+        self.api.get_icon(12)
+        self.api.get_icon(13)
+        self.api.get_recent_icons(limit=1)
+        self.api.get_recent_icons(limit=2)
+        self.assertEqual(self.api._send.call_count, 4)
+
+    def test_expired(self):
+        """
+        Check that expired entries are not used.
+        """
+        self.cache.ttl = 0
+        self.api.get_icon(12)
+        self.api.get_icon(12)
+        self.assertEqual(self.api._send.call_count, 2)
+
+    def test_negative(self):
+        """
+        Check that NotFound is cached, and raised again without sending a request.
+        """
+        self.status_code = 404
+        for _ in range(2):
+            with self.assertRaises(NotFound):
+                self.api.get_icons_by_term("no icons for this term")
+        self.assertEqual(self.api._send.call_count, 1)
+
+    def test_negative_expired(self):
+        """
+        Check that negative entries expire after negative_ttl.
+        """
+        self.cache.negative_ttl = 0
+        self.status_code = 404
+        for _ in range(2):
+            with self.assertRaises(NotFound):
+                self.api.get_icon_by_term("no icons for this term")
+        self.assertEqual(self.api._send.call_count, 2)
+
+    def test_negative_exceptions(self):
+        """
+        Check that only exceptions in negative_exceptions are cached.
+        """
+        for status_code in (451, 503):
+            self.status_code = status_code
+            for _ in range(2):
+                with self.assertRaises((LegalReasons, ServerException)):
+                    self.api.get_icon(12)
+        self.assertEqual(self.api._send.call_count, 4)
+
+        self.cache.negative_exceptions = (NotFound, LegalReasons)
+        self.status_code = 451
+        for _ in range(2):
+            with self.assertRaises(LegalReasons):
+                self.api.get_icon(12)
+        self.assertEqual(self.api._send.call_count, 5)
+
+    def test_post_not_cached(self):
+        """
+        Check that POST requests are never cached.
+        """
+        self.api.report_usage(12, test=True)
+        self.api.report_usage(12, test=True)
+        self.assertEqual(self.api._send.call_count, 2)
+
+    def test_max_entries(self):
+        """
+        Check that the least recently used entry is removed once max_entries is exceeded.
+        """
+        self.cache.max_entries = 2
+        self.api.get_icon(1)
+        self.api.get_icon(2)
+        self.api.get_icon(1)
+        self.api.get_icon(3)
+        self.assertEqual(len(self.cache), 2)
+        self.api.get_icon(1)
+        self.assertEqual(self.api._send.call_count, 3)
+
+    def _wait_for_revalidation(self):
+        """
+        Helper function to wait until all background revalidations of the cache are done.
+        """
+        for _ in range(100):
+            if not self.cache._revalidating:
+                return
+            time.sleep(0.01)
+
+    def _age(self, seconds):
+        """
+        Helper function to make all entries in the cache seconds older.
+        """
+        for entry in self.cache._entries.values():
+            entry.created -= seconds
+            entry.expires -= seconds
+
+    def test_stale_while_revalidate(self):
+        """
+        Check that stale entries are served immediately, while the cache is updated in the background.
+        """
+        self.cache.stale_ttl = 120
+        first = self.api.get_icon(12)
+        self._age(90)
+        self.assertIs(self.api.get_icon(12), first)
+        self._wait_for_revalidation()
+        self.assertEqual(self.api._send.call_count, 2)
+        self.assertIsNot(self.api.get_icon(12), first)
+        self.assertEqual(self.api._send.call_count, 2)
+
+    def test_stale_past_hard_ttl(self):
+        """
+        Check that entries past stale_ttl are not served if the API works.
+        """
+        self.cache.stale_ttl = 120
+        self.cache.stale_if_error = True
+        first = self.api.get_icon(12)
+        self._age(150)
+        self.assertIsNot(self.api.get_icon(12), first)
+        self.assertEqual(self.api._send.call_count, 2)
+
+    def test_stale_if_error(self):
+        """
+        Check that entries past stale_ttl are served if the API raises ServerException or RateLimited.
+        """
+        self.cache.stale_ttl = 120
+        self.cache.stale_if_error = True
+        first = self.api.get_icon(12)
+        self._age(150)
+        for status_code in (503, 429):
+            self.status_code = status_code
+            self.assertIs(self.api.get_icon(12), first)
+
+        self.cache.stale_if_error = False
+        with self.assertRaises(ServerException):
+            self.status_code = 503
+            self.api.get_icon(12)
+
+class Disk(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = DiskCache(self.directory.name, ttl=60, negative_ttl=60)
+        self.api = API("key", "secret", cache=self.cache)
+        self.status_code = 200
+        self.api._send = mock.Mock(side_effect=lambda prepared_request: fake_response(prepared_request, self.status_code, {"icons": [{"id": "12"}], "generated_at": "now"}))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_back(self):
+        """
+        Check that models, their list-level attributes and response metadata are read back by another DiskCache.
+        """
+        icons = self.api.get_icons_by_term("goat")
+        api = API("key", "secret", cache=DiskCache(self.directory.name))
+        api._send = mock.Mock(side_effect=AssertionError("The entry should be read from the cache."))
+        cached = api.get_icons_by_term("goat")
+        self.assertIsInstance(cached, IconsModel)
+        self.assertEqual([icon.id for icon in cached], [icon.id for icon in icons])
+        self.assertEqual(cached.generated_at, "now")
+        self.assertIsInstance(cached.response, ResponseMeta)
+        self.assertEqual((cached.response.status_code, cached.response.url), (200, icons.response.url))
+
+    def test_negative(self):
+        """
+        Check that cached exceptions are read back, and raised with the response metadata.
+        """
+        self.status_code = 404
+        with self.assertRaises(NotFound):
+            self.api.get_icons_by_term("missing")
+        api = API("key", "secret", cache=DiskCache(self.directory.name))
+        api._send = mock.Mock(side_effect=AssertionError("The entry should be read from the cache."))
+        with self.assertRaises(NotFound) as context_manager:
+            api.get_icons_by_term("missing")
+        self.assertIn("<Response [404]>", str(context_manager.exception))
+
+    def test_no_pickle(self):
+        """
+        Check that entries are not pickled, and that pickled or corrupt files are treated as missing rather than loaded.
+        """
+        self.api.get_icons_by_term("goat")
+        name, = os.listdir(self.directory.name)
+        path = os.path.join(self.directory.name, name)
+        with open(path, "rb") as f:
+            self.assertEqual(json.loads(f.readline())["model"], "IconsModel")
+
+        with open(path, "wb") as f:
+            pickle.dump(IconsModel.parse({"icons": []}), f)
+        self.api.get_icons_by_term("goat")
+        with open(path, "wb") as f:
+            f.write(b'{"format": 1, "model": "Popen", "exception": null}\n')
+        self.api.get_icons_by_term("goat")
+        self.assertEqual(self.api._send.call_count, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest, time
+from collections import Counter
+from unittest import mock
+
+import context
+from context import fake_response
+
+import requests
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.credentials import CredentialPool, Credential
+from TheNounProjectAPI.exceptions import RateLimited, CredentialsExhausted
+
+class Credentials(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = CredentialPool([("key a", "secret a"), ("key b", "secret b"), ("key c", "secret c")], cooldown=60.0, seed=1)
+        self.api = API(credentials=self.pool)
+        # Maps consumer keys to the status code and monthly usage returned for them.
+        self.status_codes = {}
+        self.usage = {"key a": 4000, "key b": 4990, "key c": 5000}
+        def send(prepared_request, **kwargs):
+            key = self.pool.credential_for(prepared_request).key
+            return fake_response(prepared_request, self.status_codes.get(key, 200), {"icon": {"id": "1"}, "limits": {"hourly": None, "daily": None, "monthly": 5000},
+                                                                                     "usage": {"hourly": 0, "daily": 0, "monthly": self.usage[key]}})
+        self.api._session.send = mock.Mock(side_effect=send)
+
+    def _keys(self, times):
+        """
+        Helper function to make times requests, returning how often each key was used.
+        """
+        for _ in range(times):
+            self.api.get_icon(1)
+        return Counter(self.pool.credential_for(call.args[0]).key for call in self.api._session.send.call_args_list[-times:])
+
+    def test_rotation(self):
+        """
+        Check that requests are spread over all keys which have not been refreshed.
+        """
+        keys = self._keys(60)
+        self.assertEqual(set(keys), {"key a", "key b", "key c"})
+        self.assertEqual(sum(credential.requests_sent for credential in self.pool.credentials), 60)
+        self.assertIs(self.api.credentials, self.pool)
+
+    def test_weighted(self):
+        """
+        Check that refresh fetches the usage of every key, and requests are weighted by the requests left.
+        """
+        self.pool.refresh(self.api)
+        self.assertEqual([credential.remaining for credential in self.pool.credentials], [1000, 10, 0])
+        self.assertEqual([credential.key for credential in self.pool.available()], ["key a", "key b"])
+        keys = self._keys(100)
+        self.assertGreater(keys["key a"], 85)
+        self.assertNotIn("key c", keys)
+        self.assertEqual(self.pool.credentials[0].remaining, 1000 - keys["key a"])
+
+    def test_period_passed(self):
+        """
+        Check that a key with no requests left returns to rotation once the period of its tightest limit has passed.
+        """
+        self.pool.refresh(self.api)
+        credential = self.pool.credentials[2]
+        self.assertAlmostEqual(credential.resets_at - time.monotonic(), 30 * 86400.0, delta=60.0)
+        self.assertNotIn(credential, self.pool.available())
+        credential.resets_at = time.monotonic()
+        self.assertIn(credential, self.pool.available())
+        self.assertIsNone(credential.remaining)
+
+    def test_refresh_connection_error(self):
+        """
+        Check that refresh takes keys out of rotation whose usage can not be fetched due to a connection error.
+        """
+        send = self.api._session.send.side_effect
+        def failing_send(prepared_request, **kwargs):
+            if self.pool.credential_for(prepared_request).key == "key b":
+                raise requests.exceptions.ConnectionError("refused")
+            return send(prepared_request, **kwargs)
+        self.api._session.send.side_effect = failing_send
+        self.pool.refresh(self.api)
+        self.assertEqual([credential.remaining for credential in self.pool.credentials], [1000, None, 0])
+        self.assertEqual([credential.key for credential in self.pool.available()], ["key a"])
+
+    def test_cooldown(self):
+        """
+        Check that rate limited keys are taken out of rotation until the cooldown ends, 
+        and that CredentialsExhausted is raised when no key is left.
+        """
+        self.status_codes = {"key a": 429, "key b": 429, "key c": 429}
+        failed = 0
+        while self.pool.available():
+            with self.assertRaises(RateLimited):
+                self.api.get_icon(1)
+            failed += 1
+        self.assertEqual(failed, 3)
+        with self.assertRaises(CredentialsExhausted) as cm:
+            self.api.get_icon(1)
+        self.assertAlmostEqual(cm.exception.retry_after, 60.0, delta=1.0)
+        for credential in self.pool.credentials:
+            credential.disabled_until -= 60.0
+        self.assertEqual(len(self.pool.available()), 3)
+
+    def test_using(self):
+        """
+        Check that using() signs requests with one key, even if it is out of rotation.
+        """
+        credential = self.pool.credentials[2]
+        credential.disabled_until = float("inf")
+        with self.pool.using(credential):
+            keys = self._keys(5)
+        self.assertEqual(keys, {"key c": 5})
+
+    def test_credential_for(self):
+        """
+        Check that requests not signed by the pool have no credential, and that keys with special characters are found.
+        """
+        pool = CredentialPool([("key/+=", "secret")])
+        self.assertIsNone(pool.credential_for(API("other", "secret", testing=True).get_icon(1)))
+        api = API(credentials=pool, testing=True)
+        self.assertIs(pool.credential_for(api.get_icon(1)), pool.credentials[0])
+        self.assertIs(pool.credential_for(api.get_icons_by_term("goat")), pool.credentials[0])
+
+    def test_repr(self):
+        self.assertEqual(repr(self.pool), "<CredentialPool: Credentials: 3, Available: 3>")
+        self.assertEqual(repr(Credential("3d8f1234", "secret")), "<Credential: Key: 3d8f..., Remaining: None>")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest, time
+from unittest import mock
+
+import context
+
+import requests
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.scheduler import Scheduler, INTERACTIVE
+from TheNounProjectAPI.deadline import deadline, current_deadline
+from TheNounProjectAPI.exceptions import DeadlineExceeded
+
+class Deadlines(unittest.TestCase):
+
+    def setUp(self):
+        self.api = API("key", "secret", timeout=(3.0, 5.0))
+        self.timeouts = []
+        self.delay = 0.0
+        def send(prepared_request, timeout=None, **kwargs):
+            self.timeouts.append(timeout)
+            time.sleep(self.delay)
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"icon": {"id": "1"}}
+            return response
+        self.api._session.send = mock.Mock(side_effect=send)
+
+    def test_timeout_lowered(self):
+        """
+        Check that the timeout of each request is lowered to the remaining time.
+        """
+        with self.api.deadline(1.0) as active_deadline:
+            self.api.get_icon(1)
+        self.assertEqual(active_deadline.completed, 1)
+        connect, read = self.timeouts[0]
+        self.assertTrue(0 < connect <= 1.0 and 0 < read <= 1.0)
+
+        self.api.get_icon(1)
+        self.assertEqual(self.timeouts[1], (3.0, 5.0))
+
+    def test_exceeded(self):
+        """
+        Check that no requests are sent once the deadline expired, and the exception holds the completed requests.
+        """
+        # The first request imports requests_oauthlib, which must not count towards the deadline.
+        self.api.get_icon(1)
+        self.api._session.send.reset_mock()
+        self.delay = 0.03
+        with self.assertRaises(DeadlineExceeded) as context_manager:
+            with self.api.deadline(0.05):
+                for _ in range(5):
+                    self.api.get_icon(1)
+        self.assertEqual(context_manager.exception.completed, 2)
+        self.assertEqual(self.api._session.send.call_count, 2)
+
+    def test_in_flight_timeout(self):
+        """
+        Check that a request timing out because of the deadline raises DeadlineExceeded.
+        """
+        def send(prepared_request, timeout=None, **kwargs):
+            time.sleep(max(timeout))
+            raise requests.exceptions.ReadTimeout()
+        self.api._session.send = mock.Mock(side_effect=send)
+        with self.assertRaises(DeadlineExceeded):
+            with self.api.deadline(0.01):
+                self.api.get_icon(1)
+
+        self.api._session.send = mock.Mock(side_effect=requests.exceptions.ReadTimeout())
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            with self.api.deadline(10):
+                self.api.get_icon(1)
+
+    def test_nested(self):
+        """
+        Check that nested deadlines cannot extend the outer deadline, and count completed requests for both.
+        """
+        with deadline(1.0) as outer:
+            with deadline(10.0) as inner:
+                self.assertIs(current_deadline(), inner)
+                self.assertLessEqual(inner.remaining(), 1.0)
+                self.api.get_icon(1)
+            self.assertIs(current_deadline(), outer)
+        self.assertIsNone(current_deadline())
+        self.assertEqual((outer.completed, inner.completed), (1, 1))
+
+    def test_scheduler_wait(self):
+        """
+        Check that waiting for a Scheduler slot is limited by the deadline.
+        """
+        scheduler = Scheduler(max_concurrency=1)
+        self.api._scheduler = scheduler
+        scheduler.acquire(INTERACTIVE)
+        with self.assertRaises(DeadlineExceeded):
+            with self.api.deadline(0.01):
+                self.api.get_icon(1)
+        self.assertEqual(scheduler.lanes[INTERACTIVE].in_flight, 1)
+
+    def test_expired_once_slot_acquired(self):
+        """
+        Check that a deadline which expires as a Scheduler slot is acquired raises DeadlineExceeded, without sending the request.
+        """
+        scheduler = Scheduler(max_concurrency=1)
+        self.api._scheduler = scheduler
+        acquire = scheduler.acquire
+        def slow_acquire(*args, **kwargs):
+            lane = acquire(*args, **kwargs)
+            time.sleep(0.02)
+            return lane
+        scheduler.acquire = slow_acquire
+        with self.assertRaises(DeadlineExceeded):
+            with self.api.deadline(0.01):
+                self.api.get_icon(1)
+        self.api._session.send.assert_not_called()
+        self.assertEqual(self.api.requests_sent, 0)
+        self.assertEqual(scheduler.lanes[INTERACTIVE].in_flight, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest, os, tempfile
+from unittest import mock
+
+import context
+
+from TheNounProjectAPI import export
+from TheNounProjectAPI.export import icon_schema, icons_to_record_batch, ParquetIconWriter, export_icons
+from TheNounProjectAPI.models import IconsModel
+
+def _page(start, count):
+    """
+    Helper function to create an IconsModel page as if it was returned by get_icons_by_term.
+    """
+    return IconsModel.parse({"icons": [{"id": str(_id), "term": "Goat", "term_id": 5, "year": "", "attribution": f"Icon {_id}",
+                                        "uploader": {"name": "Jane", "username": "jane", "extra": "dropped"},
+                                        "tags": [{"id": 1, "slug": "goat"}, {"id": "2", "slug": "animal"}]}
+                                       for _id in range(start, start + count)]})
+
+@unittest.skipIf(export.pa is None, "pyarrow is not installed")
+class Export(unittest.TestCase):
+
+    def test_record_batch(self):
+        """
+        Check that icons are converted to a record batch with the fixed schema, including the nested columns.
+        """
+        batch = icons_to_record_batch(_page(12, 2))
+        self.assertEqual(batch.schema, icon_schema())
+        self.assertEqual(batch.num_rows, 2)
+        rows = batch.to_pylist()
+        self.assertEqual(rows[0]["id"], 12)
+        self.assertEqual(rows[0]["term_id"], 5)
+        self.assertIsNone(rows[0]["year"])
+        self.assertIsNone(rows[0]["preview_url"])
+        self.assertEqual(rows[1]["uploader"], {"location": None, "name": "Jane", "permalink": None, "username": "jane"})
+        self.assertEqual(rows[1]["tags"], [{"id": 1, "slug": "goat"}, {"id": 2, "slug": "animal"}])
+
+    def test_missing_nested(self):
+        """
+        Check that icons without an uploader or tags are converted with nulls and empty lists.
+        """
+        rows = icons_to_record_batch(IconsModel.parse({"icons": [{"id": "1"}]})).to_pylist()
+        self.assertIsNone(rows[0]["uploader"])
+        self.assertEqual(rows[0]["tags"], [])
+
+    def test_parquet(self):
+        """
+        Check that pages are written incrementally to a single Parquet file.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "icons.parquet")
+            pages = (_page(start, 50) for start in range(0, 200, 50))
+            self.assertEqual(export_icons(pages, path, compression="zstd"), 200)
+            table = export.pq.read_table(path)
+            self.assertEqual(table.num_rows, 200)
+            self.assertEqual(table.column("id").to_pylist(), list(range(200)))
+            self.assertEqual(export.pq.ParquetFile(path).metadata.num_row_groups, 4)
+
+    def test_empty_page(self):
+        """
+        Check that empty pages are skipped.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "icons.parquet")
+            with ParquetIconWriter(path) as writer:
+                writer.write(IconsModel())
+                writer.write(_page(0, 3))
+            self.assertEqual(writer.rows, 3)
+            self.assertEqual(export.pq.read_table(path).num_rows, 3)
+
+class ExportWithoutPyArrow(unittest.TestCase):
+
+    def test_import_error(self):
+        """
+        Check that a helpful ImportError is raised without pyarrow.
+        """
+        export.icon_schema.cache_clear()
+        try:
+            with mock.patch.object(export, "pa", None):
+                with self.assertRaises(ImportError):
+                    icons_to_record_batch(_page(0, 1))
+        finally:
+            export.icon_schema.cache_clear()
+
+if __name__ == "__main__":
+    unittest.main()
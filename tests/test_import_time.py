@@ -0,0 +1,63 @@
+import unittest, os, sys, subprocess
+
+import context
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+def _import_times(statement: str) -> dict:
+    """
+    Helper function running statement in a new interpreter with `python -X importtime`,
+    returning a mapping of every imported module to its cumulative import time in microseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT,
+                            stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, check=True, universal_newlines=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+class ImportTime(unittest.TestCase):
+
+    # Modules which are slow to import, and which should only be imported once a request is made.
+    deferred = ("requests", "requests_oauthlib", "oauthlib", "urllib3", "wrapt")
+
+    def assertDeferred(self, statement: str) -> None:
+        times = _import_times(statement)
+        imported = [name for name in self.deferred if name in times]
+        total = max(times.values())
+        self.assertEqual(imported, [], f"{statement!r} imported {imported}, total import time {total}us")
+
+    def test_package(self):
+        """
+        Check that importing the package imports nothing slow.
+        """
+        self.assertDeferred("import TheNounProjectAPI")
+
+    def test_api(self):
+        """
+        Check that importing and constructing the API defers requests, oauthlib and the transport.
+        """
+        self.assertDeferred("from TheNounProjectAPI import API; API('key', 'secret')")
+        self.assertDeferred("import TheNounProjectAPI.api")
+
+    def test_cache(self):
+        """
+        Check that the cache and models can be used without importing requests.
+        """
+        self.assertDeferred("from TheNounProjectAPI.cache import MemoryCache; from TheNounProjectAPI.models import IconModel; "
+                            "MemoryCache().set('key', IconModel.parse({'id': '12'}))")
+
+    def test_request(self):
+        """
+        Check that preparing a request imports requests and oauthlib.
+        """
+        times = _import_times("from TheNounProjectAPI import API; API('key', 'secret', testing=True).get_icon(12)")
+        self.assertIn("requests", times)
+        self.assertIn("requests_oauthlib", times)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest import mock
+
+import context
+
+from TheNounProjectAPI.index import IconIndex
+from TheNounProjectAPI.models import IconsModel
+from TheNounProjectAPI.exceptions import IllegalTerm, NotFound
+
+def _icon(_id, term, tags=()):
+    """
+    Helper function to create the json of an icon as returned by the API.
+    """
+    return {"id": str(_id),
+            "term": term,
+            "term_slug": term.lower().replace(" ", "-"),
+            "attribution": f"{term} by Someone from Noun Project",
+            "tags": [{"id": i, "slug": tag} for i, tag in enumerate(tags)],
+            "uploader": {"name": "Someone", "username": "someone"}}
+
+class Index(unittest.TestCase):
+
+    def setUp(self):
+        self.index = IconIndex()
+        self.index.add(IconsModel.parse({"icons": [_icon(1, "Goat", ["animal", "farm"]),
+                                                   _icon(2, "Goat Feeding", ["farm"]),
+                                                   _icon(3, "Cat", ["animal", "pet"])]}))
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_search(self):
+        """
+        Check that searching returns an IconsModel with all icons matching all words.
+        """
+        result = self.index.search("goat")
+        self.assertIsInstance(result, IconsModel)
+        self.assertEqual({icon.id for icon in result}, {"1", "2"})
+        self.assertEqual([icon.id for icon in self.index.search("goat feeding")], ["2"])
+
+    def test_search_prefix(self):
+        """
+        Check that prefix searches allow autocompletion.
+        """
+        self.assertEqual(len(self.index.search("go")), 0)
+        self.assertEqual(len(self.index.search("go", prefix=True)), 2)
+
+    def test_search_limit_offset(self):
+        """
+        Check that limit and offset are applied.
+        """
+        self.assertEqual(len(self.index.search("animal", limit=1)), 1)
+        self.assertEqual(len(self.index.search("animal", offset=1)), 1)
+
+    def test_search_tag(self):
+        """
+        Check that tag searches only match tags.
+        """
+        self.assertEqual({icon.id for icon in self.index.search_tag("farm")}, {"1", "2"})
+        self.assertEqual(len(self.index.search_tag("goat")), 0)
+
+    def test_search_illegal_term(self):
+        """
+        Check that empty terms are rejected, and FTS5 syntax is not interpreted.
+        """
+        with self.assertRaises(IllegalTerm):
+            self.index.search(" ")
+        self.assertEqual(len(self.index.search('goat" OR "cat')), 0)
+
+    def test_add_replaces(self):
+        """
+        Check that adding an icon with a known id replaces it.
+        """
+        self.assertEqual(self.index.add(IconsModel.parse({"icons": [_icon(3, "Dog")]})), 0)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(len(self.index.search("cat")), 0)
+        self.assertEqual(self.index.get(3).term, "Dog")
+
+    def test_refresh(self):
+        """
+        Check that refresh stops paging through recent icons once it encounters an indexed icon.
+        """
+        pages = [IconsModel.parse({"recent_uploads": [_icon(5, "Cow"), _icon(4, "Pig")]}),
+                 IconsModel.parse({"recent_uploads": [_icon(3, "Cat"), _icon(2, "Goat Feeding")]})]
+        api = mock.Mock()
+        api.get_recent_icons.side_effect = pages + [NotFound(None)]
+        self.assertEqual(self.index.refresh(api, limit=2), 2)
+        self.assertEqual(api.get_recent_icons.call_count, 2)
+        self.assertEqual(len(self.index), 5)
+
+if __name__ == "__main__":
+    unittest.main()
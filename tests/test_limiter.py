@@ -0,0 +1,201 @@
+import unittest, time, asyncio, threading
+from unittest import mock
+
+import context
+
+import requests
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.limiter import AdaptiveLimiter
+from TheNounProjectAPI.exceptions import RateLimited
+
+class Limiter(unittest.TestCase):
+
+    def setUp(self):
+        # Round-trip times of a few microseconds vary too much to test latency based decreases here.
+        self.limiter = AdaptiveLimiter(initial_limit=2, max_limit=8, latency_tolerance=float("inf"))
+        self.changes = []
+        self.limiter.listeners.append(lambda limiter, old, new: self.changes.append((old, new)))
+
+    def _fill(self):
+        """
+        Helper function to take all slots of the limiter, returning the tokens.
+        """
+        return [self.limiter.acquire() for _ in range(self.limiter.limit)]
+
+    def test_acquire_timeout(self):
+        """
+        Check that acquire returns None when no slot becomes free within the timeout.
+        """
+        tokens = self._fill()
+        self.assertEqual(self.limiter.in_flight, 2)
+        self.assertIsNone(self.limiter.acquire(timeout=0.01))
+        self.limiter.cancel(tokens[0])
+        self.assertIsNotNone(self.limiter.acquire(timeout=0.01))
+
+    def test_increase(self):
+        """
+        Check that the limit grows by about one per round trip while the limit is used.
+        """
+        for _ in range(4):
+            for token in self._fill():
+                self.limiter.release(token)
+        self.assertEqual(self.limiter.limit, 4)
+        self.assertEqual(self.changes, [(2, 3), (3, 4)])
+
+    def test_no_increase_when_unused(self):
+        """
+        Check that the limit does not grow while fewer than half of the limit are in flight.
+        """
+        self.limiter = AdaptiveLimiter(initial_limit=4, latency_tolerance=float("inf"))
+        for _ in range(10):
+            self.limiter.release(self.limiter.acquire())
+        self.assertEqual(self.limiter.limit, 4)
+
+    def test_decrease(self):
+        """
+        Check that congestion halves the limit once, for all requests in flight when it was detected.
+        """
+        self.limiter = AdaptiveLimiter(initial_limit=8, latency_tolerance=float("inf"))
+        tokens = self._fill()
+        for token in tokens:
+            self.limiter.release(token, congested=True)
+        self.assertEqual(self.limiter.limit, 4)
+        self.limiter.release(self.limiter.acquire(), congested=True)
+        self.assertEqual(self.limiter.limit, 2)
+
+    def test_min_limit(self):
+        """
+        Check that the limit does not drop below min_limit.
+        """
+        for _ in range(5):
+            self.limiter.release(self.limiter.acquire(), congested=True)
+        self.assertEqual(self.limiter.limit, 1)
+
+    def test_latency(self):
+        """
+        Check that round-trip times far above the lowest one decrease the limit.
+        """
+        self.limiter = AdaptiveLimiter(initial_limit=4, smoothing=1.0)
+        now = time.monotonic()
+        self.limiter.release(self.limiter.acquire())
+        self.assertEqual(self.limiter.limit, 4)
+        self.limiter.acquire()
+        self.limiter.release(now - 10)
+        self.assertEqual(self.limiter.limit, 2)
+        self.assertIsNone(self.limiter.rtt)
+
+    def test_wakes_threads(self):
+        """
+        Check that a thread waiting in acquire continues when a slot is released.
+        """
+        tokens = self._fill()
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(self.limiter.acquire(timeout=5)))
+        thread.start()
+        self.limiter.release(tokens[0])
+        thread.join(5)
+        self.assertIsNotNone(acquired[0])
+        self.assertEqual(self.limiter.in_flight, 2)
+
+    def test_acquire_async(self):
+        """
+        Check that asyncio tasks wait without blocking the event loop, and continue when a slot is released.
+        """
+        order = []
+        async def task(name):
+            token = await self.limiter.acquire_async()
+            order.append(name)
+            await asyncio.sleep(0.01)
+            self.limiter.release(token)
+
+        async def main():
+            await asyncio.gather(*(task(i) for i in range(5)))
+
+        asyncio.run(main())
+        self.assertEqual(sorted(order), list(range(5)))
+        self.assertEqual(self.limiter.in_flight, 0)
+
+    def test_acquire_async_cancel(self):
+        """
+        Check that a cancelled waiting task does not take a slot.
+        """
+        self._fill()
+        async def main():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.limiter.acquire_async(), 0.01)
+
+        asyncio.run(main())
+        self.assertEqual(self.limiter.in_flight, 2)
+        self.assertEqual(self.limiter._async_waiters, [])
+
+    def test_listener_uses_limiter(self):
+        """
+        Check that listeners are called without the lock held, so other threads can use the limiter while they run.
+        """
+        self.limiter = AdaptiveLimiter(initial_limit=4, latency_tolerance=float("inf"))
+        tokens = []
+        def listener(limiter, old, new):
+            thread = threading.Thread(target=lambda: tokens.append(limiter.acquire(timeout=1.0)))
+            thread.start()
+            thread.join(0.5)
+        self.limiter.listeners.append(listener)
+        self.limiter.release(self.limiter.acquire(), congested=True)
+        self.assertEqual(self.limiter.limit, 2)
+        self.assertEqual(len(tokens), 1)
+        self.assertIsNotNone(tokens[0])
+
+    def test_repr(self):
+        self.assertEqual(repr(self.limiter), "<AdaptiveLimiter: Limit: 2, In Flight: 0>")
+
+class LimitedAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.limiter = AdaptiveLimiter(initial_limit=4, latency_tolerance=float("inf"))
+        self.api = API("key", "secret", limiter=self.limiter)
+        self.status_code = 200
+        def send(prepared_request, **kwargs):
+            self.assertEqual(self.limiter.in_flight, 1)
+            response = mock.Mock(status_code=self.status_code)
+            response.json.return_value = {"icon": {"id": "1"}}
+            return response
+        self.api._session.send = mock.Mock(side_effect=send)
+
+    def test_property(self):
+        self.assertIs(self.api.limiter, self.limiter)
+        self.assertIsNone(API("key", "secret").limiter)
+
+    def test_success(self):
+        """
+        Check that requests take a slot while they are sent, and free it afterwards.
+        """
+        self.api.get_icon(1)
+        self.assertEqual(self.limiter.in_flight, 0)
+        self.assertEqual(self.limiter.limit, 4)
+
+    def test_rate_limited(self):
+        """
+        Check that rate limited responses decrease the limit.
+        """
+        self.status_code = 429
+        with self.assertRaises(RateLimited):
+            self.api.get_icon(1)
+        self.assertEqual(self.limiter.in_flight, 0)
+        self.assertEqual(self.limiter.limit, 2)
+
+    def test_timeout(self):
+        """
+        Check that timeouts decrease the limit, while other exceptions only free the slot.
+        """
+        self.api._session.send.side_effect = requests.exceptions.ConnectionError()
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.api.get_icon(1)
+        self.assertEqual(self.limiter.limit, 4)
+        self.api._session.send.side_effect = requests.exceptions.ReadTimeout()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.api.get_icon(1)
+        self.assertEqual(self.limiter.in_flight, 0)
+        self.assertEqual(self.limiter.limit, 2)
+
+if __name__ == "__main__":
+    unittest.main()
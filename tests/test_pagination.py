@@ -0,0 +1,120 @@
+import unittest, threading
+from unittest import mock
+from urllib.parse import urlparse, parse_qs
+
+import context
+from context import fake_response
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.pagination import Paginator
+from TheNounProjectAPI.exceptions import ServerException
+
+class Pagination(unittest.TestCase):
+
+    def setUp(self):
+        self.api = API("key", "secret")
+        # The API has 230 icons for the term, and a default page size of 50.
+        self.count = 230
+        self.offsets = []
+        self.lock = threading.Lock()
+        def send(prepared_request, **kwargs):
+            query = parse_qs(urlparse(prepared_request.url).query)
+            limit = int(query.get("limit", ["50"])[0])
+            offset = int(query.get("offset", ["0"])[0]) + int(query.get("page", ["0"])[0]) * limit
+            with self.lock:
+                self.offsets.append(offset)
+            ids = list(range(offset, min(offset + limit, self.count)))
+            if not ids or offset == getattr(self, "failing_offset", None):
+                return fake_response(prepared_request, 500 if ids else 404, content=b"")
+            return fake_response(prepared_request, data={"icons": [{"id": str(_id)} for _id in ids]})
+        self.api._session.send = mock.Mock(side_effect=send)
+
+    def _ids(self, paginator):
+        return [int(icon.id) for icon in paginator]
+
+    def test_all(self):
+        """
+        Check that all results are yielded in order, fetching one page at a time without a limit.
+        """
+        paginator = Paginator(self.api.get_icons_by_term, "goat", max_workers=3)
+        self.assertEqual(self._ids(paginator), list(range(230)))
+        self.assertTrue(paginator.done)
+        self.assertEqual(paginator.offset, 230)
+        self.assertEqual(self.offsets, [0, 50, 100, 150, 200])
+
+    def test_not_found(self):
+        """
+        Check that a NotFound page past the end ends the iteration, when the last page is full.
+        """
+        self.count = 200
+        paginator = Paginator(self.api.get_icons_by_term, "goat", limit=40, max_workers=4)
+        self.assertEqual(self._ids(paginator), list(range(200)))
+        self.assertIn(200, self.offsets)
+
+    def test_total(self):
+        """
+        Check that with a total no pages past it are fetched, and the last page is trimmed.
+        """
+        paginator = Paginator(self.api.get_icons_by_term, "goat", limit=20, total=70, max_workers=8)
+        self.assertEqual(self._ids(paginator), list(range(70)))
+        self.assertEqual(sorted(self.offsets), [0, 20, 40, 60])
+        self.assertEqual(paginator.pages_fetched, 4)
+
+    def test_short_first_page(self):
+        """
+        Check that a short first page is not taken as the page size without a limit, and that no pages are fetched ahead then.
+        """
+        self.count = 10
+        paginator = Paginator(self.api.get_icons_by_term, "goat", max_workers=4)
+        self.assertEqual(self._ids(paginator), list(range(10)))
+        self.assertEqual(self.offsets, [0, 10])
+        self.offsets.clear()
+        paginator = Paginator(self.api.get_icons_by_term, "goat", limit=20, max_workers=4)
+        self.assertEqual(self._ids(paginator), list(range(10)))
+        self.assertEqual(self.offsets, [0])
+
+    def test_offset_page(self):
+        """
+        Check that offset and page both skip results consistently, and the following pages are fetched by offset.
+        """
+        self.assertEqual(self._ids(Paginator(self.api.get_icons_by_term, "goat", limit=50, page=2)), list(range(100, 230)))
+        self.assertEqual(self._ids(Paginator(self.api.get_icons_by_term, "goat", limit=50, offset=125)), list(range(125, 230)))
+        self.offsets.clear()
+        self.assertEqual(self._ids(Paginator(self.api.get_icons_by_term, "goat", limit=25, offset=10, page=4)), list(range(110, 230)))
+        for call in self.api._session.send.call_args_list[-len(self.offsets) + 1:]:
+            self.assertNotIn("page=", call.args[0].url)
+
+    def test_cursor(self):
+        """
+        Check that a paginator continues with the next page after it was partially consumed.
+        """
+        paginator = Paginator(self.api.get_icons_by_term, "goat", limit=100)
+        pages = paginator.pages()
+        self.assertEqual(len(next(pages)), 100)
+        pages.close()
+        self.assertEqual(paginator.offset, 100)
+        self.assertFalse(paginator.done)
+        self.assertEqual(self._ids(paginator), list(range(100, 230)))
+
+    def test_error(self):
+        """
+        Check that other errors are raised after the pages before them were yielded.
+        """
+        self.failing_offset = 100
+        paginator = Paginator(self.api.get_icons_by_term, "goat", limit=50)
+        ids = []
+        with self.assertRaises(ServerException):
+            for icon in paginator:
+                ids.append(int(icon.id))
+        self.assertEqual(ids, list(range(100)))
+        self.assertEqual(paginator.offset, 100)
+
+    def test_empty(self):
+        self.count = 0
+        paginator = Paginator(self.api.get_icons_by_term, "goat")
+        self.assertEqual(list(paginator), [])
+        self.assertTrue(paginator.done)
+        self.assertEqual(repr(paginator), "<Paginator: get_icons_by_term, Offset: 0, Done: True>")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+import context
+
+from TheNounProjectAPI.api import API
+
+class Prepare(unittest.TestCase):
+
+    def setUp(self):
+        key = "mock api key to satisfy type check in api._get_oauth()"
+        secret = "mock secret key to satisfy type check in api._get_oauth()"
+        self.api = API(key, secret, testing=True)
+
+    def assertSamePrepared(self, url, **params):
+        """
+        Check that the fast path prepares the same request as the session.
+        """
+        self.api._method = "GET"
+        self.api._session.auth = self.api._get_oauth()
+        fast = self.api._prepare_get(url, params)
+        slow = self.api._prepare_request(url, params)
+        self.assertEqual(fast.method, slow.method)
+        self.assertEqual(fast.url, slow.url)
+        self.assertEqual(fast.body, slow.body)
+        self.assertEqual({k: v for k, v in fast.headers.items() if k != "Authorization"},
+                         {k: v for k, v in slow.headers.items() if k != "Authorization"})
+        self.assertEqual(fast.headers["Authorization"].split(b"oauth_nonce")[0], slow.headers["Authorization"].split(b"oauth_nonce")[0])
+        self.assertIn(b"oauth_signature=", fast.headers["Authorization"])
+        self.assertEqual(fast.hooks, slow.hooks)
+
+    def test_same(self):
+        """
+        Check that the fast path prepares the same requests as the session, for several endpoints and parameters.
+        """
+        self.assertSamePrepared("http://api.thenounproject.com/icon/12")
+        self.assertSamePrepared("http://api.thenounproject.com/collection/cue/icons", limit=5, offset=None, page=2)
+        self.assertSamePrepared("http://api.thenounproject.com/icons/goat", limit_to_public_domain=True, limit=None)
+        self.assertSamePrepared("https://localhost:8080/user/12/collections/my-slug_1.0")
+
+    def test_cookies(self):
+        """
+        Check that cookies set on the session are sent by the fast path, like by the session.
+        """
+        self.api._session.cookies.set("visitor", "1", domain="api.thenounproject.com")
+        self.assertSamePrepared("http://api.thenounproject.com/icon/12")
+        self.assertIn(b"visitor=1", self.api.get_icon(12).headers["Cookie"])
+
+    def test_fast_path(self):
+        """
+        Check which URLs are prepared by the fast path.
+        """
+        self.api._prepare_request = mock.Mock(wraps=self.api._prepare_request)
+        self.api.get_icon(12)
+        self.api.get_collection_icons("cue", limit=5)
+        self.api.get_usage()
+        self.assertEqual(self.api._prepare_request.call_count, 0)
+
+        # URLs which requests would change, and POST requests, are prepared by the session.
+        prepared = self.api.get_icons_by_term("two words")
+        self.assertTrue(prepared.url.startswith("http://api.thenounproject.com/icons/two%20words?"))
+        self.api.get_icons_by_term("50%")
+        self.api.report_usage([12])
+        self.assertEqual(self.api._prepare_request.call_count, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest, os, sys, json, pstats, tempfile, subprocess
+from unittest import mock
+
+import context
+from context import fake_send
+
+from TheNounProjectAPI import profiling
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.cache import MemoryCache
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+_send = fake_send({"icon": {"id": "1"}, "icons": [{"id": "1"}, {"id": "2"}]})
+
+class Profiling(unittest.TestCase):
+
+    def setUp(self):
+        self.api = API("key", "secret")
+        self.api._session.send = mock.Mock(side_effect=_send)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(profiling.disable)
+
+    def test_disabled(self):
+        """
+        Check that no calls are profiled by default.
+        """
+        self.assertIsNone(profiling.active)
+        with mock.patch("cProfile.Profile") as profile:
+            self.api.get_icon(1)
+        profile.assert_not_called()
+
+    def test_sampling(self):
+        """
+        Check that 1 in sample_every calls is profiled, and the stages are measured per endpoint.
+        """
+        profiler = profiling.enable(sample_every=3, directory=self.directory.name)
+        # Calls 0 and 3 are profiled, call 5 is not.
+        for _ in range(5):
+            self.api.get_icon(1)
+        self.api.get_icons_by_term("goat")
+        self.assertEqual(profiler.endpoints, ["get_icon_by_id"])
+        self.assertEqual(profiler._calls["get_icon_by_id"], 2)
+        self.assertEqual(list(profiler.stages("get_icon_by_id")), ["prepare", "send", "decode", "parse"])
+        self.assertIn("get_icon_by_id (2 calls): prepare", profiler.summary())
+        self.assertEqual(repr(profiler), "<EndpointProfiler: 1 in 3, Profiled: 2>")
+
+    def test_cache_stage(self):
+        """
+        Check that calls answered from the cache have a cache stage, and no send stage.
+        """
+        api = API("key", "secret", cache=MemoryCache())
+        api._session.send = mock.Mock(side_effect=_send)
+        api.get_icon(1)
+        profiler = profiling.enable(sample_every=1)
+        api.get_icon(1)
+        self.assertEqual(list(profiler.stages("get_icon_by_id")), ["prepare", "cache"])
+
+    def test_dump_pstats(self):
+        """
+        Check that the aggregated profiles are written in the pstats format, with the stage times.
+        """
+        profiler = profiling.enable(sample_every=1, directory=self.directory.name)
+        self.api.get_icon(1)
+        self.api.get_icons_by_term("goat")
+        paths = profiler.dump()
+        self.assertEqual([os.path.basename(path) for path in paths], ["get_icon_by_id.pstats", "get_icons_by_term.pstats", "stages.json"])
+        stats = pstats.Stats(paths[0])
+        self.assertTrue(any(function[2] == "_send" for function in stats.stats))
+        with open(paths[2]) as f:
+            self.assertEqual(json.load(f)["get_icons_by_term"]["calls"], 1)
+
+    def test_dump_speedscope(self):
+        """
+        Check that the profiles are written in the speedscope format, with stacks of valid frames.
+        """
+        profiler = profiling.enable(sample_every=1, directory=self.directory.name, format=profiling.SPEEDSCOPE)
+        self.api.get_icon(1)
+        path, _ = profiler.dump()
+        with open(path) as f:
+            data = json.load(f)
+        profile, = data["profiles"]
+        self.assertEqual(profile["type"], "sampled")
+        self.assertEqual(len(profile["samples"]), len(profile["weights"]))
+        self.assertTrue(all(0 <= frame < len(data["shared"]["frames"]) for sample in profile["samples"] for frame in sample))
+        self.assertIn("_send", {frame["name"] for frame in data["shared"]["frames"]})
+
+    def test_format(self):
+        with self.assertRaises(ValueError):
+            profiling.enable(format="html")
+
+    def test_environment(self):
+        """
+        Check that TNP_PROFILE enables profiling, and the profiles are dumped at exit.
+        """
+        statement = ("from unittest import mock; from context import fake_send; from TheNounProjectAPI.api import API; api = API('key', 'secret'); "
+                     "api._session.send = mock.Mock(side_effect=fake_send({'icon': {'id': '1'}})); [api.get_icon(1) for _ in range(4)]")
+        env = dict(os.environ, TNP_PROFILE="2", TNP_PROFILE_DIR=self.directory.name)
+        subprocess.run([sys.executable, "-c", statement], cwd=os.path.dirname(__file__), env=env, check=True)
+        with open(os.path.join(self.directory.name, "stages.json")) as f:
+            self.assertEqual(json.load(f)["get_icon_by_id"]["calls"], 2)
+
+    def test_environment_invalid_format(self):
+        """
+        Check that an invalid TNP_PROFILE_FORMAT warns and leaves profiling disabled, instead of failing the import.
+        """
+        statement = "from TheNounProjectAPI import profiling; print(profiling.active)"
+        env = dict(os.environ, TNP_PROFILE="2", TNP_PROFILE_DIR=self.directory.name, TNP_PROFILE_FORMAT="html")
+        result = subprocess.run([sys.executable, "-c", statement], cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), "None")
+        self.assertIn("TNP_PROFILE_FORMAT", result.stderr)
+        self.assertFalse(os.listdir(self.directory.name))
+
+if __name__ == "__main__":
+    unittest.main()
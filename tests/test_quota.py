@@ -0,0 +1,142 @@
+import unittest, time
+from unittest import mock
+
+import context
+from context import fake_send
+
+import requests
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.models import UsageModel
+from TheNounProjectAPI.quota import QuotaTracker, main
+
+def _usage(hourly, daily=0, monthly=0):
+    """
+    Helper function returning a UsageModel as if it was returned by get_usage.
+    """
+    return UsageModel.parse({"limits": {"hourly": 100, "daily": None, "monthly": 5000},
+                             "usage": {"hourly": hourly, "daily": daily, "monthly": monthly}})
+
+class Quota(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = QuotaTracker(window=60.0)
+        self.usage = {"hourly": 10, "daily": 20, "monthly": 30}
+        self.api = API("key", "secret", quota_tracker=self.tracker)
+        self.api._session.send = mock.Mock(side_effect=fake_send(lambda prepared_request: {
+            "icon": {"id": "1"}, "collection": {"id": "1"}, "limits": {"hourly": 100, "daily": None, "monthly": 5000}, "usage": self.usage}))
+
+    def test_counts(self):
+        """
+        Check that requests are counted per endpoint, including errors.
+        """
+        self.api.get_icon(1)
+        self.api.get_icon_by_id(2)
+        self.api.get_collection("cue")
+        with self.assertRaises(Exception):
+            self.api.get_collection_by_slug("missing")
+        self.assertEqual(self.tracker.counts, {"get_icon_by_id": 2, "get_collection_by_slug": 2})
+        self.assertEqual(self.tracker.errors, {"get_collection_by_slug": 1})
+        self.assertIs(self.api.quota_tracker, self.tracker)
+
+    def test_projection(self):
+        """
+        Check that the usage is estimated from the last snapshot plus the requests sent since,
+        and that only periods with a limit are projected.
+        """
+        self.assertEqual(self.tracker.projections(), {})
+        self.tracker.refresh(self.api)
+        for _ in range(5):
+            self.api.get_icon(1)
+        projections = self.tracker.projections()
+        self.assertEqual(set(projections), {"hourly", "monthly"})
+        hourly = projections["hourly"]
+        self.assertEqual((hourly.used, hourly.limit, hourly.remaining), (15, 100, 85))
+        self.assertGreater(hourly.rate, 0)
+        self.assertAlmostEqual(hourly.exhausted_in, 85 / hourly.rate)
+        self.assertEqual(self.tracker.counts["get_usage"], 1)
+
+    def test_rate_after_start(self):
+        """
+        Check that requests sent right after the tracker was created are spread over at least a second.
+        """
+        for _ in range(5):
+            self.tracker.record("get_icon_by_id", 200)
+        self.assertLessEqual(self.tracker.rate(), 5.0)
+        tracker = QuotaTracker(window=0.5)
+        tracker.record("get_icon_by_id", 200)
+        self.assertAlmostEqual(tracker.rate(), 2.0, delta=0.1)
+
+    def test_snapshot_rate(self):
+        """
+        Check that the rate between two snapshots is used when it is higher than the local rate,
+        unless the period was reset between them.
+        """
+        with mock.patch("time.monotonic", side_effect=[1000.0, 1010.0, 1010.0]):
+            self.tracker.add_snapshot(_usage(10, monthly=100))
+            self.tracker.add_snapshot(_usage(60, monthly=50))
+            projections = self.tracker.projections()
+        self.assertAlmostEqual(projections["hourly"].rate, 5.0)
+        self.assertAlmostEqual(projections["hourly"].exhausted_in, 8.0)
+        self.assertEqual(projections["monthly"].rate, 0)
+        self.assertIsNone(projections["monthly"].exhausted_in)
+
+    def test_exhausted(self):
+        """
+        Check that a limit which has been reached is projected to be hit immediately.
+        """
+        self.tracker.add_snapshot(_usage(100))
+        self.assertEqual(self.tracker.projections()["hourly"].exhausted_in, 0)
+        self.assertIn("limit reached", self.tracker.summary())
+
+    def test_summary(self):
+        self.assertIn("No usage snapshot", self.tracker.summary())
+        self.tracker.refresh(self.api)
+        self.api.get_icon(1)
+        summary = self.tracker.summary()
+        self.assertIn("Hourly", summary)
+        self.assertIn("get_icon_by_id", summary)
+        self.assertEqual(repr(self.tracker), "<QuotaTracker: Requests: 2, Snapshots: 1>")
+
+    def test_background(self):
+        """
+        Check that start takes a snapshot immediately, and stop ends the thread.
+        """
+        self.tracker.start(self.api, interval=60.0)
+        self.tracker.stop()
+        self.assertEqual(self.tracker.counts["get_usage"], 1)
+        self.assertIn("hourly", self.tracker.projections())
+
+    def test_background_errors(self):
+        """
+        Check that a failed refresh, eg. a connection error, is stored in last_error without ending the thread.
+        """
+        errors = []
+        refresh = self.tracker.refresh
+        def flaky_refresh(api):
+            if not errors:
+                errors.append(requests.exceptions.ConnectionError("refused"))
+                raise errors[0]
+            self.assertIs(self.tracker.last_error, errors[0])
+            return refresh(api)
+        self.tracker.refresh = flaky_refresh
+        self.tracker.start(self.api, interval=0.01)
+        for _ in range(100):
+            if self.tracker.projections():
+                break
+            time.sleep(0.01)
+        self.tracker.stop()
+        self.assertIn("hourly", self.tracker.projections())
+        self.assertIsNone(self.tracker.last_error)
+
+    def test_main(self):
+        """
+        Check that the command line entry point prints a summary, and fails if a limit has been reached.
+        """
+        self.usage = {"hourly": 100}
+        with mock.patch("requests.Session.send", side_effect=self.api._session.send.side_effect), mock.patch("sys.stdout") as stdout:
+            self.assertEqual(main(["--key", "key", "--secret", "secret"]), 1)
+        self.assertIn("Hourly", "".join(call.args[0] for call in stdout.write.call_args_list))
+
+if __name__ == "__main__":
+    unittest.main()
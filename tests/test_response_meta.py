@@ -0,0 +1,92 @@
+import unittest, pickle, datetime
+from unittest import mock
+
+import context
+from context import fake_response
+
+import requests
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.cache import MemoryCache
+from TheNounProjectAPI.models import ResponseMeta
+from TheNounProjectAPI.exceptions import NotFound
+
+def _response(prepared_request, status_code=200, data=None):
+    """
+    Helper function to create a requests.Response with the reason, elapsed time and headers of a real one.
+    """
+    response = fake_response(prepared_request, status_code, data, reason="OK" if status_code == 200 else "Not Found",
+                             elapsed=datetime.timedelta(milliseconds=120))
+    response.headers["Content-Type"] = "application/json"
+    response.headers["Set-Cookie"] = "session=secret"
+    return response
+
+class ResponseMetaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.key = "mock api key to satisfy type check in api._get_oauth()"
+        self.secret = "mock secret key to satisfy type check in api._get_oauth()"
+        self.status_code = 200
+
+    def api(self, **kwargs) -> API:
+        api = API(self.key, self.secret, **kwargs)
+        api._send = mock.Mock(side_effect=lambda prepared_request: _response(prepared_request, self.status_code, {"icon": {"id": "12"}, "icons": [{"id": "12"}]}))
+        return api
+
+    def test_default_without_cache(self):
+        """
+        Check that models keep the full response without a cache.
+        """
+        self.assertIsInstance(self.api().get_icon(12).response, requests.Response)
+
+    def test_default_with_cache(self):
+        """
+        Check that models only keep the metadata of the response with a cache.
+        """
+        api = self.api(cache=MemoryCache())
+        icon = api.get_icon(12)
+        meta = icon.response
+        self.assertIsInstance(meta, ResponseMeta)
+        self.assertEqual(meta.status_code, 200)
+        self.assertEqual(meta.reason, "OK")
+        self.assertTrue(meta.ok)
+        self.assertEqual(meta.url, "http://api.thenounproject.com/icon/12")
+        self.assertEqual(meta.elapsed, datetime.timedelta(milliseconds=120))
+        self.assertEqual(meta.headers["content-type"], "application/json")
+        self.assertNotIn("Set-Cookie", meta.headers)
+        self.assertEqual(repr(meta), "<Response [200]>")
+        self.assertIsInstance(api.get_icons_by_term("goat").response, ResponseMeta)
+
+    def test_override(self):
+        """
+        Check that retain_response overrides the default in both directions.
+        """
+        self.assertIsInstance(self.api(cache=MemoryCache(), retain_response=True).get_icon(12).response, requests.Response)
+        self.assertIsInstance(self.api(retain_response=False).get_icon(12).response, ResponseMeta)
+
+    def test_negative_entry(self):
+        """
+        Check that cached exceptions keep the metadata, and are raised with the same message.
+        """
+        self.status_code = 404
+        cache = MemoryCache()
+        api = self.api(cache=cache)
+        with self.assertRaises(NotFound) as first:
+            api.get_icon(12)
+        with self.assertRaises(NotFound) as second:
+            api.get_icon(12)
+        self.assertEqual(str(first.exception), str(second.exception))
+        self.assertIsInstance(cache.get(cache.key(api._send.call_args[0][0])).response, ResponseMeta)
+        self.assertEqual(api._send.call_count, 1)
+
+    def test_pickle(self):
+        """
+        Check that the metadata can be pickled.
+        """
+        icon = self.api(retain_response=False).get_icon(12)
+        meta = pickle.loads(pickle.dumps(icon.response))
+        self.assertEqual(meta.status_code, 200)
+        self.assertEqual(meta.headers["Content-Type"], "application/json")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest, threading, time
+from unittest import mock
+
+import context
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.scheduler import Scheduler, Lane, INTERACTIVE, BATCH
+from TheNounProjectAPI.exceptions import RequestDropped
+
+class Schedule(unittest.TestCase):
+
+    def _acquire_in_thread(self, scheduler, lane_name, order):
+        """
+        Helper function to acquire a slot in a thread, and append the lane name to order once acquired.
+        """
+        def run():
+            lane = scheduler.acquire(lane_name)
+            order.append(lane_name)
+            scheduler.release(lane)
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    def _wait_until_waiting(self, scheduler, lane_name, count):
+        """
+        Helper function to wait until count requests are waiting in a lane.
+        """
+        for _ in range(200):
+            if scheduler.lanes[lane_name].waiting == count:
+                return
+            time.sleep(0.005)
+        self.fail(f"{count} requests never waited in lane {lane_name}")
+
+    def test_interactive_first(self):
+        """
+        Check that a waiting interactive request is sent before batch requests which waited longer.
+        """
+        scheduler = Scheduler(max_concurrency=1)
+        lane = scheduler.acquire(INTERACTIVE)
+        order = []
+        batch = self._acquire_in_thread(scheduler, BATCH, order)
+        self._wait_until_waiting(scheduler, BATCH, 1)
+        interactive = self._acquire_in_thread(scheduler, INTERACTIVE, order)
+        self._wait_until_waiting(scheduler, INTERACTIVE, 1)
+        scheduler.release(lane)
+        batch.join()
+        interactive.join()
+        self.assertEqual(order, [INTERACTIVE, BATCH])
+
+    def test_batch_cap(self):
+        """
+        Check that the batch lane cannot take all slots, leaving room for interactive requests.
+        """
+        scheduler = Scheduler(max_concurrency=4, lanes=[Lane(INTERACTIVE, 0, 4), Lane(BATCH, 1, 2, max_wait=0.05)])
+        scheduler.acquire(BATCH)
+        scheduler.acquire(BATCH)
+        with self.assertRaises(RequestDropped):
+            scheduler.acquire(BATCH)
+        self.assertEqual(scheduler.lanes[BATCH].dropped, 1)
+        scheduler.acquire(INTERACTIVE)
+        self.assertEqual(scheduler.lanes[INTERACTIVE].in_flight, 1)
+
+    def test_timeout(self):
+        """
+        Check that requests are dropped after timeout, even in lanes without max_wait.
+        """
+        scheduler = Scheduler(max_concurrency=1)
+        scheduler.acquire(INTERACTIVE)
+        with self.assertRaises(RequestDropped):
+            scheduler.acquire(INTERACTIVE, timeout=0.01)
+        self.assertEqual(scheduler.lanes[INTERACTIVE].waiting, 0)
+
+    def test_lane_context(self):
+        """
+        Check that Scheduler.lane overrides the lane of the request.
+        """
+        scheduler = Scheduler()
+        with Scheduler.lane(BATCH):
+            with scheduler.slot(INTERACTIVE) as lane:
+                self.assertEqual(lane.name, BATCH)
+        with scheduler.slot(INTERACTIVE) as lane:
+            self.assertEqual(lane.name, INTERACTIVE)
+
+    def test_api(self):
+        """
+        Check that requests of an API object are sent in its lane.
+        """
+        scheduler = Scheduler()
+        api = API("key", "secret", scheduler=scheduler, lane=BATCH)
+        lanes = []
+        def send(prepared_request, **kwargs):
+            lanes.append({name: lane.in_flight for name, lane in scheduler.lanes.items()})
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"icon": {"id": "1"}}
+            return response
+        api._session.send = mock.Mock(side_effect=send)
+        api.get_icon(1)
+        self.assertEqual(lanes, [{INTERACTIVE: 0, BATCH: 1}])
+        self.assertEqual(scheduler.lanes[BATCH].in_flight, 0)
+
+if __name__ == "__main__":
+    unittest.main()
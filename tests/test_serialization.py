@@ -0,0 +1,100 @@
+import unittest, json, pickle
+from unittest import mock
+
+import context
+from context import fake_response
+
+from TheNounProjectAPI import models
+from TheNounProjectAPI.models import IconModel, IconsModel, CollectionModel, CollectionsModel, UsageModel
+
+class Serialization(unittest.TestCase):
+
+    def setUp(self):
+        self.icon_data = {"id": "12", "term": "Goat", "tags": [{"id": 1, "slug": "goat"}], "uploader": {"name": "Jane"}}
+        self.response = fake_response(data={"icon": self.icon_data})
+        self.icons_data = {"generated_at": "Mon, 23 Sep 2019 12:00:00 GMT", 
+                           "recent_uploads": [self.icon_data, dict(self.icon_data, id="13")]}
+
+    def test_model(self):
+        """
+        Check that a Model round-trips through bytes without its response.
+        """
+        icon = IconModel.parse({"icon": self.icon_data}, self.response)
+        copy = IconModel.from_bytes(icon.to_bytes())
+        self.assertIsInstance(copy, IconModel)
+        self.assertEqual(copy.json, icon.json)
+        self.assertEqual(copy.tags[0].slug, "goat")
+        self.assertIsNone(copy.response)
+
+    def test_model_list(self):
+        """
+        Check that a ModelList round-trips through bytes with its list-level attributes, but without its response.
+        """
+        icons = IconsModel.parse(self.icons_data, self.response)
+        copy = IconsModel.from_bytes(icons.to_bytes())
+        self.assertIsInstance(copy, IconsModel)
+        self.assertEqual([icon.json for icon in copy], [icon.json for icon in icons])
+        self.assertTrue(all(isinstance(icon, IconModel) for icon in copy))
+        self.assertEqual(copy.generated_at, icons.generated_at)
+        self.assertEqual(len(copy.icons), 2)
+        self.assertIsNone(copy.response)
+
+    def test_other_models(self):
+        """
+        Check that the collection and usage models round-trip through bytes.
+        """
+        collection = CollectionModel.parse({"collection": {"id": "220", "slug": "arrows-1"}})
+        self.assertEqual(CollectionModel.from_bytes(collection.to_bytes()).slug, "arrows-1")
+        collections = CollectionsModel.parse({"collections": [{"id": "220"}, {"id": "221"}]})
+        self.assertEqual([c.id for c in CollectionsModel.from_bytes(collections.to_bytes())], ["220", "221"])
+        usage = UsageModel.parse({"limits": {"daily": 5000}, "usage": {"daily": 1}})
+        self.assertEqual(UsageModel.from_bytes(usage.to_bytes()).usage.daily, 1)
+
+    def test_empty_list(self):
+        """
+        Check that an empty ModelList round-trips through bytes.
+        """
+        copy = IconsModel.from_bytes(IconsModel().to_bytes())
+        self.assertIsInstance(copy, IconsModel)
+        self.assertEqual(len(copy), 0)
+
+    def test_smaller_than_pickle(self):
+        """
+        Check that the bytes are smaller than a pickle of the model with its response.
+        """
+        icons = IconsModel.parse(self.icons_data, self.response)
+        self.assertLess(len(icons.to_bytes()), len(pickle.dumps(icons)))
+
+    def test_pickle(self):
+        """
+        Check that models can still be pickled, eg. to pass them between processes.
+        """
+        icons = pickle.loads(pickle.dumps(IconsModel.parse(self.icons_data)))
+        self.assertEqual(icons[1].id, "13")
+        self.assertEqual(icons.generated_at, self.icons_data["generated_at"])
+
+    def test_json_fallback(self):
+        """
+        Check that json is used without msgpack, and that json data can be read either way.
+        """
+        icons = IconsModel.parse(self.icons_data, self.response)
+        with mock.patch.object(models, "msgpack", None):
+            data = icons.to_bytes()
+            self.assertEqual(json.loads(data)["icons"][0]["id"], "12")
+            self.assertEqual(IconsModel.from_bytes(data).generated_at, icons.generated_at)
+        self.assertEqual(IconsModel.from_bytes(data).generated_at, icons.generated_at)
+
+    @unittest.skipIf(models.msgpack is None, "msgpack is not installed")
+    def test_msgpack(self):
+        """
+        Check that msgpack is used if it is installed, and that reading it without msgpack raises ImportError.
+        """
+        icon = IconModel.parse({"icon": self.icon_data})
+        data = icon.to_bytes()
+        self.assertEqual(models.msgpack.unpackb(data, raw=False), self.icon_data)
+        with mock.patch.object(models, "msgpack", None):
+            with self.assertRaises(ImportError):
+                IconModel.from_bytes(data)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest, os, tempfile, subprocess, sys
+from unittest import mock
+
+import context
+from context import fake_send
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.shared import SharedModelStore
+from TheNounProjectAPI.models import IconModel, CollectionModel
+
+class Shared(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "models.shm")
+        self.icons = [IconModel.parse({"id": str(_id), "term": "Goat", "tags": [{"slug": "goat"}]}) for _id in (12, 13)]
+        self.collections = [CollectionModel.parse({"collection": {"id": "220", "slug": "arrows-1", "name": "Arrows-1"}})]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read(self):
+        """
+        Check that icons are read by id, and collections by id and slug.
+        """
+        SharedModelStore.write(self.path, self.icons, self.collections)
+        store = SharedModelStore(self.path)
+        self.assertEqual(len(store), 3)
+        icon = store.get_icon(12)
+        self.assertIsInstance(icon, IconModel)
+        self.assertEqual(icon.json, self.icons[0].json)
+        self.assertEqual(icon.tags[0].slug, "goat")
+        self.assertEqual(store.get_collection("arrows-1").name, "Arrows-1")
+        self.assertIsInstance(store.get_collection(220), CollectionModel)
+        self.assertIn(("icon", "13"), store)
+        self.assertNotIn(("icon", 14), store)
+        with self.assertRaises(KeyError):
+            store.get_icon(14)
+        store.close()
+
+    def test_refresh(self):
+        """
+        Check that readers keep the mapped file until refresh, and then read the new file.
+        """
+        SharedModelStore.write(self.path, self.icons[:1])
+        store = SharedModelStore(self.path)
+        self.assertFalse(store.refresh())
+        SharedModelStore.write(self.path, self.icons[1:])
+        self.assertEqual(store.get_icon(12).id, "12")
+        self.assertTrue(store.refresh())
+        self.assertNotIn(("icon", 12), store)
+        self.assertEqual(store.get_icon(13).id, "13")
+        store.close()
+
+    def test_versions(self):
+        """
+        Check that writes never replace a data file, and only keep the current and the previous version.
+        """
+        for count in range(1, 5):
+            SharedModelStore.write(self.path, self.icons[:count % 2 + 1])
+            versions = sorted(name for name in os.listdir(self.directory.name) if name.startswith("models.shm."))
+            self.assertEqual(versions, [f"models.shm.{version}" for version in range(max(count - 1, 1), count + 1)])
+        store = SharedModelStore(self.path)
+        self.assertEqual(len(store), 1)
+        self.assertFalse(store.refresh())
+        store.close()
+
+    def test_not_a_store(self):
+        """
+        Check that other files are refused.
+        """
+        with open(self.path, "wb") as f:
+            f.write(b"\x00" * 64)
+        with self.assertRaises(ValueError):
+            SharedModelStore(self.path)
+
+    def test_other_process(self):
+        """
+        Check that another process reads the models written by this process.
+        """
+        SharedModelStore.write(self.path, self.icons, self.collections)
+        code = ("import sys; sys.path.insert(0, sys.argv[1]); from TheNounProjectAPI.shared import SharedModelStore; "
+                "store = SharedModelStore(sys.argv[2]); print(store.get_icon(13).term, store.get_collection('arrows-1').id)")
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        output = subprocess.check_output([sys.executable, "-c", code, root, self.path])
+        self.assertEqual(output.split(), [b"Goat", b"220"])
+
+    def test_build(self):
+        """
+        Check that build fills the store through the endpoints of the API.
+        """
+        key = "mock api key to satisfy type check in api._get_oauth()"
+        secret = "mock secret key to satisfy type check in api._get_oauth()"
+        api = API(key, secret)
+        def data(prepared_request):
+            if "/icon/" in prepared_request.url:
+                return {"icon": {"id": prepared_request.url.rsplit("/", 1)[-1]}}
+            return {"collection": {"id": "1", "slug": "cue"}}
+        api._send = mock.Mock(side_effect=fake_send(data))
+        store = SharedModelStore.build(api, self.path, icon_ids=[12, 24014], collection_slugs=["cue"])
+        self.assertEqual(store.get_icon(24014).id, "24014")
+        self.assertEqual(store.get_collection(1).slug, "cue")
+        self.assertEqual(api._send.call_count, 3)
+        store.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+import context
+
+from TheNounProjectAPI.spill import SpillingModelList, SpillingIconsModel, SpillingCollectionsModel
+from TheNounProjectAPI.models import IconModel, IconsModel, CollectionModel
+
+def _icons(start, count):
+    """
+    Helper function to create a page of icons as if it was returned by get_icons_by_term.
+    """
+    return IconsModel.parse({"generated_at": "now", "icons": [{"id": str(_id), "term": "Goat"} for _id in range(start, start + count)]})
+
+class Spill(unittest.TestCase):
+
+    def test_budget(self):
+        """
+        Check that models past the budget are spilled, and that len, iteration and indexing include them.
+        """
+        icons = SpillingIconsModel(max_in_memory=5)
+        for start in range(0, 12, 4):
+            icons.extend(_icons(start, 4))
+        icons.append(IconModel.parse({"id": "12"}))
+        self.assertEqual(len(icons), 13)
+        self.assertEqual(icons.spilled, 8)
+        self.assertEqual(list.__len__(icons), 5)
+        self.assertEqual([icon.id for icon in icons], [str(_id) for _id in range(13)])
+        self.assertIsInstance(icons[7], IconModel)
+        self.assertEqual(icons[7].term, "Goat")
+        self.assertEqual(icons[-1].id, "12")
+        self.assertEqual([icon.id for icon in icons[3:9:2]], ["3", "5", "7"])
+        self.assertEqual([icon.id for icon in reversed(icons)][:2], ["12", "11"])
+        with self.assertRaises(IndexError):
+            icons[13]
+        self.assertIn("5 in memory, 8 spilled", repr(icons))
+        icons.close()
+
+    def test_parse(self):
+        """
+        Check that parse keeps the list-level attributes, but not the raw data of all models.
+        """
+        icons = SpillingIconsModel.parse({"generated_at": "now", "recent_uploads": [{"id": str(_id)} for _id in range(3)]})
+        self.assertIsInstance(icons, IconsModel)
+        self.assertEqual(icons.generated_at, "now")
+        self.assertEqual(len(icons), 3)
+        self.assertNotIn("icons", vars(icons))
+        collections = SpillingCollectionsModel.parse({"collections": [{"id": "1"}, {"id": "2"}]})
+        self.assertIsInstance(collections[1], CollectionModel)
+
+    def test_to_bytes(self):
+        """
+        Check that spilled models are included when serialising.
+        """
+        icons = SpillingIconsModel(_icons(0, 4), max_in_memory=2)
+        icons.generated_at = "now"
+        copy = IconsModel.from_bytes(icons.to_bytes())
+        self.assertEqual([icon.id for icon in copy], ["0", "1", "2", "3"])
+        self.assertEqual(copy.generated_at, "now")
+
+    def test_unsupported(self):
+        """
+        Check that operations which would only apply to the models in memory are refused.
+        """
+        icons = SpillingModelList(_icons(0, 4), max_in_memory=2)
+        for operation in (lambda: icons.insert(0, icons[0]), icons.pop, icons.sort, lambda: icons.__setitem__(0, icons[1])):
+            with self.assertRaises(TypeError):
+                operation()
+        self.assertEqual(len(icons), 4)
+
+    def test_clear(self):
+        """
+        Check that clear removes the models in memory and on disk, after which the list can be filled again.
+        """
+        icons = SpillingIconsModel(_icons(0, 4), max_in_memory=2)
+        icons.clear()
+        self.assertEqual(len(icons), 0)
+        self.assertFalse(icons)
+        icons.extend(_icons(10, 3))
+        self.assertEqual([icon.id for icon in icons], ["10", "11", "12"])
+        self.assertEqual(icons.spilled, 1)
+
+if __name__ == "__main__":
+    unittest.main()
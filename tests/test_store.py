@@ -0,0 +1,153 @@
+import unittest, os, time, tempfile
+from unittest import mock
+
+import context
+
+from TheNounProjectAPI.store import AssetStore
+
+class Store(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = AssetStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_put_open(self):
+        """
+        Check that stored content can be read back through a read-only view.
+        """
+        self.store.put(1, "preview_url", b"png 1")
+        view = self.store.open(1, "preview_url")
+        self.assertEqual(bytes(view), b"png 1")
+        self.assertTrue(view.readonly)
+        self.assertIn((1, "preview_url"), self.store)
+        self.assertNotIn((1, "icon_url"), self.store)
+
+    def test_open_missing(self):
+        """
+        Check that opening an asset which was never stored raises KeyError.
+        """
+        with self.assertRaises(KeyError):
+            self.store.open(1, "preview_url")
+
+    def test_deduplication(self):
+        """
+        Check that identical content is stored as a single blob, and only removed once unreferenced.
+        """
+        self.store.put(1, "preview_url", b"same")
+        self.store.put(2, "preview_url", b"same")
+        self.assertEqual(self.store.path(1, "preview_url"), self.store.path(2, "preview_url"))
+        self.assertEqual(self.store.size, 4)
+
+        self.store.delete(1, "preview_url")
+        self.assertTrue(os.path.exists(self.store.path(2, "preview_url")))
+        path = self.store.path(2, "preview_url")
+        self.store.delete(2, "preview_url")
+        self.assertFalse(os.path.exists(path))
+
+    def test_overwrite(self):
+        """
+        Check that storing other content under an existing key removes the old blob, unless another key refers to it.
+        """
+        self.store.put(1, "preview_url", b"old")
+        old_path = self.store.path(1, "preview_url")
+        self.store.put(1, "preview_url", b"new")
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(bytes(self.store.open(1, "preview_url")), b"new")
+
+        self.store.put(2, "preview_url", b"new")
+        self.store.put(1, "preview_url", b"newer")
+        self.assertTrue(os.path.exists(self.store.path(2, "preview_url")))
+        self.assertEqual(self.store.size, len(b"new") + len(b"newer"))
+
+    def test_index_persisted(self):
+        """
+        Check that a new AssetStore on the same directory finds previously stored assets.
+        """
+        self.store.put(1, "icon_url", b"<svg/>")
+        store = AssetStore(self.directory.name)
+        self.assertEqual(bytes(store.open(1, "icon_url")), b"<svg/>")
+
+    def test_log_replayed(self):
+        """
+        Check that changes are appended to the log instead of rewriting the index, and replayed by a new AssetStore.
+        """
+        self.store.put(1, "icon_url", b"<svg/>")
+        self.store.put(2, "icon_url", b"<svg></svg>")
+        self.store.delete(1, "icon_url")
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "index.json")))
+        store = AssetStore(self.directory.name)
+        self.assertNotIn((1, "icon_url"), store)
+        self.assertEqual(bytes(store.open(2, "icon_url")), b"<svg></svg>")
+        self.assertEqual(store.size, 11)
+
+        self.store.close()
+        self.assertEqual(os.path.getsize(os.path.join(self.directory.name, "index.log")), 0)
+        self.assertIn((2, "icon_url"), AssetStore(self.directory.name))
+
+    def test_truncated_log(self):
+        """
+        Check that a log line cut short by a crash is ignored.
+        """
+        self.store.put(1, "icon_url", b"<svg/>")
+        with open(os.path.join(self.directory.name, "index.log"), "a") as f:
+            f.write('{"sha256": "ab')
+        self.assertEqual(len(AssetStore(self.directory.name)), 1)
+
+    def test_deferred_removal(self):
+        """
+        Check that blobs which can not be removed yet, eg. as they are memory mapped on Windows, are removed by a later flush.
+        """
+        self.store.put(1, "preview_url", b"png 1")
+        path = self.store.path(1, "preview_url")
+        with mock.patch("os.remove", side_effect=PermissionError):
+            self.store.delete(1, "preview_url")
+        self.assertTrue(os.path.exists(path))
+        self.store.flush()
+        self.assertFalse(os.path.exists(path))
+
+    def test_temporary_file_removed(self):
+        """
+        Check that an interrupted write to a temporary file leaves no file behind.
+        """
+        with self.assertRaises(ValueError):
+            with self.store.temporary_file() as f:
+                f.write(b"half")
+                raise ValueError()
+        self.assertFalse(os.path.exists(f.name))
+        self.assertEqual([name for name in os.listdir(self.directory.name) if name.endswith(".part")], [])
+
+    def test_lru_gc(self):
+        """
+        Check that the least recently used assets are removed first when the store exceeds max_bytes.
+        """
+        store = AssetStore(self.directory.name, max_bytes=10)
+        store.put(1, "preview_url", b"aaaa")
+        time.sleep(0.01)
+        store.put(2, "preview_url", b"bbbb")
+        time.sleep(0.01)
+        store.open(1, "preview_url")
+        time.sleep(0.01)
+        store.put(3, "preview_url", b"cccc")
+        self.assertIn((1, "preview_url"), store)
+        self.assertNotIn((2, "preview_url"), store)
+        self.assertIn((3, "preview_url"), store)
+        self.assertEqual(store.size, 8)
+
+        self.assertEqual(store.gc(4), 4)
+        self.assertEqual(len(store), 1)
+
+    def test_gc_keeps_new_asset(self):
+        """
+        Check that an asset larger than max_bytes is kept by the collection it triggers, evicting all others.
+        """
+        store = AssetStore(self.directory.name, max_bytes=4)
+        store.put(1, "preview_url", b"aaaa")
+        store.put(2, "preview_url", b"bbbbbbbb")
+        self.assertNotIn((1, "preview_url"), store)
+        self.assertEqual(bytes(store.open(2, "preview_url")), b"bbbbbbbb")
+
+if __name__ == "__main__":
+    unittest.main()
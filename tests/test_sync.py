@@ -0,0 +1,102 @@
+import unittest, os, tempfile
+from unittest import mock
+
+import context
+
+from TheNounProjectAPI.sync import RecentSync
+from TheNounProjectAPI.models import IconsModel
+from TheNounProjectAPI.exceptions import NotFound
+
+def _page(*ids):
+    """
+    Helper function to create an IconsModel as returned by get_recent_icons.
+    """
+    return IconsModel.parse({"recent_uploads": [{"id": str(_id), "date_uploaded": f"2019-01-{_id:02d}"} for _id in ids]})
+
+class Sync(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "recent.json")
+        self.api = mock.Mock()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_first_poll_single_page(self):
+        """
+        Check that the first poll only fetches one page, and stores the highest id.
+        """
+        self.api.get_recent_icons.side_effect = [_page(10, 9), _page(8, 7)]
+        sync = RecentSync(self.api, self.path, limit=2)
+        self.assertEqual([icon.id for icon in sync.poll()], ["10", "9"])
+        self.assertEqual(self.api.get_recent_icons.call_count, 1)
+        self.assertEqual(RecentSync(self.api, self.path).mark, 10)
+
+    def test_poll_stops_at_mark(self):
+        """
+        Check that polling stops at the page containing the mark, and only returns newer icons.
+        """
+        self.api.get_recent_icons.side_effect = [_page(10, 9)]
+        RecentSync(self.api, self.path, limit=2).poll()
+
+        self.api.get_recent_icons.reset_mock()
+        self.api.get_recent_icons.side_effect = [_page(14, 13), _page(12, 11), _page(10, 9), _page(8, 7)]
+        sync = RecentSync(self.api, self.path, limit=2)
+        self.assertEqual([icon.id for icon in sync.poll()], ["14", "13", "12", "11"])
+        self.assertEqual(self.api.get_recent_icons.call_count, 3)
+        self.assertEqual(sync.mark, 14)
+
+    def test_poll_nothing_new(self):
+        """
+        Check that a poll without new icons keeps the mark, and ends on NotFound.
+        """
+        self.api.get_recent_icons.side_effect = [_page(10, 9)]
+        sync = RecentSync(self.api, self.path, limit=2)
+        sync.poll()
+        self.api.get_recent_icons.side_effect = [_page(10, 9)]
+        self.assertEqual(len(sync.poll()), 0)
+        self.assertEqual(sync.mark, 10)
+
+        self.api.get_recent_icons.side_effect = NotFound(None)
+        self.assertEqual(len(sync.poll()), 0)
+
+    def test_poll_without_commit(self):
+        """
+        Check that the mark is only persisted once commit is called, when commit=False.
+        """
+        self.api.get_recent_icons.side_effect = [_page(10, 9)]
+        sync = RecentSync(self.api, self.path, limit=2)
+        sync.poll(commit=False)
+        self.assertIsNone(sync.mark)
+        self.assertFalse(os.path.exists(self.path))
+        sync.commit()
+        self.assertEqual(sync.mark, 10)
+
+    def test_poll_resumes_after_max_pages(self):
+        """
+        Check that a poll stopped by max_pages keeps the mark, and the next polls continue where it stopped,
+        even as newer uploads shift the offsets.
+        """
+        feed = list(range(100, 0, -1))
+        def get_recent_icons(limit, offset):
+            return _page(*feed[offset:offset + limit])
+        self.api.get_recent_icons.side_effect = get_recent_icons
+        sync = RecentSync(self.api, self.path, limit=10, max_pages=2)
+        sync.poll()
+        self.assertEqual(sync.mark, 100)
+
+        feed[:0] = range(150, 100, -1)
+        self.assertEqual([int(icon.id) for icon in sync.poll()], list(range(150, 130, -1)))
+        self.assertEqual(RecentSync(self.api, self.path).mark, 100)
+
+        feed[:0] = [152, 151]
+        self.assertEqual([int(icon.id) for icon in sync.poll()], list(range(130, 112, -1)))
+        self.assertEqual([int(icon.id) for icon in RecentSync(self.api, self.path, limit=10, max_pages=2).poll()], list(range(112, 100, -1)))
+        sync = RecentSync(self.api, self.path, limit=10, max_pages=2)
+        self.assertEqual(sync.mark, 150)
+        self.assertEqual([int(icon.id) for icon in sync.poll()], [152, 151])
+        self.assertEqual(len(sync.poll()), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest, io, json, time, itertools
+from unittest import mock
+
+import context
+from context import fake_send
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.cache import MemoryCache
+from TheNounProjectAPI.tracing import Tracer, canonical_url
+from TheNounProjectAPI.exceptions import NotFound
+
+class Tracing(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = Tracer(capacity=3)
+        self.api = API("key", "secret", tracer=self.tracer)
+        self.api._session.send = mock.Mock(side_effect=fake_send({"icon": {"id": "1"}, "icons": []}))
+
+    def test_record(self):
+        """
+        Check that a call is recorded with its endpoint, canonical URL, status code, size and timings.
+        """
+        self.api.get_icon(1)
+        record, = self.tracer.records()
+        self.assertEqual((record.endpoint, record.method, record.url), ("get_icon_by_id", "GET", "http://api.thenounproject.com/icon/1"))
+        self.assertEqual((record.sent, record.status_code, record.size, record.cache, record.error), (True, 200, 34, None, None))
+        self.assertEqual(list(record.timings), ["prepare", "wait", "network", "parse", "total"])
+        self.assertIs(self.api.tracer, self.tracer)
+        self.assertGreaterEqual(record.timings["total"], sum(seconds for stage, seconds in record.timings.items() if stage != "total"))
+
+    def test_clock_jump(self):
+        """
+        Check that the total time is measured with perf_counter, unaffected by jumps of the wall clock.
+        """
+        with mock.patch("time.time", side_effect=itertools.count(0, 3600)):
+            self.api.get_icon(1)
+        record, = self.tracer.records()
+        self.assertLess(record.timings["total"], 60)
+
+    def test_error(self):
+        """
+        Check that failed calls are recorded with the exception.
+        """
+        with self.assertRaises(NotFound):
+            self.api.get_collection_by_slug("missing")
+        record, = self.tracer.records()
+        self.assertEqual((record.status_code, record.error, record.size), (404, "NotFound", 0))
+
+    def test_redacted(self):
+        """
+        Check that no OAuth parameters or signatures end up in the records.
+        """
+        self.api.get_icons_by_term("goat", limit=5)
+        output = io.StringIO()
+        self.tracer.dump(output)
+        self.assertEqual(json.loads(output.getvalue())["url"], "http://api.thenounproject.com/icons/goat?limit_to_public_domain=0&limit=5")
+        self.assertNotIn("oauth", output.getvalue())
+        self.assertEqual(canonical_url("http://api.thenounproject.com/icon/1?a=1&oauth_signature=x&oauth_nonce=y&b="),
+                         "http://api.thenounproject.com/icon/1?a=1&b=")
+
+    def test_ring_buffer(self):
+        """
+        Check that only the last capacity records are kept.
+        """
+        for _id in range(1, 6):
+            self.api.get_icon(_id)
+        self.assertEqual([record.url[-1] for record in self.tracer.records()], ["3", "4", "5"])
+        self.assertEqual(repr(self.tracer), "<Tracer: 3/3 Records>")
+        self.tracer.clear()
+        self.assertEqual(len(self.tracer), 0)
+
+    def test_cache(self):
+        """
+        Check that cache decisions are recorded, including the background revalidation of stale entries.
+        """
+        cache = MemoryCache(ttl=0.0, stale_ttl=60.0)
+        api = API("key", "secret", cache=cache, tracer=self.tracer)
+        api._session.send = self.api._session.send
+        api.get_icon(1)
+        api.get_icon(1)
+        deadline = time.monotonic() + 5
+        while len(self.tracer) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # The revalidation may be recorded before the call which served the stale entry.
+        records = sorted(self.tracer.records(), key=lambda record: record.started)
+        self.assertEqual({record.cache: record.sent for record in records}, {"miss": True, "stale": False, "revalidate": True})
+        self.assertEqual(records[0].cache, "miss")
+
+    def test_dump(self):
+        self.api.get_icon(1)
+        with mock.patch("sys.stderr") as stderr:
+            self.assertEqual(self.tracer.dump(), 1)
+        self.assertEqual(json.loads(stderr.write.call_args[0][0])["endpoint"], "get_icon_by_id")
+
+if __name__ == "__main__":
+    unittest.main()
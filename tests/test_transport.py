@@ -0,0 +1,72 @@
+import unittest, json
+
+import context
+
+import requests
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.models import IconModel
+from TheNounProjectAPI.exceptions import NotFound
+from TheNounProjectAPI.transport import HTTPXTransport, httpx
+
+@unittest.skipIf(httpx is None, "httpx is not installed.")
+class HTTPX(unittest.TestCase):
+
+    def setUp(self):
+        self.requests = []
+        def handler(request):
+            self.requests.append(request)
+            if request.url.path == "/icon/404":
+                return httpx.Response(404)
+            if request.url.path == "/icon/408":
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(200, json={"icon": {"id": request.url.path.split("/")[-1]}})
+        transport = HTTPXTransport(client=httpx.Client(transport=httpx.MockTransport(handler)))
+        self.api = API("key", "secret", transport=transport)
+
+    def tearDown(self):
+        self.api._close_session()
+
+    def test_send(self):
+        """
+        Check that responses are converted, and requests are signed with OAuth1.
+        """
+        icon = self.api.get_icon(12)
+        self.assertIsInstance(icon, IconModel)
+        self.assertEqual(icon.id, "12")
+        self.assertIsInstance(icon.response, requests.Response)
+        self.assertEqual(str(self.requests[0].url), "http://api.thenounproject.com/icon/12")
+        self.assertTrue(self.requests[0].headers["Authorization"].startswith("OAuth "))
+
+    def test_post(self):
+        """
+        Check that the json body of POST requests is sent.
+        """
+        self.api.report_usage([1, 2], test=True)
+        self.assertEqual(self.requests[0].method, "POST")
+        self.assertEqual(json.loads(self.requests[0].content), {"icons": "1,2"})
+
+    def test_status_code(self):
+        """
+        Check that status codes raise the same exceptions as with the requests transport.
+        """
+        with self.assertRaises(NotFound):
+            self.api.get_icon(404)
+
+    def test_timeout(self):
+        """
+        Check that httpx timeouts are raised as requests timeouts.
+        """
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.api.get_icon(408)
+
+    def test_testing(self):
+        """
+        Check that testing mode still returns a PreparedRequest without sending it.
+        """
+        api = API("key", "secret", testing=True, transport=self.api._transport)
+        self.assertEqual(api.get_icon(12).url, "http://api.thenounproject.com/icon/12")
+        self.assertEqual(len(self.requests), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+import context
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.validation import check_ids, check_slugs, check_terms, check_identifiers, id_mask, slug_mask, term_mask, to_list
+from TheNounProjectAPI.exceptions import IncorrectType, NonPositive, IllegalSlug, IllegalTerm
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class Validation(unittest.TestCase):
+
+    def setUp(self):
+        key = "mock api key to satisfy type check in api._get_oauth()"
+        secret = "mock secret key to satisfy type check in api._get_oauth()"
+        self.api = API(key, secret, testing=True)
+
+    def assertFailures(self, failures, expected):
+        self.assertEqual([(index, type(exception)) for index, exception in failures], expected)
+
+    def test_ids(self):
+        """
+        Check that invalid ids are found with the same exceptions as get_icon_by_id.
+        """
+        failures = check_ids([12, 0, -3, "12", 1.0, True])
+        self.assertFailures(failures, [(1, NonPositive), (2, NonPositive), (3, IncorrectType), (4, IncorrectType)])
+        with self.assertRaises(NonPositive) as cm:
+            self.api.get_icon_by_id(0)
+        self.assertEqual(str(failures[0][1]), str(cm.exception))
+        self.assertEqual(id_mask([12, 0, "12"]), [True, False, False])
+
+    def test_slugs(self):
+        """
+        Check that invalid slugs are found, following the rules of Core._slug_assert.
+        """
+        slugs = ["cue", "", "two words", "café", 12, "tab\tok", "a-b_c"]
+        self.assertFailures(check_slugs(slugs), [(1, IllegalSlug), (2, IllegalSlug), (3, IllegalSlug), (4, IncorrectType)])
+        for slug in slugs:
+            valid = True
+            try:
+                self.api._type_assert(slug, "slug", str)
+                self.api._slug_assert(slug, "slug")
+            except (IncorrectType, IllegalSlug):
+                valid = False
+            self.assertEqual(slug_mask([slug]), [valid], slug)
+
+    def test_terms(self):
+        """
+        Check that invalid terms are found.
+        """
+        self.assertFailures(check_terms(["goat", "", None, "two words"]), [(1, IllegalTerm), (2, IncorrectType)])
+        self.assertEqual(term_mask(["goat", ""]), [True, False])
+
+    def test_identifiers(self):
+        """
+        Check that mixed ids and slugs are checked like get_collection.
+        """
+        failures = check_identifiers([12, "cue", -1, "two words", None])
+        self.assertFailures(failures, [(2, NonPositive), (3, IllegalSlug), (4, IncorrectType)])
+        self.assertIn("'identifier'", str(failures[2][1]))
+
+    def test_generator(self):
+        """
+        Check that any iterable may be checked.
+        """
+        self.assertFailures(check_ids(_id for _id in (1, 0)), [(1, NonPositive)])
+        self.assertEqual(id_mask(_id for _id in (1, 0)), [True, False])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        """
+        Check that NumPy arrays are checked, returning NumPy masks.
+        """
+        ids = numpy.array([12, 0, 24014, -5])
+        self.assertFailures(check_ids(ids), [(1, NonPositive), (3, NonPositive)])
+        self.assertEqual(id_mask(ids).tolist(), [True, False, True, False])
+        self.assertEqual(id_mask(numpy.array([1.0, 2.0])).tolist(), [False, False])
+        self.assertEqual(slug_mask(numpy.array(["cue", "two words"])).tolist(), [True, False])
+        self.assertEqual(to_list(ids), [12, 0, 24014, -5])
+        self.assertIs(type(to_list(ids)[0]), int)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest, tempfile
+from unittest import mock
+
+import context
+from context import fake_send
+
+import requests
+
+from TheNounProjectAPI.api import API
+from TheNounProjectAPI.cache import MemoryCache, DiskCache
+from TheNounProjectAPI.warmup import warm_cache, main
+from TheNounProjectAPI.exceptions import NotFound, NonPositive, IllegalSlug
+
+_send = fake_send({"icon": {"id": "1"}, "collection": {"id": "1"}, "icons": [{"id": "1"}], "usage": {"monthly": 10}})
+
+class Warmup(unittest.TestCase):
+
+    def setUp(self):
+        key = "mock api key to satisfy type check in api._get_oauth()"
+        secret = "mock secret key to satisfy type check in api._get_oauth()"
+        self.api = API(key, secret, cache=MemoryCache())
+        self.api._session.send = mock.Mock(side_effect=_send)
+
+    def test_warm_cache(self):
+        """
+        Check that all items are fetched, and afterwards answered from the cache.
+        """
+        reports = []
+        report = warm_cache(self.api, icon_ids=[1, 2], collection_slugs=["cue"], terms=["goat"], progress=reports.append)
+        self.assertEqual(report.done, 4)
+        self.assertEqual(report.requests_sent, 4)
+        self.assertEqual(len(reports), 4)
+        self.assertEqual(len(report.failed), 0)
+
+        self.api.get_icon(2)
+        self.api.get_icons_by_term("goat")
+        self.assertEqual(self.api.requests_sent, 4)
+
+        report = warm_cache(self.api, icon_ids=[1, 2])
+        self.assertEqual(report.requests_sent, 0)
+
+    def test_warm_cache_failures(self):
+        """
+        Check that failing items are reported, without stopping the others.
+        """
+        report = warm_cache(self.api, icon_ids=[1, -1], collection_slugs=["two words"], terms=["missing"])
+        self.assertEqual(report.done, 4)
+        self.assertIsInstance(report.failed[("icon", -1)], NonPositive)
+        self.assertIsInstance(report.failed[("collection", "two words")], IllegalSlug)
+        self.assertIsInstance(report.failed[("term", "missing")], NotFound)
+        self.assertEqual(report.requests_sent, 2)
+
+    def test_warm_cache_transport_errors(self):
+        """
+        Check that connection errors and timeouts are reported as failures, without stopping the others.
+        """
+        def send(prepared_request, **kwargs):
+            if "/2" in prepared_request.url:
+                raise requests.exceptions.ConnectionError("refused")
+            if "/3" in prepared_request.url:
+                raise requests.exceptions.ReadTimeout("timed out")
+            return _send(prepared_request, **kwargs)
+        self.api._session.send = mock.Mock(side_effect=send)
+        report = warm_cache(self.api, icon_ids=[1, 2, 3])
+        self.assertEqual(report.done, 3)
+        self.assertEqual(set(report.failed), {("icon", 2), ("icon", 3)})
+        self.assertIsInstance(report.failed[("icon", 2)], requests.exceptions.ConnectionError)
+        self.assertIsInstance(report.failed[("icon", 3)], requests.exceptions.Timeout)
+
+    def test_warm_cache_measure_usage(self):
+        """
+        Check that the quota used is reported from get_usage.
+        """
+        report = warm_cache(self.api, icon_ids=[1], measure_usage=True)
+        self.assertEqual(report.quota_used, 0)
+        self.assertEqual(report.requests_sent, 3)
+
+    def test_main(self):
+        """
+        Check that the command line entry point fills a DiskCache, which is read back by a new API object.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch("requests.Session.send", side_effect=_send), mock.patch("sys.stdout"), mock.patch("sys.stderr"):
+                code = main(["--key", "key", "--secret", "secret", "--cache-dir", directory, "--ids", "1", "2", "--terms", "goat"])
+            self.assertEqual(code, 0)
+            self.assertEqual(len(DiskCache(directory)), 3)
+
+            api = API("key", "secret", cache=DiskCache(directory))
+            api._session.send = mock.Mock(side_effect=AssertionError("The warmed cache should answer the request."))
+            self.assertEqual(api.get_icon_by_id(1).id, "1")
+            self.assertEqual(len(api.get_icons_by_term("goat")), 1)
+            api._close_session()
+
+if __name__ == "__main__":
+    unittest.main()